@@ -1,23 +1,24 @@
 from helpers import (MAX_REQUESTS, MAX_REQUESTS_FREE, check_rate_limit_demo,
                      check_rate_limit_free_users, extract_text_from_file,
-                     get_client_identifier, get_llm_response,
-                     parse_llm_response)
-from models import ResumeModel, ApplicationModel, EmployeeProfileUpdateModel, EmployerProfileUpdateModel, TailorResumeRequest, ExportRequest, InterviewPrepRequest
+                     get_client_identifier, get_llm_response, get_model,
+                     get_redis, parse_llm_response)
+from models import ResumeModel, ApplicationModel, ApplicationUpdateModel, EmployeeProfileUpdateModel, EmployerProfileUpdateModel, TailorResumeRequest, ExportRequest, InterviewPrepRequest
 from services import process_resume_tailoring, interview_service, dashboard_service
 from services.export_service import markdown_to_pdf, markdown_to_docx
 from services.storage_service import LocalStorageProvider
-from db import get_db  # type: ignore
+from db import get_client, get_db  # type: ignore
 from auth import add_auth_routes, get_current_user
 from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
-from fastapi import (Depends, FastAPI, File, Form, HTTPException, Request,
-                     UploadFile)
+from fastapi.concurrency import run_in_threadpool
+from fastapi import (Depends, FastAPI, File, Form, HTTPException, Query, Request,
+                     Response, UploadFile)
 import asyncio
 import logging
 import os
-import sys
 import time
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import List
 
@@ -29,21 +30,48 @@ from services.employer_analysis_service import EmployerAnalysisService
 from services.ranking_service import RankingService
 from services.summary_service import SummaryService
 from services.hr_dashboard_service import HrDashboardService
+from services.user_cache_service import user_cache
+from services.user_stats_service import user_stats_service
+from services.data_version_service import data_versions
+from services.jd_text_service import candidates_summary, jd_preview, jd_text_service
+from services.search_service import search_service
+from indexes import ensure_indexes
+from pagination import NEWEST_FIRST, paginate
+from pipeline import Stage, run_pipeline
+from responses import FastJSONResponse
+import timing
+from log_config import configure_logging
 
 # Configure logging
-logging.basicConfig(
-    stream=sys.stdout,
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        await ensure_indexes(get_db())
+    except Exception as e:
+        logger.error("Index provisioning failed: %s", e)
+    # Evicts users from this worker's cache when another worker updates them
+    invalidations = asyncio.create_task(user_cache.listen()) if user_cache.use_redis else None
+    yield
+    # In-flight requests have finished; give background work they started a bounded
+    # window to complete before the worker exits
+    await asyncio.gather(summary_service.drain(SHUTDOWN_DRAIN_SECONDS),
+                         dashboard_service.drain(SHUTDOWN_DRAIN_SECONDS))
+    if invalidations is not None:
+        invalidations.cancel()
+
+
 # Initialize FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 
 # Initialize services
 from config import USE_S3, AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_REGION, AWS_S3_BUCKET_NAME
+from config import (EMPLOYER_EXTRACT_CONCURRENCY, EMPLOYER_PIPELINE_QUEUE_SIZE,
+                    EMPLOYER_SCORE_CONCURRENCY, READINESS_CHECK_TIMEOUT_SECONDS,
+                    SHUTDOWN_DRAIN_SECONDS)
 
 if USE_S3:
     from services.s3_storage_service import S3StorageProvider
@@ -64,14 +92,28 @@ summary_service = SummaryService()
 hr_dashboard_service = HrDashboardService()
 
 
+def _endpoint(request: Request) -> str:
+    # Label by route template, not the raw path, to keep metric cardinality bounded
+    route = request.scope.get("route")
+    return route.path if route is not None else "unmatched"
+
+
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     start_time = time.time()
-    response = await call_next(request)
-    process_time = (time.time() - start_time) * 1000
-    formatted_process_time = '{0:.2f}'.format(process_time)
-    logger.info(
-        f"{request.method} {request.url.path} - Status: {response.status_code} - {formatted_process_time}ms")
+    spans = timing.start_request()
+    try:
+        response = await call_next(request)
+    except Exception:
+        # Reported as the 500 the outer error middleware sends; closes the spans either way
+        timing.finish_request(spans, request.method, _endpoint(request), 500, time.time() - start_time)
+        raise
+    elapsed = time.time() - start_time
+    endpoint = _endpoint(request)
+    response.headers["Server-Timing"] = timing.finish_request(
+        spans, request.method, endpoint, response.status_code, elapsed)
+    logger.info("%s %s - Status: %s - %.2fms", request.method, request.url.path,
+                response.status_code, elapsed * 1000)
     return response
 
 # Add CORS middleware to allow requests from your frontend
@@ -119,6 +161,30 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 # Adding auth routes
 add_auth_routes(app)
 
+
+async def _conditional_get(request: Request, response: Response, user_id: str, *extra: str):
+    """
+    Returns a 304 response when the client's If-None-Match is current for this user's data;
+    otherwise sets the ETag on ``response`` and returns None.
+    """
+    etag = await data_versions.etag(user_id, request, *extra)
+    if etag is None:
+        return None
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Authorization"}
+    if data_versions.matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+def _fast_json(content, response: Response = None) -> FastJSONResponse:
+    """
+    Serializes ``content`` straight to JSON bytes, skipping FastAPI's jsonable_encoder pass.
+    Headers already set on the injected ``response`` (such as the ETag) are carried over.
+    """
+    return FastJSONResponse(content, headers=response.headers if response is not None else None)
+
+
 # API Routes
 
 # Resume Routes
@@ -133,8 +199,12 @@ async def create_resume(
     return await resume_service.create_resume(str(current_user["_id"]), file, title, tag_list)
 
 @app.get("/api/resumes")
-async def get_resumes(current_user: dict = Depends(get_current_user)):
-    return await resume_service.get_resumes_by_user(str(current_user["_id"]))
+async def get_resumes(request: Request, response: Response, cursor: str = None, limit: int = None, skill: List[str] = Query(None), current_user: dict = Depends(get_current_user)):
+    user_id = str(current_user["_id"])
+    not_modified = await _conditional_get(request, response, user_id)
+    if not_modified:
+        return not_modified
+    return _fast_json(await resume_service.get_resumes_by_user(user_id, cursor, limit, skill), response)
 
 @app.get("/api/resumes/{resume_id}")
 async def get_resume(resume_id: str, current_user: dict = Depends(get_current_user)):
@@ -163,23 +233,32 @@ async def create_application(app_data: dict, current_user: dict = Depends(get_cu
     return await application_service.create_application(str(current_user["_id"]), app_data)
 
 @app.get("/api/dashboard")
-async def get_dashboard(current_user: dict = Depends(get_current_user)):
+async def get_dashboard(request: Request, response: Response, current_user: dict = Depends(get_current_user)):
+    user_id = str(current_user["_id"])
+    # Counters like "today" and upcoming interviews move with the clock, so ETags roll hourly
+    not_modified = await _conditional_get(request, response, user_id, datetime.utcnow().strftime("%Y-%m-%dT%H"))
+    if not_modified:
+        return not_modified
     try:
-        return await dashboard_service.get_dashboard_data(str(current_user["_id"]))
+        return _fast_json(await dashboard_service.get_dashboard_data(user_id), response)
     except Exception as e:
-        logger.error(f"Dashboard API Error: {str(e)}")
+        logger.error("Dashboard API Error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/applications")
-async def get_applications(current_user: dict = Depends(get_current_user)):
-    return await application_service.get_applications_by_user(str(current_user["_id"]))
+async def get_applications(request: Request, response: Response, cursor: str = None, limit: int = None, current_user: dict = Depends(get_current_user)):
+    user_id = str(current_user["_id"])
+    not_modified = await _conditional_get(request, response, user_id)
+    if not_modified:
+        return not_modified
+    return _fast_json(await application_service.get_applications_by_user(user_id, cursor, limit), response)
 
 @app.get("/api/applications/{app_id}")
 async def get_application(app_id: str, current_user: dict = Depends(get_current_user)):
     return await application_service.get_application(app_id, str(current_user["_id"]))
 
 @app.put("/api/applications/{app_id}")
-async def update_application(app_id: str, update_data: dict, current_user: dict = Depends(get_current_user)):
+async def update_application(app_id: str, update_data: ApplicationUpdateModel, current_user: dict = Depends(get_current_user)):
     return await application_service.update_application(app_id, str(current_user["_id"]), update_data)
 
 @app.delete("/api/applications/{app_id}")
@@ -187,12 +266,53 @@ async def delete_application(app_id: str, current_user: dict = Depends(get_curre
     await application_service.delete_application(app_id, str(current_user["_id"]))
     return {"message": "Application deleted successfully"}
 
+@app.get("/api/search")
+async def search(request: Request, response: Response, q: str, type: str = "all", cursor: str = None, limit: int = None, current_user: dict = Depends(get_current_user)):
+    user_id = str(current_user["_id"])
+    not_modified = await _conditional_get(request, response, user_id)
+    if not_modified:
+        return not_modified
+    return _fast_json(await search_service.search(user_id, q, type, cursor, limit), response)
+
 
 @app.get("/api/health")
 def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/api/ready")
+async def readiness_check():
+    """
+    Readiness probe. Connects to Mongo and Redis and builds the LLM client, so none of that
+    happens on the first real request a worker serves. Returns 503 until every check passes.
+    """
+    checks = {}
+    for name, warm in (("mongo", lambda: get_client().admin.command("ping")),
+                       ("redis", lambda: run_in_threadpool(lambda: get_redis().ping())),
+                       ("llm", lambda: run_in_threadpool(get_model))):
+        try:
+            await asyncio.wait_for(warm(), READINESS_CHECK_TIMEOUT_SECONDS)
+            checks[name] = "ok"
+        except Exception as e:
+            logger.warning("Readiness check %s failed: %s", name, e)
+            checks[name] = "unavailable"
+    ready = all(status == "ok" for status in checks.values())
+    return JSONResponse(status_code=200 if ready else 503,
+                        content={"status": "ready" if ready else "not ready", "checks": checks})
+
+
+@app.get("/api/health/cache")
+def cache_stats():
+    return {"user_cache": user_cache.stats()}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint: request and per-stage latency histograms."""
+    payload, content_type = timing.metrics_payload()
+    return Response(content=payload, media_type=content_type)
+
+
 @app.post("/api/employee", response_class=JSONResponse)
 async def process_employee(
     file: UploadFile = File(None),
@@ -277,7 +397,7 @@ JD:
             "user_id": current_user["_id"],
             "user_type": "employee",
             "cv_filename": cv_filename,
-            "jd_text": jd_text_final,
+            **await jd_text_service.store(jd_text_final),
             "analysis_result": parsed_llm_response,
             "created_at": datetime.now(),
         }
@@ -285,7 +405,10 @@ JD:
             from bson import ObjectId
             result_data["resume_id"] = ObjectId(resume_id)
             
-        await db.history.insert_one(result_data)
+        async with user_stats_service.recording(str(current_user["_id"])):
+            await db.history.insert_one(result_data)
+            await user_stats_service.record_history(str(current_user["_id"]), result_data)
+        await data_versions.bump(str(current_user["_id"]))
 
         # Add rate limit information to response
         parsed_llm_response["rate_limit"] = {
@@ -299,7 +422,7 @@ JD:
     except HTTPException as e:
         raise e
     except Exception as e:
-        logger.error(f"Error in process_employee: {str(e)}", exc_info=True)
+        logger.error("Error in process_employee: %s", e, exc_info=True)
         return JSONResponse(status_code=500, content={"detail": f"An unexpected error occurred: {str(e)}"})
 
 
@@ -326,11 +449,14 @@ async def process_employer(
             raise HTTPException(
                 status_code=400, detail="No job description provided.")
 
-        # Helper coroutine to process a single CV
-        async def analyze_candidate(cv_file: UploadFile):
-            try:
-                cv_text = await extract_text_from_file(cv_file)
-                prompt = f"""
+        # CVs go through two bounded stages: text extraction (thread pool) and LLM
+        # scoring. Uploads are read only when an extraction worker picks them up.
+        async def extract_candidate(cv_file: UploadFile):
+            return cv_file.filename, await extract_text_from_file(cv_file)
+
+        async def score_candidate(extracted: tuple):
+            cv_filename, cv_text = extracted
+            prompt = f"""
 You are a highly precise and analytical AI recruitment assistant. Your task is to evaluate a candidate's CV against a job description (JD) with methodical accuracy.
 
 Follow these steps exactly:
@@ -355,23 +481,28 @@ CV:
 JD:
 {jd_text_final}
 """
-                llm_response = await get_llm_response(prompt)
-                parsed_response = parse_llm_response(llm_response)
-                return {
-                    "cv_filename": cv_file.filename,
-                    "analysis": parsed_response
-                }
-            except Exception as e:
-                logger.error(
-                    f"Failed to process {cv_file.filename}: {e}", exc_info=True)
-                return {
-                    "cv_filename": cv_file.filename,
-                    "analysis": {"error": f"Failed to process this CV: {str(e)}"}
-                }
+            llm_response = await get_llm_response(prompt)
+            parsed_response = parse_llm_response(llm_response)
+            return {
+                "cv_filename": cv_filename,
+                "analysis": parsed_response
+            }
+
+        def candidate_error(index: int, stage: str, e: Exception):
+            cv_filename = candidates[index].filename
+            logger.error(
+                "Failed to process %s (%s): %s", cv_filename, stage, e, exc_info=e)
+            return {
+                "cv_filename": cv_filename,
+                "analysis": {"error": f"Failed to process this CV: {str(e)}"}
+            }
 
-        # Create a list of analysis tasks and run them concurrently
-        tasks = [analyze_candidate(cv_file) for cv_file in candidates]
-        all_results = await asyncio.gather(*tasks)
+        all_results, metrics = await run_pipeline(candidates, [
+            Stage("extract", extract_candidate, EMPLOYER_EXTRACT_CONCURRENCY),
+            Stage("score", score_candidate, EMPLOYER_SCORE_CONCURRENCY),
+        ], candidate_error, queue_size=EMPLOYER_PIPELINE_QUEUE_SIZE)
+        logger.info("Employer batch of %s CVs", len(candidates),
+                    extra={"pipeline": [stage.as_dict() for stage in metrics]})
 
         # Sort results by JD-Match score in descending order
         all_results.sort(
@@ -382,8 +513,10 @@ JD:
         result_data = {
             "user_id": current_user["_id"],
             "user_type": "employer",
-            "jd_text": jd_text_final,
+            **await jd_text_service.store(jd_text_final),
             "batch_results": all_results,
+            "candidates": candidates_summary(all_results),
+            "candidate_count": len(all_results),
             "created_at": datetime.now(),
         }
         await db.history.insert_one(result_data)
@@ -398,7 +531,7 @@ JD:
             }
         }
 
-        return JSONResponse(content=final_response)
+        return FastJSONResponse(content=final_response)
 
     except HTTPException as e:
         raise e
@@ -563,6 +696,7 @@ async def update_employee_profile(
             {"_id": current_user["_id"]},
             {"$set": update_dict}
         )
+        await user_cache.invalidate(current_user["email"])
         return {"message": "Employee profile updated successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating profile: {str(e)}")
@@ -586,17 +720,33 @@ async def update_employer_profile(
             {"_id": current_user["_id"]},
             {"$set": update_dict}
         )
+        await user_cache.invalidate(current_user["email"])
         return {"message": "Employer profile updated successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating profile: {str(e)}")
 
 
 
+# History records carry a precomputed jd_preview. Records written before JD texts were
+# deduplicated only have jd_text, so just enough of it is read to rebuild the preview.
+_HISTORY_PROJECTION = {
+    "created_at": 1,
+    "jd_preview": 1,
+    "jd_text": {"$substrCP": [{"$ifNull": ["$jd_text", ""]}, 0, 101]},
+}
+
+
+def _history_preview(record: dict) -> str:
+    if "jd_preview" in record:
+        return record["jd_preview"]
+    return jd_preview(record.get("jd_text") or "")
+
+
 @app.get("/api/profile/history", response_class=JSONResponse)
-async def get_user_history(current_user: dict = Depends(get_current_user)):
+async def get_user_history(cursor: str = None, limit: int = 20, current_user: dict = Depends(get_current_user)):
     """
     Get the upload history for the currently authenticated user.
-    Returns different collections based on user type.
+    Returns different collections based on user type, one page at a time.
     """
     try:
         db = get_db()
@@ -605,9 +755,9 @@ async def get_user_history(current_user: dict = Depends(get_current_user)):
 
         if user_type == "employee":
             # Get employee's CV upload history
-            uploads = await db.history.find(
-                {"user_id": current_user["_id"]}
-            ).sort("created_at", -1).to_list(length=20)
+            uploads, next_cursor = await paginate(
+                db.history, {"user_id": current_user["_id"]}, NEWEST_FIRST, cursor, limit,
+                projection=_HISTORY_PROJECTION | {"cv_filename": 1, "analysis_result": 1})
 
             # Convert ObjectId to string for JSON serialization
             formatted_uploads = []
@@ -615,66 +765,61 @@ async def get_user_history(current_user: dict = Depends(get_current_user)):
                 formatted_uploads.append({
                     "_id": str(upload["_id"]),
                     "cv_filename": upload.get("cv_filename", ""),
-                    "jd_text": upload.get("jd_text", "")[:100] + "..." if len(upload.get("jd_text", "")) > 100 else upload.get("jd_text", ""),
+                    "jd_text": _history_preview(upload),
                     "analysis_result": upload.get("analysis_result", {}),
                     "created_at": upload["created_at"].isoformat()
                 })
 
-            return JSONResponse(
+            return FastJSONResponse(
                 status_code=200,
                 content={
                     "user_id": user_id,
                     "user_type": "employee",
-                    "history": formatted_uploads
+                    "history": formatted_uploads,
+                    "next_cursor": next_cursor
                 }
             )
 
         elif user_type == "employer":
-            employer_jobs = await db.history.find(
-                {"user_id": current_user["_id"]}  # Use the ObjectId directly
-            ).sort("created_at", -1).to_list(length=20)
+            employer_jobs, next_cursor = await paginate(
+                db.history, {"user_id": current_user["_id"]},  # Use the ObjectId directly
+                NEWEST_FIRST, cursor, limit,
+                projection=_HISTORY_PROJECTION | {
+                    "candidates": 1, "candidate_count": 1,
+                    # Only read by records written before candidates were precomputed
+                    "batch_results.cv_filename": 1, "batch_results.analysis.JD-Match": 1,
+                })
 
             # Format the results
             formatted_jobs = []
             for job in employer_jobs:
-                batch_results = job.get("batch_results", [])
-                candidate_count = len(batch_results)
-
-                # Create a summary list of candidates with their scores
-                candidates_summary = []
-                for candidate in batch_results:
-                    # Check if 'analysis' exists and is a dictionary before accessing 'JD-Match'
-                    analysis = candidate.get("analysis", {})
-                    if isinstance(analysis, dict):
-                        score = analysis.get("JD-Match")
-                    else:
-                        score = None  # Or some other default value for errors
-
-                    candidates_summary.append({
-                        "cv_filename": candidate.get("cv_filename"),
-                        "score": score
-                    })
+                candidates = job.get("candidates")
+                if candidates is None:
+                    candidates = candidates_summary(job.get("batch_results", []))
 
                 formatted_jobs.append({
                     "job_id": str(job["_id"]),
-                    "jd_text": job.get("jd_text", "")[:100] + "..." if len(job.get("jd_text", "")) > 100 else job.get("jd_text", ""),
-                    "candidate_count": candidate_count,
+                    "jd_text": _history_preview(job),
+                    "candidate_count": job.get("candidate_count", len(candidates)),
                     "created_at": job["created_at"].isoformat(),
-                    "candidates": candidates_summary  # Added the candidate summary to the response
+                    "candidates": candidates  # Added the candidate summary to the response
                 })
 
-            return JSONResponse(
+            return FastJSONResponse(
                 status_code=200,
                 content={
                     "user_id": user_id,
                     "user_type": "employer",
-                    "history": formatted_jobs
+                    "history": formatted_jobs,
+                    "next_cursor": next_cursor
                 }
             )
 
         else:
             raise HTTPException(status_code=400, detail="Invalid user type")
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error retrieving history: {str(e)}")
@@ -713,7 +858,7 @@ async def export_resume(request: ExportRequest, user_id: str = Depends(get_curre
         else:
             raise HTTPException(status_code=400, detail="Unsupported format")
     except Exception as e:
-        logger.error(f"Error exporting resume: {str(e)}", exc_info=True)
+        logger.error("Error exporting resume: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to export resume")
 
 @app.post("/api/interview/prep")
@@ -740,7 +885,7 @@ async def generate_interview_prep(
         # 3. Call the interview service
         return await interview_service.process_interview_prep(resume.resume_text, jd_text)
     except Exception as e:
-        logger.error(f"Error generating interview prep: {str(e)}", exc_info=True)
+        logger.error("Error generating interview prep: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 # Employer Module Routes
@@ -750,8 +895,8 @@ async def create_jd(jd_data: dict, current_user: dict = Depends(get_current_user
     return await jd_service.create_jd(str(current_user["_id"]), jd_data)
 
 @app.get("/api/employer/jds")
-async def get_jds(current_user: dict = Depends(get_current_user)):
-    return await jd_service.get_jds_by_user(str(current_user["_id"]))
+async def get_jds(cursor: str = None, limit: int = None, current_user: dict = Depends(get_current_user)):
+    return _fast_json(await jd_service.get_jds_by_user(str(current_user["_id"]), cursor, limit))
 
 @app.get("/api/employer/jds/{jd_id}")
 async def get_jd(jd_id: str, current_user: dict = Depends(get_current_user)):
@@ -784,7 +929,7 @@ async def parse_employer_jd_file(
         # We can add this file path to the parsed data so the frontend can store it
         parsed_data["file_path"] = file_path
     except Exception as e:
-        logger.error(f"Failed to save JD file: {str(e)}")
+        logger.error("Failed to save JD file: %s", e)
 
     return parsed_data
 
@@ -793,6 +938,18 @@ async def parse_employer_jd_file(
 async def delete_jd(jd_id: str, current_user: dict = Depends(get_current_user)):
     return await jd_service.delete_jd(jd_id, str(current_user["_id"]))
 
+@app.get("/api/employer/jds/{jd_id}/similar-resumes")
+async def get_similar_resumes(jd_id: str, limit: int = None, current_user: dict = Depends(get_current_user)):
+    if current_user.get("user_type") != "employer":
+        raise HTTPException(status_code=403, detail="Forbidden")
+    return await jd_service.find_similar_resumes(jd_id, str(current_user["_id"]), limit)
+
+@app.get("/api/employer/jds/{jd_id}/skill-matches")
+async def get_skill_matches(jd_id: str, limit: int = None, current_user: dict = Depends(get_current_user)):
+    if current_user.get("user_type") != "employer":
+        raise HTTPException(status_code=403, detail="Forbidden")
+    return await jd_service.find_skill_matches(jd_id, str(current_user["_id"]), limit)
+
 @app.post("/api/employer/analyze-batch")
 async def batch_analyze_files(
     jd_id: str = Form(...),
@@ -812,7 +969,7 @@ async def batch_analyze_files(
             resume = await resume_service.create_resume(user_id, file, file.filename, ["Employer Upload"])
             resume_ids.append(resume.id)
         except Exception as e:
-            logger.error(f"Failed to save CV {file.filename}: {str(e)}")
+            logger.error("Failed to save CV %s: %s", file.filename, e)
             continue
             
     if not resume_ids:
@@ -820,6 +977,7 @@ async def batch_analyze_files(
         
     # 2. Run batch analysis
     results = await employer_analysis_service.analyze_batch(user_id, jd_id, resume_ids)
+    summary_service.schedule_prefetch(jd_id, user_id)
     
     # Return rankings
     return await ranking_service.get_candidates_for_jd(jd_id, user_id)
@@ -833,11 +991,18 @@ async def batch_analyze(
     resume_ids = payload.get("resume_ids", [])
     if not jd_id or not resume_ids:
         raise HTTPException(status_code=400, detail="jd_id and resume_ids are required")
-    return await employer_analysis_service.analyze_batch(str(current_user["_id"]), jd_id, resume_ids)
+    results = await employer_analysis_service.analyze_batch(str(current_user["_id"]), jd_id, resume_ids)
+    summary_service.schedule_prefetch(jd_id, str(current_user["_id"]))
+    return results
 
 @app.get("/api/employer/analysis/{jd_id}")
-async def get_ranked_candidates(jd_id: str, current_user: dict = Depends(get_current_user)):
-    return await ranking_service.get_candidates_for_jd(jd_id, str(current_user["_id"]))
+async def get_ranked_candidates(jd_id: str, cursor: str = None, limit: int = None, min_score: int = None, max_score: int = None, current_user: dict = Depends(get_current_user)):
+    return _fast_json(await ranking_service.get_candidates_for_jd(
+        jd_id, str(current_user["_id"]), cursor, limit, min_score, max_score))
+
+@app.get("/api/employer/analysis/{jd_id}/rank/{analysis_id}")
+async def get_candidate_rank(jd_id: str, analysis_id: str, current_user: dict = Depends(get_current_user)):
+    return await ranking_service.get_candidate_rank(jd_id, analysis_id, str(current_user["_id"]))
 
 @app.put("/api/employer/analysis/{analysis_id}/status")
 async def update_analysis_status(
@@ -862,10 +1027,12 @@ async def update_analysis_status(
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Analysis not found")
             
-        logger.info(f"Updated status of analysis {analysis_id} to {new_status}")
+        # Leaderboards hold only analysis ids and ATS scores, so a status change leaves them valid
+        await data_versions.bump(str(current_user["_id"]))
+        logger.info("Updated status of analysis %s to %s", analysis_id, new_status)
         return {"success": True, "status": new_status}
     except Exception as e:
-        logger.error(f"Error updating analysis status: {str(e)}")
+        logger.error("Error updating analysis status: %s", e)
         raise HTTPException(status_code=500, detail="Failed to update status")
 
 @app.get("/api/employer/candidate/{candidate_id}/summary")
@@ -873,8 +1040,12 @@ async def get_candidate_summary(candidate_id: str, current_user: dict = Depends(
     return await summary_service.generate_resume_summary(candidate_id, str(current_user["_id"]))
 
 @app.get("/api/employer/dashboard")
-async def get_employer_dashboard(current_user: dict = Depends(get_current_user)):
-    return await hr_dashboard_service.get_dashboard_data(str(current_user["_id"]))
+async def get_employer_dashboard(request: Request, response: Response, current_user: dict = Depends(get_current_user)):
+    user_id = str(current_user["_id"])
+    not_modified = await _conditional_get(request, response, user_id)
+    if not_modified:
+        return not_modified
+    return _fast_json(await hr_dashboard_service.get_dashboard_data(user_id), response)
 
 
 # ── Serve React SPA in production ────────────────────────────────────
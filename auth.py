@@ -1,3 +1,5 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Annotated, Optional
 
@@ -7,13 +9,30 @@ from fastapi.security import OAuth2PasswordBearer
 from passlib.context import CryptContext  # type: ignore
 from pydantic import BaseModel, EmailStr, Field, field_validator
 
-from config import ACCESS_TOKEN_EXPIRE_MINUTES, ALGORITHM, SECRET_KEY
+from config import (ACCESS_TOKEN_EXPIRE_MINUTES, ALGORITHM, ARGON2_MEMORY_COST,
+                    ARGON2_PARALLELISM, ARGON2_TIME_COST,
+                    PASSWORD_HASH_MAX_PENDING, PASSWORD_HASH_WORKERS,
+                    SECRET_KEY)
 from db import get_db
+from services.user_cache_service import user_cache
 
 # --- Configuration & Setup ---
 
 # Password hashing setup using Argon2
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__time_cost=ARGON2_TIME_COST,
+    argon2__memory_cost=ARGON2_MEMORY_COST,
+    argon2__parallelism=ARGON2_PARALLELISM,
+)
+
+# Argon2 is CPU- and memory-hard, so hashing runs on a dedicated bounded pool
+# instead of the event loop. argon2-cffi releases the GIL, so threads give real
+# parallelism. Jobs beyond PASSWORD_HASH_MAX_PENDING are rejected with a 503.
+_password_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="argon2")
+_pending_password_jobs = 0
 
 if not SECRET_KEY:
     raise ValueError("No SECRET_KEY environment variable set for JWT")
@@ -67,12 +86,28 @@ async def get_user_by_email(db, email: str):
     return await db.users.find_one({"email": email})
 
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+async def _run_password_job(func, *args):
+    global _pending_password_jobs
+    if _pending_password_jobs >= PASSWORD_HASH_MAX_PENDING:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please try again shortly",
+            headers={"Retry-After": "1"},
+        )
+    _pending_password_jobs += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_password_executor, func, *args)
+    finally:
+        _pending_password_jobs -= 1
+
 
+async def verify_password(plain_password, hashed_password):
+    return await _run_password_job(pwd_context.verify, plain_password, hashed_password)
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+
+async def get_password_hash(password):
+    return await _run_password_job(pwd_context.hash, password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -91,7 +126,7 @@ async def authenticate_user(db, email: str, password: str, user_type: str):
     # Critical check: ensure the user_type from DB matches the one they're logging in as
     if user.get("user_type") != user_type:
         return False
-    if not verify_password(password, user["password"]):
+    if not await verify_password(password, user["password"]):
         return False
     return user
 
@@ -114,9 +149,14 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]):
     except jwt.PyJWTError:
         raise credentials_exception
 
-    db = get_db()
-    user = await get_user_by_email(db, token_data.email) # type: ignore
-    if user is None or user.get("user_type") != token_data.user_type:
+    user = await user_cache.get(token_data.email)  # type: ignore
+    if user is None:
+        db = get_db()
+        user = await get_user_by_email(db, token_data.email) # type: ignore
+        if user is None:
+            raise credentials_exception
+        await user_cache.set(token_data.email, user)  # type: ignore
+    if user.get("user_type") != token_data.user_type:
         raise credentials_exception
     return user
 
@@ -151,7 +191,7 @@ def add_auth_routes(app: FastAPI):
             raise HTTPException(
                 status_code=400, detail="Email already registered"
             )
-        hashed_password = get_password_hash(employer.password)
+        hashed_password = await get_password_hash(employer.password)
         employer_data = {
             "email": employer.business_email,
             "company_name": employer.company_name,
@@ -172,7 +212,7 @@ def add_auth_routes(app: FastAPI):
             raise HTTPException(
                 status_code=400, detail="Email already registered"
             )
-        hashed_password = get_password_hash(employee.password)
+        hashed_password = await get_password_hash(employee.password)
         employee_data = {
             "email": employee.email,
             "full_name": employee.full_name,
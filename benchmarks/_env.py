@@ -0,0 +1,8 @@
+"""Dummy settings so benchmarks can import the app modules without a real .env."""
+import os
+
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017/")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("GEMINI_API_KEY", "benchmark-key")
+os.environ.setdefault("REDIS_HOSTNAME", "localhost")
+os.environ.setdefault("REDIS_PORT", "6379")
@@ -0,0 +1,94 @@
+"""
+Runtime of AnalyticsService.calculate_dashboard_stats against the pre-rewrite implementation.
+
+Synthetic users get ``--apps`` applications and ``--history`` analysis reports spread over a
+year, spread across ``--resumes`` resumes. Both implementations run on the same inputs, and
+their outputs are compared first so a speedup never hides a behaviour change.
+
+    python -m benchmarks.bench_dashboard_stats --apps 10000 --history 10000
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+from benchmarks import _env  # noqa: F401
+
+from benchmarks._legacy_analytics import LegacyAnalyticsService
+from models import ApplicationModel, ResumeModel
+from services.analytics_service import AnalyticsService
+
+STATUSES = ["Wishlist", "Applied", "Interview Scheduled", "Offered", "Rejected", "applied"]
+PLATFORMS = ["LinkedIn", "Indeed", "Company Site", "Referral", None]
+COMPANIES = [f"Company {i}" for i in range(300)]
+
+
+def _user(rng: random.Random, n_apps: int, n_history: int, n_resumes: int):
+    user_id = str(ObjectId())
+    now = datetime.utcnow()
+    resumes = [ResumeModel(_id=str(ObjectId()), user_id=user_id, title=f"Resume {i}",
+                           file_name="cv.pdf", file_path="uploads/cv.pdf", mime_type="application/pdf",
+                           resume_text="", created_at=now - timedelta(days=rng.randint(0, 365)))
+               for i in range(n_resumes)]
+    resume_ids = [r.id for r in resumes] + [None]
+
+    applications = []
+    for _ in range(n_apps):
+        applied = now - timedelta(minutes=rng.randint(0, 365 * 24 * 60))
+        applications.append(ApplicationModel(
+            _id=str(ObjectId()), user_id=user_id, company=rng.choice(COMPANIES), job_title="Engineer",
+            platform=rng.choice(PLATFORMS), resume_used=rng.choice(resume_ids),
+            ats_score=rng.choice([None, 0] + list(range(35, 100))), status=rng.choice(STATUSES),
+            application_date=applied,
+            interview_date=applied + timedelta(days=rng.randint(1, 30)) if rng.random() < 0.2 else None))
+
+    history = [{
+        "_id": ObjectId(), "user_id": ObjectId(user_id), "user_type": "employee",
+        "analysis_result": {"JD-Match": rng.randint(20, 100)},
+        "resume_id": ObjectId(rng.choice(resume_ids[:-1])) if rng.random() < 0.7 else None,
+        "created_at": now - timedelta(minutes=rng.randint(0, 365 * 24 * 60)),
+    } for _ in range(n_history)]
+    return applications, resumes, history
+
+
+def _time(func, args, repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=3)
+    parser.add_argument("--apps", type=int, default=10000)
+    parser.add_argument("--history", type=int, default=10000)
+    parser.add_argument("--resumes", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    legacy_ms, current_ms = [], []
+    for _ in range(args.users):
+        inputs = _user(rng, args.apps, args.history, args.resumes)
+        expected = LegacyAnalyticsService.calculate_dashboard_stats(*inputs)
+        actual = AnalyticsService.calculate_dashboard_stats(*inputs)
+        assert actual == expected, "rewrite output differs from the legacy implementation"
+
+        legacy_ms += _time(LegacyAnalyticsService.calculate_dashboard_stats, inputs, args.repeat)
+        current_ms += _time(AnalyticsService.calculate_dashboard_stats, inputs, args.repeat)
+
+    print(f"{args.users} users x {args.apps} applications, {args.history} history, "
+          f"{args.resumes} resumes (outputs identical)")
+    for label, timings in (("legacy", legacy_ms), ("current", current_ms)):
+        print(f"{label:<8} p50={statistics.median(timings):8.1f}ms  max={max(timings):8.1f}ms")
+    print(f"speedup  {statistics.median(legacy_ms) / statistics.median(current_ms):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Measures the per-row cost of turning Mongo documents into models.
+
+Compares full validation (``Model(**doc)``, the old read path), a compiled
+``TypeAdapter(list[Model])`` over the whole page, and ``from_mongo_many``, the read path the
+services use.
+Each runs over ``--rows`` documents shaped like what the services read back.
+
+    python -m benchmarks.bench_hydration --rows 1000 --repeat 20
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from pydantic import TypeAdapter
+
+from benchmarks import _env  # noqa: F401
+
+from models import (ApplicationModel, EmployerAnalysisModel, ResumeSummaryModel,
+                    from_mongo_many)
+
+
+def _documents(rows: int) -> dict:
+    user_id, jd_id = ObjectId(), ObjectId()
+    now = datetime(2025, 1, 1, 12, 0, 0)
+    return {
+        ApplicationModel: [{
+            "_id": ObjectId(), "user_id": str(user_id), "company": f"Company {i % 40}",
+            "job_title": "Backend Engineer", "platform": "LinkedIn", "resume_used": str(ObjectId()),
+            "application_date": now - timedelta(days=i), "ats_score": i % 100, "status": "Applied",
+            "created_at": now, "updated_at": now,
+        } for i in range(rows)],
+        ResumeSummaryModel: [{
+            "_id": ObjectId(), "user_id": str(user_id), "title": f"Resume {i}",
+            "file_name": "cv.pdf", "file_path": f"uploads/{i}.pdf", "mime_type": "application/pdf",
+            "tags": ["python", "backend"], "created_at": now, "updated_at": now,
+        } for i in range(rows)],
+        EmployerAnalysisModel: [{
+            "_id": ObjectId(), "user_id": str(user_id), "jd_id": str(jd_id), "resume_id": str(ObjectId()),
+            "candidate_name": f"Candidate {i}", "ats_score": 100 - i % 100,
+            "analysis_result": {"JD-Match": 100 - i % 100, "Missing Skills": ["Go"], "Profile Summary": "..."},
+            "status": "Analyzed", "created_at": now, "updated_at": now,
+        } for i in range(rows)],
+    }
+
+
+def _per_row_us(hydrate, docs: list, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        hydrate(docs)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) / len(docs) * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'model':<24}{'validate':>12}{'TypeAdapter':>14}{'from_mongo':>13}   (us/row)")
+    for model, docs in _documents(args.rows).items():
+        adapter = TypeAdapter(list[model])
+        validated = _per_row_us(lambda d: [model(**doc) for doc in d], docs, args.repeat)
+        adapted = _per_row_us(adapter.validate_python, docs, args.repeat)
+        trusted = _per_row_us(lambda d: from_mongo_many(model, d), docs, args.repeat)
+        assert from_mongo_many(model, docs[:5]) == [model(**doc) for doc in docs[:5]]
+        print(f"{model.__name__:<24}{validated:>12.2f}{adapted:>14.2f}{trusted:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Measures serialization of a ranking response with ``--candidates`` EmployerAnalysisModel rows.
+
+``legacy`` is what FastAPI did for ``get_ranked_candidates`` before: ``jsonable_encoder``
+(one ``model_dump`` per candidate, then a walk over every dict) followed by stdlib
+``json.dumps`` in ``JSONResponse``. ``orjson`` is ``FastJSONResponse`` rendering the same
+payload directly. Both bodies are checked to decode to the same JSON.
+
+    python -m benchmarks.bench_json_response --candidates 1000 --repeat 50
+"""
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from models import EmployerAnalysisModel
+from responses import FastJSONResponse
+
+
+def _payload(candidates: int) -> dict:
+    user_id, jd_id = ObjectId(), ObjectId()
+    now = datetime(2025, 1, 1, 12, 0, 0, 123456)
+    analyses = [EmployerAnalysisModel(**{
+        "_id": ObjectId(),
+        "user_id": user_id,
+        "jd_id": jd_id,
+        "resume_id": ObjectId(),
+        "candidate_name": f"Candidate {i}",
+        "resume_summary": "Experienced engineer. " * 10,
+        "ats_score": 100 - i % 100,
+        "analysis_result": {
+            "JD-Match": 100 - i % 100,
+            "is_compatible": True,
+            "compatibility_warning": "",
+            "Missing Skills": ["Kubernetes", "Terraform", "GraphQL"],
+            "Profile Summary": "Strong backend profile with relevant experience. " * 4,
+        },
+        "created_at": now - timedelta(minutes=i),
+        "updated_at": now,
+    }) for i in range(candidates)]
+    return {
+        "job_description": {"id": str(jd_id), "title": "Senior Backend Engineer"},
+        "candidates": analyses,
+        "next_cursor": None,
+    }
+
+
+def _time(render, repeat: int) -> tuple[list[float], bytes]:
+    timings, body = [], b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = render()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings, body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--candidates", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    payload = _payload(args.candidates)
+
+    legacy, legacy_body = _time(lambda: JSONResponse(jsonable_encoder(payload)).body, args.repeat)
+    fast, fast_body = _time(lambda: FastJSONResponse(payload).body, args.repeat)
+    assert json.loads(legacy_body) == json.loads(fast_body), "responses differ"
+
+    for label, timings in (("legacy", legacy), ("orjson", fast)):
+        print(f"{label:<8} p50={statistics.median(timings):.2f}ms  "
+              f"min={min(timings):.2f}ms  ({len(fast_body) / 1024:.0f} KiB body)")
+    print(f"speedup: {statistics.median(legacy) / statistics.median(fast):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
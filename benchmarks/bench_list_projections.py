@@ -0,0 +1,80 @@
+"""
+Payload size and hydration cost of the resume and JD list endpoints, full documents vs summaries.
+
+Documents are synthetic but sized like real uploads: a few KB of extracted resume text and
+a few KB of job description. The timing covers model validation plus JSON serialisation,
+which is the work the API does per list request after Mongo returns.
+
+    python -m benchmarks.bench_list_projections --rows 100
+"""
+import argparse
+import random
+import time
+from datetime import datetime
+
+from bson import ObjectId
+
+from models import (JobDescriptionModel, JobDescriptionSummaryModel, ResumeModel,
+                    ResumeSummaryModel)
+
+WORDS = ("python fastapi mongodb redis docker kubernetes aws react typescript leadership "
+         "delivered migrated designed scaled pipeline analytics microservices testing").split()
+
+
+def _text(rng: random.Random, n_words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n_words))
+
+
+def _resume(rng: random.Random, user_id: str) -> dict:
+    return {
+        "_id": ObjectId(), "user_id": user_id, "title": "Resume " + _text(rng, 2),
+        "file_name": "cv.pdf", "file_path": "uploads/resumes/cv.pdf",
+        "mime_type": "application/pdf", "resume_text": _text(rng, 1200),
+        "tags": ["Employer Upload"], "created_at": datetime.utcnow(), "updated_at": datetime.utcnow(),
+    }
+
+
+def _jd(rng: random.Random, user_id: str) -> dict:
+    return {
+        "_id": ObjectId(), "user_id": user_id, "title": "Engineer " + _text(rng, 2),
+        "required_skills": WORDS[:6], "preferred_skills": WORDS[6:9],
+        "full_description": _text(rng, 800), "status": "Open",
+        "created_at": datetime.utcnow(), "updated_at": datetime.utcnow(),
+    }
+
+
+def _measure(model, docs: list[dict], projected_field: str | None, repeat: int):
+    if projected_field:
+        docs = [{k: v for k, v in d.items() if k != projected_field} for d in docs]
+    start = time.perf_counter()
+    for _ in range(repeat):
+        body = b"[" + b",".join(model(**d).model_dump_json(by_alias=True).encode() for d in docs) + b"]"
+    elapsed = (time.perf_counter() - start) / repeat * 1000
+    return len(body), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    user_id = str(ObjectId())
+    resumes = [_resume(rng, user_id) for _ in range(args.rows)]
+    jds = [_jd(rng, user_id) for _ in range(args.rows)]
+
+    cases = [
+        ("resumes", ResumeModel, ResumeSummaryModel, resumes, "resume_text"),
+        ("jds", JobDescriptionModel, JobDescriptionSummaryModel, jds, "full_description"),
+    ]
+    for label, full_model, summary_model, docs, field in cases:
+        full_size, full_ms = _measure(full_model, docs, None, args.repeat)
+        summary_size, summary_ms = _measure(summary_model, docs, field, args.repeat)
+        print(f"{label:<8} full: {full_size / 1024:8.1f} KiB {full_ms:7.2f}ms   "
+              f"summary: {summary_size / 1024:6.1f} KiB {summary_ms:6.2f}ms   "
+              f"({full_size / summary_size:.0f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
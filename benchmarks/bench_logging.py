@@ -0,0 +1,109 @@
+"""
+Measures request throughput under the old synchronous logging setup and the queued one.
+
+A request is modelled as the log calls made while scoring one CV: a handful of service INFO
+lines plus ``parse_llm_response`` on a ``--payload-kb`` LLM response. ``legacy`` is the
+former configuration: a synchronous stdout handler, f-strings and the full raw response at
+INFO. ``queued`` is ``configure_logging()`` without rate limiting, and ``queued+sampled``
+adds the default payload sampling and per-logger rate limits. Log output goes to a temp file
+whose writes block for ``--write-latency-us``, approximating a stdout pipe into a container
+log driver under load.
+
+    python -m benchmarks.bench_logging --requests 20000 --payload-kb 4 --write-latency-us 100
+"""
+import argparse
+import json
+import logging
+import tempfile
+import time
+
+from benchmarks import _env  # noqa: F401
+
+import log_config
+from helpers import parse_llm_response
+
+logger = logging.getLogger("services.bench")
+
+
+class _SlowSink:
+    def __init__(self, target, latency: float):
+        self.target = target
+        self.latency = latency
+
+    def write(self, text: str):
+        time.sleep(self.latency)
+        return self.target.write(text)
+
+    def flush(self):
+        self.target.flush()
+
+
+def _llm_response(payload_kb: int) -> str:
+    summary = "x" * (payload_kb * 1024)
+    return json.dumps({"Evaluation": [{"critical": True, "score": 4}], "Profile Summary": summary})
+
+
+def _legacy_request(user_id: str, llm_response: str):
+    logger.info(f"Fetching jd {user_id} for user {user_id}")
+    logger.info(f"Starting batch analysis for jd {user_id} with {1} resumes")
+    logging.getLogger("helpers").info(f"LLM Response: {llm_response}")
+    logging.getLogger("helpers").info(f"Calculated JD-Match Score: {80}%")
+    logger.info(f"POST /api/employer - Status: {200} - {12.5:.2f}ms")
+
+
+def _request(user_id: str, llm_response: str):
+    logger.info("Fetching jd %s for user %s", user_id, user_id)
+    logger.info("Starting batch analysis for jd %s with %s resumes", user_id, 1)
+    parse_llm_response(llm_response)
+    logger.info("%s %s - Status: %s - %.2fms", "POST", "/api/employer", 200, 12.5)
+
+
+def _reset_root():
+    log_config.stop_logging()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+
+
+def _run(label: str, request, requests: int, llm_response: str) -> float:
+    start = time.perf_counter()
+    for i in range(requests):
+        request(str(i), llm_response)
+    elapsed = time.perf_counter() - start
+    # Records still queued are written by the listener thread, off the request path
+    drain_start = time.perf_counter()
+    log_config.stop_logging()
+    drain = time.perf_counter() - drain_start
+    print(f"{label:<16} {requests / elapsed:>10.0f} req/s   (backlog drained in {drain:.2f}s)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--payload-kb", type=int, default=4)
+    parser.add_argument("--write-latency-us", type=float, default=100)
+    args = parser.parse_args()
+    llm_response = _llm_response(args.payload_kb)
+
+    with tempfile.TemporaryFile("w") as target:
+        sink = _SlowSink(target, args.write_latency_us / 1_000_000)
+        _reset_root()
+        logging.basicConfig(stream=sink, level=logging.INFO, format=log_config.TEXT_FORMAT)
+        _run("legacy", _legacy_request, args.requests, llm_response)
+
+        rate_limit = log_config.LOG_RATE_LIMIT_PER_SECOND
+        _reset_root()
+        log_config.LOG_RATE_LIMIT_PER_SECOND = 0
+        log_config.configure_logging(sink)
+        _run("queued", _request, args.requests, llm_response)
+
+        _reset_root()
+        log_config.LOG_RATE_LIMIT_PER_SECOND = rate_limit
+        log_config.configure_logging(sink)
+        _run("queued+sampled", _request, args.requests, llm_response)
+        _reset_root()
+
+
+if __name__ == "__main__":
+    main()
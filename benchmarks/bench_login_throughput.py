@@ -0,0 +1,64 @@
+"""
+Login throughput and event-loop responsiveness under a burst of Argon2 verifications.
+
+Compares verifying on the event loop (the previous behaviour) with the bounded
+password-hashing pool in ``auth``. A ticker coroutine runs alongside the burst and records
+how late it wakes up, which is what every other request on the worker experiences.
+
+    python -m benchmarks.bench_login_throughput --logins 64
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks import _env  # noqa: F401
+
+import auth
+
+PASSWORD = "correct horse battery staple"
+
+
+async def _ticker(stop: asyncio.Event, lags: list[float], interval: float = 0.005):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append((time.perf_counter() - start - interval) * 1000)
+
+
+async def _inline_verify(plain_password: str, hashed: str):
+    return auth.pwd_context.verify(plain_password, hashed)
+
+
+async def _run(label: str, verify, hashed: str, logins: int):
+    stop = asyncio.Event()
+    lags: list[float] = []
+    ticker = asyncio.create_task(_ticker(stop, lags))
+    await asyncio.sleep(0.02)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(verify(PASSWORD, hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await ticker
+    assert all(results)
+    print(f"{label:<10} {logins / elapsed:7.1f} logins/s  "
+          f"max loop lag={max(lags):8.1f}ms  wall={elapsed:.2f}s")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=32)
+    args = parser.parse_args()
+
+    auth.PASSWORD_HASH_MAX_PENDING = max(auth.PASSWORD_HASH_MAX_PENDING, args.logins)
+    hashed = auth.pwd_context.hash(PASSWORD)
+    print(f"argon2 params: t={auth.ARGON2_TIME_COST} m={auth.ARGON2_MEMORY_COST}KiB "
+          f"p={auth.ARGON2_PARALLELISM}, pool workers={auth.PASSWORD_HASH_WORKERS}")
+
+    await _run("inline", _inline_verify, hashed, args.logins)
+    await _run("pooled", auth.verify_password, hashed, args.logins)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
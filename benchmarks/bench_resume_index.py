@@ -0,0 +1,65 @@
+"""
+Query latency of the resume similarity index for one owner's resumes.
+
+Writes ``--resumes`` random unit vectors to a memory-mapped snapshot-style file, then times
+``most_similar``-equivalent searches: embedding the JD text, scoring every row of the owner's
+slice, and selecting the top ``--limit``. ``--added`` rows are kept in memory as if they were
+uploaded after the snapshot, and ``--removed`` of them are deleted.
+
+    python -m benchmarks.bench_resume_index --resumes 5000 --repeat 200
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks import _env  # noqa: F401
+
+from services.resume_index_service import _OwnerRows
+from text_features import embed
+
+JD_TEXT = ("Senior backend engineer. Python, FastAPI and MongoDB in production, Redis caching, "
+           "Docker and Kubernetes on AWS, CI/CD pipelines, mentoring engineers. ") * 10
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--resumes", type=int, default=5000)
+    parser.add_argument("--added", type=int, default=200)
+    parser.add_argument("--removed", type=int, default=50)
+    parser.add_argument("--dim", type=int, default=512)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    path = os.path.join(tempfile.mkdtemp(), "vectors.npy")
+    vectors = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(args.resumes, args.dim))
+    vectors[:] = rng.standard_normal((args.resumes, args.dim), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors.flush()
+    del vectors
+
+    ids = np.array([f"{i:024x}" for i in range(args.resumes)], dtype="U24")
+    rows = _OwnerRows(ids, np.load(path, mmap_mode="r"))
+    for i in range(args.added):
+        vector = rng.standard_normal(args.dim).astype(np.float32)
+        rows.add(f"{args.resumes + i:024x}", vector / np.linalg.norm(vector))
+    rows.removed.update(ids[:args.removed].tolist())
+
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        rows.search(embed(JD_TEXT, args.dim), args.limit)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    print(f"{args.resumes} + {args.added} resumes, dim {args.dim}: "
+          f"p50={statistics.median(timings):.2f}ms  p99={timings[int(len(timings) * 0.99) - 1]:.2f}ms  "
+          f"({args.resumes * args.dim * 4 / 1024 / 1024:.1f} MiB mapped)")
+
+
+if __name__ == "__main__":
+    main()
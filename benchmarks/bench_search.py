@@ -0,0 +1,133 @@
+"""
+Query latency of resume full-text search for one owner with many resumes.
+
+Generates ``--resumes`` synthetic resumes (a title, tags and a few hundred words of body drawn
+from a skewed vocabulary) and times a fixed set of queries, first page of ``--limit`` hits,
+against the in-process BM25 index used by ``SEARCH_RESUME_BACKEND=memory``.
+
+With ``--mongo``, the same resumes are also written to a scratch ``bench_search`` database
+at ``MONGO_URI`` with the declared text index, and the ``$text`` query the default backend
+runs is timed as well. The database is dropped afterwards.
+
+    python -m benchmarks.bench_search --resumes 100000
+    python -m benchmarks.bench_search --resumes 100000 --mongo
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from benchmarks import _env  # noqa: F401
+
+from indexes import SEARCH_FIELDS
+from inverted_index import InvertedIndex
+
+SKILLS = ("python", "java", "javascript", "typescript", "react", "node.js", "fastapi", "django",
+          "mongodb", "postgresql", "redis", "docker", "kubernetes", "aws", "gcp", "terraform",
+          "kafka", "spark", "pandas", "pytorch", "c++", "c#", "golang", "rust", "graphql")
+TITLES = ("Backend Engineer", "Frontend Developer", "Data Scientist", "DevOps Engineer",
+          "Full Stack Developer", "Machine Learning Engineer", "Site Reliability Engineer")
+FILLER = ("designed built led migrated reduced latency improved reliability team platform "
+          "services customers production pipelines deployed owned mentored scaled api data "
+          "systems testing monitoring dashboards features releases architecture cloud costs "
+          "stakeholders roadmap performance analytics infrastructure automation security").split()
+QUERIES = ("python", "kubernetes terraform", "senior backend engineer", "machine learning pytorch",
+           "react typescript", "kafka spark pipelines", "rust", "latency reduced redis")
+
+
+def synthetic_resumes(count: int, body_words: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array(SKILLS + tuple(FILLER))
+    # Zipf-like: a few words are everywhere, most are rare
+    weights = 1 / np.arange(1, len(vocabulary) + 1)
+    weights /= weights.sum()
+    for i in range(count):
+        body = rng.choice(vocabulary, size=body_words, p=weights)
+        tags = rng.choice(np.array(SKILLS), size=3, replace=False)
+        yield f"{i:024x}", {
+            "title": ("Senior " if i % 3 == 0 else "") + TITLES[i % len(TITLES)],
+            "tags": ", ".join(tags),
+            "skills": ", ".join(sorted(set(body) & set(SKILLS))),
+            "file_name": f"resume_{i}.pdf",
+            "resume_text": " ".join(body),
+        }
+
+
+def report(label: str, timings: list[float]):
+    timings.sort()
+    print(f"{label}: p50={statistics.median(timings):.2f}ms  "
+          f"p99={timings[max(0, int(len(timings) * 0.99) - 1)]:.2f}ms")
+
+
+def bench_memory(args):
+    index = InvertedIndex(SEARCH_FIELDS["resumes"])
+    start = time.perf_counter()
+    for resume_id, fields in synthetic_resumes(args.resumes, args.words):
+        index.add(resume_id, fields)
+    print(f"Indexed {len(index)} resumes in {time.perf_counter() - start:.1f}s")
+
+    timings = []
+    for _ in range(args.repeat):
+        for query in QUERIES:
+            start = time.perf_counter()
+            index.search(query, args.limit)
+            timings.append((time.perf_counter() - start) * 1000)
+    report(f"memory, {args.resumes} resumes", timings)
+
+
+def bench_mongo(args):
+    from pymongo import MongoClient
+
+    from config import MONGO_URI
+    from indexes import INDEXES
+
+    client = MongoClient(MONGO_URI)
+    db = client.get_database("bench_search")
+    user_id = "0" * 24
+    try:
+        db.resumes.drop()
+        db.resumes.create_indexes([model for model in INDEXES["resumes"]
+                                   if model.document["name"] == "user_id_text"])
+        batch = []
+        for _, fields in synthetic_resumes(args.resumes, args.words):
+            fields["tags"] = fields["tags"].split(", ")
+            fields["skills"] = fields["skills"].split(", ")
+            batch.append({"user_id": user_id, **fields})
+            if len(batch) == 5000:
+                db.resumes.insert_many(batch)
+                batch = []
+        if batch:
+            db.resumes.insert_many(batch)
+
+        # The query SearchService._search_mongo runs for the first page
+        projection = {field: 1 for field in SEARCH_FIELDS["resumes"]}
+        projection["score"] = {"$meta": "textScore"}
+        timings = []
+        for _ in range(args.repeat):
+            for query in QUERIES:
+                start = time.perf_counter()
+                list(db.resumes.find({"user_id": user_id, "$text": {"$search": query}}, projection).sort(
+                    [("score", {"$meta": "textScore"}), ("_id", -1)]).limit(args.limit + 1))
+                timings.append((time.perf_counter() - start) * 1000)
+        report(f"mongo $text, {args.resumes} resumes", timings)
+    finally:
+        client.drop_database("bench_search")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--resumes", type=int, default=100_000)
+    parser.add_argument("--words", type=int, default=300)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--mongo", action="store_true", help="also time $text queries on MONGO_URI")
+    args = parser.parse_args()
+
+    bench_memory(args)
+    if args.mongo:
+        bench_mongo(args)
+
+
+if __name__ == "__main__":
+    main()
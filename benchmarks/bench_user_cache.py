@@ -0,0 +1,90 @@
+"""
+Measures the latency of the ``get_current_user`` dependency with and without the user cache.
+
+MongoDB is replaced by an in-memory collection that sleeps for ``--db-latency-ms`` per
+lookup, approximating a round trip to Atlas. A page view is modelled as ``--calls-per-view``
+authenticated API calls made with the same token.
+
+    python -m benchmarks.bench_user_cache --views 200 --db-latency-ms 3
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime
+
+from bson import ObjectId
+
+from benchmarks import _env  # noqa: F401
+
+import auth
+from services.user_cache_service import user_cache
+
+
+class _FakeUsers:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.user = {
+            "_id": ObjectId(),
+            "email": "bench@example.com",
+            "full_name": "Bench User",
+            "password": "not-a-real-hash",
+            "user_type": "employee",
+            "plan": "free",
+            "created_at": datetime.now(),
+            "is_active": True,
+        }
+
+    async def find_one(self, query):
+        await asyncio.sleep(self.latency)
+        return self.user if query.get("email") == self.user["email"] else None
+
+
+class _FakeDb:
+    def __init__(self, latency: float):
+        self.users = _FakeUsers(latency)
+
+
+async def _measure(token: str, views: int, calls_per_view: int, cached: bool) -> list[float]:
+    timings = []
+    for _ in range(views):
+        if not cached:
+            user_cache.clear()
+        for _ in range(calls_per_view):
+            start = time.perf_counter()
+            await auth.get_current_user(token)
+            timings.append((time.perf_counter() - start) * 1000)
+            if not cached:
+                user_cache.clear()
+    return timings
+
+
+def _report(label: str, timings: list[float]):
+    q = statistics.quantiles(timings, n=100)
+    print(f"{label:<10} p50={q[49]:.3f}ms  p95={q[94]:.3f}ms  mean={statistics.mean(timings):.3f}ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--views", type=int, default=200)
+    parser.add_argument("--calls-per-view", type=int, default=5)
+    parser.add_argument("--db-latency-ms", type=float, default=3.0)
+    args = parser.parse_args()
+
+    fake_db = _FakeDb(args.db_latency_ms / 1000)
+    auth.get_db = lambda: fake_db
+    user_cache.use_redis = False
+    token = auth.create_access_token({"sub": fake_db.users.user["email"], "user_type": "employee"})
+
+    uncached = await _measure(token, args.views, args.calls_per_view, cached=False)
+    user_cache.clear()
+    user_cache.hits = user_cache.misses = 0
+    cached = await _measure(token, args.views, args.calls_per_view, cached=True)
+
+    _report("uncached", uncached)
+    _report("cached", cached)
+    print(f"hit rate: {user_cache.stats()['hit_rate']:.2%}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,81 @@
+"""
+Profiles how long ``import app`` takes in a fresh interpreter and fails over budget.
+
+Runs ``python -X importtime -c "import app"`` in a subprocess, prints the slowest modules by
+cumulative time, and exits non-zero if the total exceeds ``--budget-ms`` or if any module
+that should only load on first use (see ``LAZY_MODULES``) was imported eagerly. Timings are
+the median of ``--runs`` runs, so one slow disk read doesn't fail the check.
+
+    python -m benchmarks.import_budget --budget-ms 900
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+from benchmarks import _env  # noqa: F401
+
+# Heavy dependencies that must stay out of the worker's startup path
+LAZY_MODULES = (
+    "google.generativeai",
+    "google.ai.generativelanguage_v1beta",
+    "xhtml2pdf",
+    "htmldocx",
+    "docx",
+    "pdfplumber",
+    "boto3",
+)
+
+
+def _profile() -> dict[str, int]:
+    """Cumulative import time in microseconds per module, for one fresh import of the app."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        capture_output=True, text=True, env=os.environ.copy(),
+    )
+    if result.returncode != 0:
+        sys.exit(f"import app failed:\n{result.stderr}")
+
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative_us, module = line.split("|")
+        if cumulative_us.strip().isdigit():
+            cumulative[module.strip()] = int(cumulative_us)
+    return cumulative
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--budget-ms", type=float, default=900)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    runs = [_profile() for _ in range(args.runs)]
+    totals = [run["app"] / 1000 for run in runs]
+    median_run = runs[totals.index(statistics.median_low(totals))]
+
+    print(f"{'cumulative ms':>14}  module")
+    for module, cumulative_us in sorted(median_run.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f}  {module}")
+
+    total = statistics.median(totals)
+    print(f"\nimport app: median {total:.0f}ms over {args.runs} runs (budget {args.budget_ms:.0f}ms)")
+
+    eager = [lazy for lazy in LAZY_MODULES
+             if any(module == lazy or module.startswith(lazy + ".") for module in median_run)]
+    failed = False
+    if eager:
+        print(f"FAIL: imported at startup but should load on first use: {', '.join(eager)}")
+        failed = True
+    if total > args.budget_ms:
+        print(f"FAIL: over the import-time budget by {total - args.budget_ms:.0f}ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,26 @@
 const API_URL = '/api';
 
+// List endpoints are cursor-paginated; follow next_cursor until the last page.
+const fetchAllPages = async (url, token, errorMessage, itemsKey = 'items') => {
+  const items = [];
+  let cursor = null;
+  let page;
+  do {
+    const pageUrl = cursor ? `${url}?cursor=${encodeURIComponent(cursor)}` : url;
+    const response = await fetch(pageUrl, {
+      headers: { 'Authorization': `Bearer ${token}` }
+    });
+    if (!response.ok) {
+      const error = await response.json().catch(() => ({}));
+      throw new Error(error.detail || errorMessage);
+    }
+    page = await response.json();
+    items.push(...(page[itemsKey] || []));
+    cursor = page.next_cursor;
+  } while (cursor);
+  return { ...page, [itemsKey]: items };
+};
+
 export const login = async (username, password, user_type) => {
   const formData = new FormData();
   formData.append('username', username);
@@ -123,18 +144,22 @@ export const getDashboardData = async (token) => {
 };
 
 export const getResumes = async (token) => {
-  const response = await fetch(`${API_URL}/resumes`, {
+  const data = await fetchAllPages(`${API_URL}/resumes`, token, 'Failed to fetch resumes');
+  return data.items.map(r => ({ ...r, id: r._id || r.id }));
+};
+
+export const getResume = async (id, token) => {
+  const response = await fetch(`${API_URL}/resumes/${id}`, {
     headers: {
       'Authorization': `Bearer ${token}`
     }
   });
   if (!response.ok) {
     const error = await response.json();
-    throw new Error(error.detail || 'Failed to fetch resumes');
+    throw new Error(error.detail || 'Failed to fetch resume');
   }
   const data = await response.json();
-  const resumesArray = Array.isArray(data) ? data : (data.resumes || []);
-  return resumesArray.map(r => ({ ...r, id: r._id || r.id }));
+  return { ...data, id: data._id || data.id };
 };
 
 export const uploadResume = async (file, title, tags, token) => {
@@ -210,11 +235,8 @@ export const downloadResumeUrl = async (id, token) => {
 // --- Applications API ---
 
 export const getApplications = async (token) => {
-  const response = await fetch(`${API_URL}/applications`, {
-    headers: { 'Authorization': `Bearer ${token}` }
-  });
-  if (!response.ok) throw new Error('Failed to fetch applications');
-  return response.json();
+  const data = await fetchAllPages(`${API_URL}/applications`, token, 'Failed to fetch applications');
+  return data.items;
 };
 
 export const createApplication = async (data, token) => {
@@ -358,12 +380,17 @@ export const generateInterviewPrep = async (resumeId, jdText, jdFile, token) =>
 // --- Employer Module APIs ---
 
 export const getEmployerJds = async (token) => {
-  const response = await fetch(`${API_URL}/employer/jds`, {
+  const data = await fetchAllPages(`${API_URL}/employer/jds`, token, 'Failed to fetch job descriptions');
+  return data.items.map(jd => ({ ...jd, id: jd._id || jd.id }));
+};
+
+export const getEmployerJd = async (id, token) => {
+  const response = await fetch(`${API_URL}/employer/jds/${id}`, {
     headers: { 'Authorization': `Bearer ${token}` }
   });
-  if (!response.ok) throw new Error('Failed to fetch job descriptions');
+  if (!response.ok) throw new Error('Failed to fetch job description');
   const data = await response.json();
-  return Array.isArray(data) ? data.map(jd => ({ ...jd, id: jd._id || jd.id })) : [];
+  return { ...data, id: data._id || data.id };
 };
 
 export const createEmployerJd = async (data, token) => {
@@ -461,11 +488,7 @@ export const analyzeEmployerBatchFiles = async (jdId, cvFiles, token) => {
 };
 
 export const getCandidateRankings = async (jdId, token) => {
-  const response = await fetch(`${API_URL}/employer/analysis/${jdId}`, {
-    headers: { 'Authorization': `Bearer ${token}` }
-  });
-  if (!response.ok) throw new Error('Failed to fetch candidate rankings');
-  return response.json();
+  return fetchAllPages(`${API_URL}/employer/analysis/${jdId}`, token, 'Failed to fetch candidate rankings', 'candidates');
 };
 
 export const updateEmployerCandidateStatus = async (analysisId, status, token) => {
@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { useSearchParams, useNavigate } from 'react-router-dom';
 import { Home, Briefcase, Users, LayoutDashboard, Search, User, LogOut, CheckCircle, FileText, Download, MessageSquare } from 'lucide-react';
-import { getEmployerJds, getCandidateRankings, getCandidateSummary, exportResume } from '../lib/api';
+import { getEmployerJds, getEmployerJd, getCandidateRankings, getCandidateSummary, exportResume } from '../lib/api';
 import { toast } from 'sonner';
 import InterviewKitModal from '../components/InterviewKitModal';
 import EmployerLayout from '../components/EmployerLayout';
@@ -32,9 +32,13 @@ const CandidateRanking = () => {
     if (selectedJd) {
       fetchRankings(selectedJd);
       
-      // Find JD data for interview kit
-      const jd = jds.find(j => j.id === selectedJd);
-      if (jd) setJdDataForInterview(jd);
+      // Load the full JD (the list omits its description) for the interview kit
+      if (jds.some(j => j.id === selectedJd)) {
+        const token = localStorage.getItem('token');
+        getEmployerJd(selectedJd, token)
+          .then(setJdDataForInterview)
+          .catch(() => setJdDataForInterview(null));
+      }
     } else {
       setCandidates([]);
     }
@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { Home, Briefcase, Users, LayoutDashboard, Plus, Trash2, Edit2, Play, LogOut, Search, User, Upload } from 'lucide-react';
-import { getEmployerJds, createEmployerJd, updateEmployerJd, deleteEmployerJd, parseEmployerJdFile } from '../lib/api';
+import { getEmployerJds, getEmployerJd, createEmployerJd, updateEmployerJd, deleteEmployerJd, parseEmployerJdFile } from '../lib/api';
 import { toast } from 'sonner';
 import EmployerLayout from '../components/EmployerLayout';
 
@@ -50,8 +50,16 @@ const JdManager = () => {
     navigate('/');
   };
 
-  const handleOpenModal = (jd = null) => {
+  const handleOpenModal = async (jd = null) => {
     if (jd) {
+      // The JD list omits the full description, so load the complete record for editing
+      try {
+        const token = localStorage.getItem('token');
+        jd = await getEmployerJd(jd.id, token);
+      } catch (error) {
+        toast.error('Failed to load Job Description');
+        return;
+      }
       setEditingJd(jd);
       setFormData({
         title: jd.title || '',
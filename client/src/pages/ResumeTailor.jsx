@@ -4,11 +4,12 @@ import { FileText, Wand2, Download, ArrowRight, CheckCircle2, ChevronRight, Load
 import { toast } from 'sonner';
 import ReactMarkdown from 'react-markdown';
 import DashboardLayout from '../components/DashboardLayout';
-import { getResumes, tailorResume, exportResume } from '../lib/api';
+import { getResumes, getResume, tailorResume, exportResume } from '../lib/api';
 
 const ResumeTailor = () => {
   const [resumes, setResumes] = useState([]);
   const [selectedResumeId, setSelectedResumeId] = useState('');
+  const [selectedResumeText, setSelectedResumeText] = useState('');
   const [jdText, setJdText] = useState('');
   const [jdFile, setJdFile] = useState(null);
   const [loading, setLoading] = useState(false);
@@ -34,6 +35,25 @@ const ResumeTailor = () => {
     fetchResumes();
   }, [navigate]);
 
+  // The resume list omits the extracted text, so load it for the selected resume only
+  useEffect(() => {
+    if (!selectedResumeId) {
+      setSelectedResumeText('');
+      return;
+    }
+    const fetchResumeText = async () => {
+      try {
+        const token = localStorage.getItem('token');
+        const resume = await getResume(selectedResumeId, token);
+        setSelectedResumeText(resume.resume_text || '');
+      } catch (err) {
+        console.error('Failed to fetch resume text:', err);
+        setSelectedResumeText('');
+      }
+    };
+    fetchResumeText();
+  }, [selectedResumeId]);
+
   const handleFileChange = (e) => {
     if (e.target.files && e.target.files[0]) {
       setJdFile(e.target.files[0]);
@@ -101,10 +121,7 @@ const ResumeTailor = () => {
     }
   };
 
-  const getSelectedResumeText = () => {
-    const resume = resumes.find(r => r._id === selectedResumeId);
-    return resume ? resume.resume_text : '';
-  };
+  const getSelectedResumeText = () => selectedResumeText;
 
   return (
     <DashboardLayout>
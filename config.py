@@ -17,6 +17,13 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(
     os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 
+# --- Password Hashing (Argon2) ---
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "3"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "65536"))  # KiB
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "4"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+
 # --- LLM API ---
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 if not GEMINI_API_KEY:
@@ -28,6 +35,46 @@ REDIS_HOSTNAME = os.getenv("REDIS_HOSTNAME")
 REDIS_PORT = os.getenv("REDIS_PORT")
 REDIS_USERNAME = os.getenv("REDIS_USERNAME")
 REDIS_PASSWORD = os.getenv("REDIS_PASSWORD")
+# Redis calls sit on request paths: fail fast and fall back rather than stall the worker
+REDIS_SOCKET_TIMEOUT_SECONDS = float(os.getenv("REDIS_SOCKET_TIMEOUT_SECONDS", "0.5"))
+REDIS_CONNECT_TIMEOUT_SECONDS = float(os.getenv("REDIS_CONNECT_TIMEOUT_SECONDS", "0.5"))
+
+# --- Caching ---
+USER_CACHE_TTL_SECONDS = int(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", "1024"))
+USER_CACHE_USE_REDIS = os.getenv(
+    "USER_CACHE_USE_REDIS", "False").lower() in ("true", "1", "t")
+# Serve the job-seeker dashboard from the incrementally maintained user_stats documents
+INCREMENTAL_DASHBOARD_STATS = os.getenv(
+    "INCREMENTAL_DASHBOARD_STATS", "True").lower() in ("true", "1", "t")
+# Dashboard LLM insights, cached in Redis and regenerated in the background when stale
+INSIGHT_CACHE_TTL_SECONDS = int(os.getenv("INSIGHT_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+INSIGHT_CACHE_MAX_SIZE = int(os.getenv("INSIGHT_CACHE_MAX_SIZE", "10000"))
+INSIGHT_REFRESH_DEBOUNCE_SECONDS = int(os.getenv("INSIGHT_REFRESH_DEBOUNCE_SECONDS", "60"))
+# Candidate summaries pre-generated after a batch analysis, per JD
+SUMMARY_PREFETCH_TOP_K = int(os.getenv("SUMMARY_PREFETCH_TOP_K", "10"))
+SUMMARY_PREFETCH_CONCURRENCY = int(os.getenv("SUMMARY_PREFETCH_CONCURRENCY", "2"))
+# /api/employer batch pipeline: concurrent text extractions, concurrent LLM scoring calls,
+# and the capacity of the queues between stages
+EMPLOYER_EXTRACT_CONCURRENCY = int(os.getenv("EMPLOYER_EXTRACT_CONCURRENCY", "4"))
+EMPLOYER_SCORE_CONCURRENCY = int(os.getenv("EMPLOYER_SCORE_CONCURRENCY", "8"))
+EMPLOYER_PIPELINE_QUEUE_SIZE = int(os.getenv("EMPLOYER_PIPELINE_QUEUE_SIZE", "8"))
+# Resume similarity index: snapshot directory (python -m services.resume_index_service build)
+# and vector size, a power of two. Changing the size makes existing snapshots unusable.
+RESUME_INDEX_DIR = os.getenv("RESUME_INDEX_DIR", "data/resume_index")
+RESUME_INDEX_DIM = int(os.getenv("RESUME_INDEX_DIM", "512"))
+# Estimated shingle similarity above which a new resume counts as a copy of an earlier one,
+# and whether batch analysis reuses the earlier resume's analysis for copies
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.9"))
+NEAR_DUPLICATE_AUTO_LINK = os.getenv(
+    "NEAR_DUPLICATE_AUTO_LINK", "True").lower() in ("true", "1", "t")
+# Skill dictionaries merged in order (later files add skills or aliases), comma-separated
+SKILL_DICTIONARY_PATHS = [path.strip() for path in os.getenv(
+    "SKILL_DICTIONARY_PATHS", "skills.json").split(",") if path.strip()]
+# /api/search over resumes: "mongo" (text index) or "memory" (in-process BM25 index per user)
+SEARCH_RESUME_BACKEND = os.getenv("SEARCH_RESUME_BACKEND", "mongo").lower()
+# Per-dependency timeout for the /api/ready probe
+READINESS_CHECK_TIMEOUT_SECONDS = float(os.getenv("READINESS_CHECK_TIMEOUT_SECONDS", "5"))
 
 # --- Storage ---
 USE_S3 = os.getenv("USE_S3", "False").lower() in ("true", "1", "t")
@@ -35,3 +82,32 @@ AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID", "").strip() or None
 AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY", "").strip() or None
 AWS_REGION = os.getenv("AWS_REGION", "").strip() or None
 AWS_S3_BUCKET_NAME = os.getenv("AWS_S3_BUCKET_NAME", "").strip() or None
+# Validate documents read from Mongo in strict mode, rejecting any that need coercion (debugging)
+STRICT_MODEL_VALIDATION = os.getenv(
+    "STRICT_MODEL_VALIDATION", "False").lower() in ("true", "1", "t")
+
+# --- Server (python -m server) ---
+WEB_HOST = os.getenv("WEB_HOST", "0.0.0.0")
+WEB_PORT = int(os.getenv("PORT", os.getenv("WEB_PORT", "8000")))
+# Worker processes; 0 sizes from the CPUs available to the container
+WEB_WORKERS = int(os.getenv("WEB_WORKERS", "0"))
+WEB_MAX_WORKERS = int(os.getenv("WEB_MAX_WORKERS", "8"))
+# Recycle a worker after this many requests (plus jitter) to cap parser memory creep
+WEB_MAX_REQUESTS = int(os.getenv("WEB_MAX_REQUESTS", "1000"))
+WEB_MAX_REQUESTS_JITTER = int(os.getenv("WEB_MAX_REQUESTS_JITTER", "100"))
+# Seconds a worker gets on SIGTERM to finish in-flight requests and background work
+WEB_GRACEFUL_TIMEOUT = int(os.getenv("WEB_GRACEFUL_TIMEOUT", "120"))
+# Part of the graceful timeout reserved for background tasks (summary prefetch, insights)
+SHUTDOWN_DRAIN_SECONDS = int(os.getenv("SHUTDOWN_DRAIN_SECONDS", "20"))
+WEB_KEEPALIVE = int(os.getenv("WEB_KEEPALIVE", "5"))
+
+# --- Logging ---
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()  # "json" or "text"
+# Fraction of large payloads (raw LLM responses) that are actually logged, and their cap
+LOG_PAYLOAD_SAMPLE_RATE = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "0.01"))
+LOG_PAYLOAD_MAX_CHARS = int(os.getenv("LOG_PAYLOAD_MAX_CHARS", "2000"))
+# INFO records per second per logger; 0 disables rate limiting
+LOG_RATE_LIMIT_PER_SECOND = float(os.getenv("LOG_RATE_LIMIT_PER_SECOND", "50"))
+# Records waiting for the writer thread; further records are dropped while it is full
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
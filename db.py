@@ -1,12 +1,21 @@
 from motor.motor_asyncio import AsyncIOMotorClient
 
 from config import MONGO_URI
+from timing import MongoTimingListener
 
 if not MONGO_URI:
     raise ValueError("MONGO_URI environment variable not set.")
 
-client = AsyncIOMotorClient(MONGO_URI)  # type: ignore
+_client = None
+
+
+def get_client() -> AsyncIOMotorClient:
+    """The shared Motor client, created on first use so importing the app stays cheap."""
+    global _client
+    if _client is None:
+        _client = AsyncIOMotorClient(MONGO_URI, event_listeners=[MongoTimingListener()])  # type: ignore
+    return _client
 
 
 def get_db():
-    return client.get_database("ATS_Test")
+    return get_client().get_database("ATS_Test")
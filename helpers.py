@@ -2,67 +2,146 @@ import io
 import json
 import logging
 import os
+import threading
 
 logger = logging.getLogger(__name__)
 import time
 
-import docx
-import google.generativeai as genai
-import pdfplumber as pdf
-import redis
 from fastapi import HTTPException, Request, UploadFile
 from fastapi.concurrency import run_in_threadpool
-from google.ai.generativelanguage_v1beta.types import content
 
-from config import (GEMINI_API_KEY, REDIS_HOSTNAME, REDIS_PASSWORD, REDIS_PORT,
+from config import (GEMINI_API_KEY, REDIS_CONNECT_TIMEOUT_SECONDS, REDIS_HOSTNAME,
+                    REDIS_PASSWORD, REDIS_PORT, REDIS_SOCKET_TIMEOUT_SECONDS,
                     REDIS_USERNAME)
-
-# redis setup (local)
-redis_client = redis.Redis(
-    host=REDIS_HOSTNAME,  # type: ignore
-    port=REDIS_PORT,  # type: ignore
-    decode_responses=True,
-    username=REDIS_USERNAME,
-    password=REDIS_PASSWORD,
-)
-
-
-# Google Gemini LLM setup
-genai.configure(api_key=GEMINI_API_KEY)  # type: ignore
-
-generation_config = {
-    "temperature": 0.2,
-    "top_p": 0.95,
-    "top_k": 40,
-    "max_output_tokens": 8192,
-    "response_schema": content.Schema(
-        type=content.Type.OBJECT,
-        properties={
-            "is_compatible": content.Schema(type=content.Type.BOOLEAN),
-            "compatibility_warning": content.Schema(type=content.Type.STRING),
-            "Evaluation": content.Schema(
-                type=content.Type.ARRAY,
-                items=content.Schema(
-                    type=content.Type.OBJECT,
-                    properties={
-                        "requirement": content.Schema(type=content.Type.STRING),
-                        "critical": content.Schema(type=content.Type.BOOLEAN),
-                        "score": content.Schema(type=content.Type.INTEGER),
-                    }
+from timing import timed
+
+# The Redis client, the Gemini SDK and the document parsers are heavy to import or build, so
+# they're created on first use rather than when a worker starts. ``helpers.redis_client`` and
+# ``helpers.model`` still work as attributes through the module ``__getattr__`` below.
+_init_lock = threading.Lock()
+_redis_client = None
+_async_redis_client = None
+_genai_configured = False
+_model = None
+
+
+def get_redis():
+    global _redis_client
+    if _redis_client is None:
+        with _init_lock:
+            if _redis_client is None:
+                import redis
+                from redis.backoff import NoBackoff
+                from redis.retry import Retry
+
+                # redis setup (local)
+                _redis_client = redis.Redis(
+                    host=REDIS_HOSTNAME,  # type: ignore
+                    port=REDIS_PORT,  # type: ignore
+                    decode_responses=True,
+                    username=REDIS_USERNAME,
+                    password=REDIS_PASSWORD,
+                    socket_timeout=REDIS_SOCKET_TIMEOUT_SECONDS,
+                    socket_connect_timeout=REDIS_CONNECT_TIMEOUT_SECONDS,
+                    # Callers have fallbacks; retrying with backoff would only prolong the stall
+                    retry=Retry(NoBackoff(), 0),
                 )
-            ),
-            "Missing Skills": content.Schema(
-                type=content.Type.ARRAY,
-                items=content.Schema(type=content.Type.STRING),
-            ),
-            "Profile Summary": content.Schema(type=content.Type.STRING),
-        },
-        required=["is_compatible", "compatibility_warning", "Evaluation", "Missing Skills", "Profile Summary"]
-    ),
-    "response_mime_type": "application/json",
-}
-model = genai.GenerativeModel(  # type: ignore
-    model_name="gemini-flash-lite-latest", generation_config=generation_config)  # type: ignore
+    return _redis_client
+
+
+def get_async_redis():
+    """
+    The asyncio Redis client, for Redis calls made while serving a request. Created on first
+    use, so inside the worker's event loop.
+    """
+    global _async_redis_client
+    if _async_redis_client is None:
+        import redis.asyncio
+        from redis.asyncio.retry import Retry
+        from redis.backoff import NoBackoff
+
+        _async_redis_client = redis.asyncio.Redis(
+            host=REDIS_HOSTNAME,  # type: ignore
+            port=REDIS_PORT,  # type: ignore
+            decode_responses=True,
+            username=REDIS_USERNAME,
+            password=REDIS_PASSWORD,
+            socket_timeout=REDIS_SOCKET_TIMEOUT_SECONDS,
+            socket_connect_timeout=REDIS_CONNECT_TIMEOUT_SECONDS,
+            retry=Retry(NoBackoff(), 0),
+            # Detects dead pub/sub connections, which otherwise sit idle
+            health_check_interval=30,
+        )
+    return _async_redis_client
+
+
+def configure_genai():
+    """Configures the Gemini SDK once per process and returns the module."""
+    global _genai_configured
+    import google.generativeai as genai
+
+    with _init_lock:
+        if not _genai_configured:
+            # Google Gemini LLM setup
+            genai.configure(api_key=GEMINI_API_KEY)  # type: ignore
+            _genai_configured = True
+    return genai
+
+
+def _generation_config() -> dict:
+    from google.ai.generativelanguage_v1beta.types import content
+
+    return {
+        "temperature": 0.2,
+        "top_p": 0.95,
+        "top_k": 40,
+        "max_output_tokens": 8192,
+        "response_schema": content.Schema(
+            type=content.Type.OBJECT,
+            properties={
+                "is_compatible": content.Schema(type=content.Type.BOOLEAN),
+                "compatibility_warning": content.Schema(type=content.Type.STRING),
+                "Evaluation": content.Schema(
+                    type=content.Type.ARRAY,
+                    items=content.Schema(
+                        type=content.Type.OBJECT,
+                        properties={
+                            "requirement": content.Schema(type=content.Type.STRING),
+                            "critical": content.Schema(type=content.Type.BOOLEAN),
+                            "score": content.Schema(type=content.Type.INTEGER),
+                        }
+                    )
+                ),
+                "Missing Skills": content.Schema(
+                    type=content.Type.ARRAY,
+                    items=content.Schema(type=content.Type.STRING),
+                ),
+                "Profile Summary": content.Schema(type=content.Type.STRING),
+            },
+            required=["is_compatible", "compatibility_warning", "Evaluation", "Missing Skills", "Profile Summary"]
+        ),
+        "response_mime_type": "application/json",
+    }
+
+
+def get_model():
+    """The Gemini model used for CV/JD scoring, built on first use."""
+    global _model
+    if _model is None:
+        genai = configure_genai()
+        with _init_lock:
+            if _model is None:
+                _model = genai.GenerativeModel(  # type: ignore
+                    model_name="gemini-flash-lite-latest", generation_config=_generation_config())  # type: ignore
+    return _model
+
+
+def __getattr__(name: str):
+    if name == "redis_client":
+        return get_redis()
+    if name == "model":
+        return get_model()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 MAX_REQUESTS = 1000  # Maximum number of requests allowed
@@ -75,6 +154,8 @@ RATE_LIMIT_WINDOW = 24 * 60 * 60  # 24 hours in seconds
 
 def extract_pdf_text(file: io.BytesIO) -> str:
     """Extracts text from a PDF file object in memory."""
+    import pdfplumber as pdf
+
     text: str = ""
     # removed unnecessary disk I/O
     with pdf.open(file) as pdf_file:
@@ -86,21 +167,24 @@ def extract_pdf_text(file: io.BytesIO) -> str:
 
 def extract_docx_text(file: io.BytesIO) -> str:
     """Extracts text from a DOCX file object in memory."""
+    import docx
+
     doc = docx.Document(file)
     return "\n".join([para.text for para in doc.paragraphs])
 
 
+@timed("llm")
 async def get_llm_response(prompt: str, gen_config=None) -> str:
     """Gets response from LLM asynchronously. If gen_config is provided, it overrides the model's default config."""
     try:
         # Using the asynchronous method
         if gen_config:
-            response = await model.generate_content_async(prompt, generation_config=gen_config)
+            response = await get_model().generate_content_async(prompt, generation_config=gen_config)
         else:
-            response = await model.generate_content_async(prompt)
+            response = await get_model().generate_content_async(prompt)
         return response.text
     except Exception as e:
-        logger.error(f"Error in async LLM call: {e}", exc_info=True)
+        logger.error("Error in async LLM call: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500, detail="Error generating response from LLM")
 
@@ -127,8 +211,8 @@ def parse_llm_response(llm_response):
         else:
             match_percentage = int((total_earned / total_possible) * 100)
             
-        logger.info(f"LLM Response: {llm_response}")
-        logger.info(f"Calculated JD-Match Score: {match_percentage}%")
+        logger.info("LLM response (%d chars)", len(llm_response), extra={"payload": llm_response})
+        logger.info("Calculated JD-Match Score: %s%%", match_percentage)
 
         return {
             "is_compatible": response_json.get("is_compatible", True),
@@ -173,6 +257,7 @@ def _extract_text_from_file_sync(file: UploadFile):
         )
 
 
+@timed("extract")
 async def extract_text_from_file(file: UploadFile) -> str:
     """
     Asynchronously extracts text from a file by running the
@@ -193,6 +278,7 @@ def get_client_identifier(request: Request) -> str:
     return f"{ip}:{user_agent}"
 
 
+@timed("rate_limit")
 def check_rate_limit_demo(request: Request):
     """
     Check if the client has exceeded their rate limit using Redis.
@@ -204,7 +290,7 @@ def check_rate_limit_demo(request: Request):
     key_demo = f"rate_limit:demo:{client_id}"
 
     # Get the list of timestamps for this client
-    timestamps_data = redis_client.get(key_demo)
+    timestamps_data = get_redis().get(key_demo)
     timestamps = json.loads(
         timestamps_data) if timestamps_data else []  # type: ignore
 
@@ -230,12 +316,13 @@ def check_rate_limit_demo(request: Request):
     timestamps.append(current_time)
 
     # Store updated timestamps in Redis with TTL of RATE_LIMIT_WINDOW
-    redis_client.setex(key_demo, RATE_LIMIT_WINDOW, json.dumps(timestamps))
+    get_redis().setex(key_demo, RATE_LIMIT_WINDOW, json.dumps(timestamps))
 
     # Return remaining requests
     return MAX_REQUESTS - len(timestamps)
 
 
+@timed("rate_limit")
 def check_rate_limit_free_users(request: Request):
     """
     Check if the free client has exceeded their rate limit using Redis.
@@ -247,7 +334,7 @@ def check_rate_limit_free_users(request: Request):
     key_free = f"rate_limit:free:{client_id}"
 
     # Get the list of timestamps for this client
-    timestamps_data = redis_client.get(key_free)
+    timestamps_data = get_redis().get(key_free)
     timestamps = json.loads(
         timestamps_data) if timestamps_data else []  # type: ignore
 
@@ -273,7 +360,7 @@ def check_rate_limit_free_users(request: Request):
     timestamps.append(current_time)
 
     # Store updated timestamps in Redis with TTL of RATE_LIMIT_WINDOW
-    redis_client.setex(key_free, RATE_LIMIT_WINDOW, json.dumps(timestamps))
+    get_redis().setex(key_free, RATE_LIMIT_WINDOW, json.dumps(timestamps))
 
     # Return remaining requests
     return MAX_REQUESTS_FREE - len(timestamps)
@@ -0,0 +1,202 @@
+"""
+Declared MongoDB indexes for every collection the app queries.
+
+The registry is applied on startup from the app lifespan. Index creation is idempotent,
+so every worker can run it. It can also be inspected against a live database:
+
+    python indexes.py diff     # show missing, changed and undeclared indexes
+    python indexes.py apply    # create any missing indexes
+    python indexes.py dedupe   # remove duplicate employer analyses, then apply
+"""
+import argparse
+import asyncio
+import logging
+
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+# Options that make two indexes with the same key pattern behave differently.
+_COMPARED_OPTIONS = ("unique", "sparse", "partialFilterExpression", "expireAfterSeconds")
+
+# Text index weight per searchable field, used as the field boosts by services/search_service.py
+SEARCH_FIELDS = {
+    "resumes": {"title": 10, "tags": 5, "skills": 5, "file_name": 2, "resume_text": 1},
+    "applications": {"company": 10, "job_title": 8, "platform": 2, "notes": 1},
+    "job_descriptions": {"title": 10, "skills": 5, "required_skills": 5, "preferred_skills": 3,
+                         "department": 2, "location": 2, "full_description": 1},
+}
+
+
+def _search_index(collection: str) -> IndexModel:
+    """The per-user weighted text index behind /api/search, see services/search_service.py."""
+    fields = SEARCH_FIELDS[collection]
+    return IndexModel([("user_id", ASCENDING), *((field, TEXT) for field in fields)],
+                      name="user_id_text", weights=fields, default_language="english")
+
+
+INDEXES: dict[str, list[IndexModel]] = {
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    ],
+    # List endpoints page through (created_at, _id) newest first, see pagination.py
+    "resumes": [
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+                   name="user_id_created_at_id"),
+        # MinHash LSH band keys for near-duplicate lookups, see services/near_duplicate_service.py
+        IndexModel([("user_id", ASCENDING), ("lsh_bands", ASCENDING)], name="user_id_lsh_bands"),
+        # Skill filters on the resume list (newest first) and skill overlap with a JD, see skills.py
+        IndexModel([("user_id", ASCENDING), ("skills", ASCENDING), ("created_at", DESCENDING),
+                    ("_id", DESCENDING)],
+                   name="user_id_skills_created_at_id"),
+        _search_index("resumes"),
+    ],
+    "applications": [
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+                   name="user_id_created_at_id"),
+        # Recent activity and first application date in services/user_stats_service.py
+        IndexModel([("user_id", ASCENDING), ("application_date", DESCENDING), ("_id", DESCENDING)],
+                   name="user_id_application_date_id"),
+        _search_index("applications"),
+    ],
+    "history": [
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+                   name="user_id_created_at_id"),
+    ],
+    "employer_analyses": [
+        IndexModel([("jd_id", ASCENDING), ("user_id", ASCENDING), ("ats_score", DESCENDING),
+                    ("_id", DESCENDING)],
+                   name="jd_id_user_id_ats_score_id"),
+        # Batch analysis upserts on this key; run `python indexes.py dedupe` once on older databases
+        IndexModel([("jd_id", ASCENDING), ("resume_id", ASCENDING)],
+                   name="jd_id_resume_id_unique", unique=True),
+        # Covers the HR dashboard aggregation, which only reads these fields
+        IndexModel([("user_id", ASCENDING), ("jd_id", ASCENDING), ("status", ASCENDING),
+                    ("ats_score", ASCENDING)],
+                   name="user_id_jd_id_status_ats_score"),
+    ],
+    "job_descriptions": [
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+                   name="user_id_created_at_id"),
+        IndexModel([("user_id", ASCENDING), ("skills", ASCENDING)], name="user_id_skills"),
+        _search_index("job_descriptions"),
+    ],
+}
+
+
+def _describe(spec: dict) -> dict:
+    """Normalises an IndexModel document or index_information() entry for comparison."""
+    key = spec["key"]
+    key = list(key.items()) if hasattr(key, "items") else list(key)
+    key = [(field, int(direction) if isinstance(direction, float) else direction) for field, direction in key]
+    if any(direction == TEXT for _, direction in key):
+        # The server reports text fields as ("_fts", "text"), ("_ftsx", 1) plus their weights,
+        # with unweighted fields at 1
+        text_fields = [field for field, direction in key if direction == TEXT and field != "_fts"]
+        weights = {field: 1 for field in text_fields} | dict(spec.get("weights", {}))
+        key = [item for item in key if item[1] != TEXT and item[0] not in ("_fts", "_ftsx")]
+        return {"key": key + [("_fts", TEXT), ("_ftsx", 1)],
+                "weights": {field: int(weight) for field, weight in sorted(weights.items())}}
+    described = {"key": key}
+    for option in _COMPARED_OPTIONS:
+        if option in spec:
+            described[option] = spec[option]
+    return described
+
+
+async def ensure_indexes(db) -> dict:
+    """Creates every declared index that is missing. Safe to call repeatedly."""
+    summary = {"ensured": 0, "failed": 0}
+    for collection, models in INDEXES.items():
+        for model in models:
+            name = model.document["name"]
+            try:
+                await db[collection].create_indexes([model])
+                summary["ensured"] += 1
+            except OperationFailure as e:
+                # Typically an existing index with the same name but different options,
+                # or duplicate data blocking a unique index. Never fatal for startup.
+                summary["failed"] += 1
+                logger.error("Could not ensure index %s.%s: %s", collection, name, e)
+    logger.info(
+        "Index provisioning finished: %s ensured, %s failed", summary['ensured'], summary['failed'])
+    return summary
+
+
+async def diff_indexes(db) -> dict:
+    """Compares the registry with the live database, per collection."""
+    report = {}
+    for collection, models in INDEXES.items():
+        live = await db[collection].index_information()
+        live.pop("_id_", None)
+        declared = {m.document["name"]: _describe(m.document) for m in models}
+
+        missing, changed = [], []
+        for name, spec in declared.items():
+            if name not in live:
+                missing.append(name)
+            elif _describe(live[name]) != spec:
+                changed.append(name)
+        extra = [name for name in live if name not in declared]
+
+        report[collection] = {"missing": missing, "changed": changed, "extra": extra}
+    return report
+
+
+async def dedupe_employer_analyses(db) -> int:
+    """
+    Removes duplicate (jd_id, resume_id) employer analyses left by the old check-then-insert
+    path, keeping the most recently updated one, and drops the superseded non-unique index
+    so the unique one can be built. Returns the number of documents removed.
+    """
+    pipeline = [
+        {"$sort": {"updated_at": -1, "_id": -1}},
+        {"$group": {"_id": {"jd_id": "$jd_id", "resume_id": "$resume_id"},
+                    "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+    ]
+    removed, affected_jds = 0, set()
+    async for group in db.employer_analyses.aggregate(pipeline, allowDiskUse=True):
+        result = await db.employer_analyses.delete_many({"_id": {"$in": group["ids"][1:]}})
+        removed += result.deleted_count
+        affected_jds.add(group["_id"]["jd_id"])
+    logger.info("Removed %s duplicate employer analyses", removed)
+
+    from services.leaderboard_service import leaderboard
+    await leaderboard.drop(*affected_jds)
+
+    if "jd_id_resume_id" in await db.employer_analyses.index_information():
+        await db.employer_analyses.drop_index("jd_id_resume_id")
+        logger.info("Dropped index employer_analyses.jd_id_resume_id")
+    return removed
+
+
+async def _main():
+    parser = argparse.ArgumentParser(description="Manage declared MongoDB indexes.")
+    parser.add_argument("command", choices=["diff", "apply", "dedupe"])
+    args = parser.parse_args()
+
+    from db import get_db
+    db = get_db()
+
+    if args.command == "dedupe":
+        await dedupe_employer_analyses(db)
+    if args.command in ("apply", "dedupe"):
+        await ensure_indexes(db)
+
+    report = await diff_indexes(db)
+    in_sync = True
+    for collection, result in report.items():
+        for status in ("missing", "changed", "extra"):
+            for name in result[status]:
+                in_sync = in_sync and status == "extra"
+                print(f"{status:<8} {collection}.{name}")
+    if in_sync:
+        print("All declared indexes are present.")
+    raise SystemExit(0 if in_sync else 1)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    asyncio.run(_main())
@@ -0,0 +1,150 @@
+"""
+In-process inverted index with BM25 ranking and per-field boosts.
+
+Each document is a dict of text fields. A term's frequency in a document is the sum over
+fields of ``boost * count``, so a match in a boosted field (a title, say) weighs like several
+matches in the body. Document length is the unboosted token count. Scores are BM25 with the
+usual ``k1`` and ``b``.
+
+Postings are append-only ``array`` buffers (doc number, boosted tf), read as NumPy views at
+query time, so scoring a term is a couple of vectorized operations over its postings rather
+than a Python loop. Removal tombstones the document; ``compact`` rebuilds without them.
+"""
+import math
+from array import array
+from collections import Counter
+from typing import Optional
+
+import numpy as np
+
+from text_features import tokens
+
+
+def stem(term: str) -> str:
+    """Light English plural stripping, applied to both documents and queries."""
+    if len(term) > 4 and term.endswith("ies"):
+        return term[:-3] + "y"
+    if len(term) > 4 and term.endswith("es") and term[-3] in "sxz":
+        return term[:-2]
+    if len(term) > 3 and term.endswith("s") and not term.endswith(("ss", "us", "is")):
+        return term[:-1]
+    return term
+
+
+def terms(text: str) -> list[str]:
+    return [stem(t) for t in tokens(text)]
+
+
+class InvertedIndex:
+    def __init__(self, boosts: dict[str, float], k1: float = 1.2, b: float = 0.75):
+        self.boosts = boosts
+        self.k1 = k1
+        self.b = b
+        self._postings: dict[str, tuple[array, array]] = {}
+        self._ids: list[str] = []
+        self._numbers: dict[str, int] = {}
+        self._lengths = array("f")
+        self._live = array("b")
+        self._live_count = 0
+        self._total_length = 0.0
+
+    def __len__(self) -> int:
+        return self._live_count
+
+    @property
+    def tombstones(self) -> int:
+        return len(self._ids) - self._live_count
+
+    def __contains__(self, doc_id: str) -> bool:
+        number = self._numbers.get(doc_id)
+        return number is not None and bool(self._live[number])
+
+    def ids(self) -> set[str]:
+        return {doc_id for doc_id, number in self._numbers.items() if self._live[number]}
+
+    def add(self, doc_id: str, fields: dict[str, Optional[str]]):
+        if doc_id in self:
+            self.remove(doc_id)
+        weighted: Counter = Counter()
+        length = 0
+        for field, text in fields.items():
+            field_terms = terms(text or "")
+            length += len(field_terms)
+            boost = self.boosts.get(field, 1.0)
+            for term in field_terms:
+                weighted[term] += boost
+
+        number = len(self._ids)
+        self._ids.append(doc_id)
+        self._numbers[doc_id] = number
+        self._lengths.append(length)
+        self._live.append(1)
+        self._live_count += 1
+        self._total_length += length
+        for term, tf in weighted.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = (array("i"), array("f"))
+            postings[0].append(number)
+            postings[1].append(tf)
+
+    def remove(self, doc_id: str):
+        number = self._numbers.get(doc_id)
+        if number is None or not self._live[number]:
+            return
+        self._live[number] = 0
+        self._live_count -= 1
+        self._total_length -= self._lengths[number]
+
+    def compact(self):
+        """Drops tombstoned documents from the postings once many have accumulated."""
+        live = np.frombuffer(self._live, dtype=np.int8).astype(bool)
+        renumber = np.cumsum(live) - 1
+        for term, (numbers, tfs) in list(self._postings.items()):
+            docs = np.frombuffer(numbers, dtype=np.int32)
+            keep = live[docs]
+            if not keep.any():
+                del self._postings[term]
+                continue
+            self._postings[term] = (array("i", renumber[docs[keep]].astype(np.int32).tobytes()),
+                                    array("f", np.frombuffer(tfs, dtype=np.float32)[keep].tobytes()))
+        self._ids = [doc_id for doc_id, alive in zip(self._ids, live) if alive]
+        self._numbers = {doc_id: number for number, doc_id in enumerate(self._ids)}
+        self._lengths = array("f", np.frombuffer(self._lengths, dtype=np.float32)[live].tobytes())
+        self._live = array("b", [1]) * len(self._ids)
+
+    def search(self, query: str, limit: int, offset: int = 0) -> tuple[list[tuple[str, float]], int]:
+        """One page of ``(doc_id, score)``, best first, and the total number of matches."""
+        query_terms = set(terms(query))
+        if not query_terms or not self._live_count:
+            return [], 0
+        doc_count = len(self._ids)
+        lengths = np.frombuffer(self._lengths, dtype=np.float32)
+        live = np.frombuffer(self._live, dtype=np.int8)
+        norms = self.k1 * (1 - self.b + self.b * lengths / max(self._total_length / self._live_count, 1.0))
+
+        scores = np.zeros(doc_count, dtype=np.float32)
+        for term in query_terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            docs = np.frombuffer(postings[0], dtype=np.int32)
+            tfs = np.frombuffer(postings[1], dtype=np.float32)
+            matches = int(live[docs].sum())
+            if not matches:
+                continue
+            idf = math.log(1 + (self._live_count - matches + 0.5) / (matches + 0.5))
+            scores[docs] += idf * tfs * (self.k1 + 1) / (tfs + norms[docs])
+
+        scores[live == 0] = 0
+        matched = np.flatnonzero(scores)
+        total = len(matched)
+        end = min(offset + limit, total)
+        if offset >= end:
+            return [], total
+        if end < total:
+            top = matched[np.argpartition(-scores[matched], end - 1)[:end]]
+        else:
+            top = matched
+        top = top[np.lexsort((top, -scores[top]))][offset:end]
+        return [(self._ids[i], float(scores[i])) for i in top], total
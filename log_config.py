@@ -0,0 +1,183 @@
+"""
+Non-blocking, structured logging for the API process.
+
+``configure_logging()`` replaces the root handlers with a ``QueueHandler``: request code only
+filters a record and puts it on an in-memory queue, and a ``QueueListener`` thread does the
+JSON formatting and the stdout write. The queue holds ``LOG_QUEUE_SIZE`` records; when the
+writer falls behind (a blocked stdout), further records are dropped rather than buffered,
+and the next record queued reports how many were lost. Two filters run before a record is
+queued:
+
+- ``PayloadSampler``: records logged with ``extra={"payload": ...}`` (raw LLM responses and
+  the like) carry the payload only for a sampled fraction of calls, truncated.
+- ``RateLimitFilter``: a per-logger token bucket for INFO and below. Warnings and errors
+  always pass. The next record that passes reports how many were suppressed.
+
+Use %-style arguments rather than f-strings on hot paths, so suppressed records are never
+formatted.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from config import (LOG_FORMAT, LOG_LEVEL, LOG_PAYLOAD_MAX_CHARS, LOG_PAYLOAD_SAMPLE_RATE,
+                    LOG_QUEUE_SIZE, LOG_RATE_LIMIT_PER_SECOND)
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# LogRecord attributes that aren't user-supplied ``extra`` fields
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class PayloadSampler(logging.Filter):
+    def __init__(self, rate: float, max_chars: int):
+        super().__init__()
+        self.rate = rate
+        self.max_chars = max_chars
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        payload = getattr(record, "payload", None)
+        if payload is None:
+            return True
+        if random.random() >= self.rate:
+            del record.payload
+            return True
+        payload = str(payload)
+        if len(payload) > self.max_chars:
+            payload = payload[:self.max_chars] + f"... [{len(payload) - self.max_chars} more chars]"
+        record.payload = payload
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    def __init__(self, per_second: float):
+        super().__init__()
+        self.per_second = per_second
+        self._buckets: dict[str, list] = {}  # logger name -> [tokens, last refill, suppressed]
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.per_second <= 0 or record.levelno > logging.INFO:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(record.name)
+            if bucket is None:
+                bucket = self._buckets[record.name] = [self.per_second, now, 0]
+            bucket[0] = min(self.per_second, bucket[0] + (now - bucket[1]) * self.per_second)
+            bucket[1] = now
+            if bucket[0] < 1:
+                bucket[2] += 1
+                return False
+            bucket[0] -= 1
+            suppressed, bucket[2] = bucket[2], 0
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def __init__(self, records: queue.Queue):
+        super().__init__(records)
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def enqueue(self, record: logging.LogRecord):
+        with self._lock:
+            dropped, self.dropped = self.dropped, 0
+        if dropped:
+            record.dropped = dropped
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += dropped + 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The queue never leaves the process, so skip the stdlib's eager formatting and
+        # exception rendering. Only the message is merged, so later mutation of the
+        # arguments can't change what gets logged.
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class _QueueListener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self):
+        # The queue may be full at shutdown; wait for room rather than fail to stop
+        self.queue.put(self._sentinel)
+
+
+def configure_logging(stream=None):
+    """Idempotently routes the root logger through the queue, writing to ``stream`` (stdout)."""
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(stream or sys.stdout)
+    stream_handler.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT))
+
+    queue_handler = _QueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+    queue_handler.addFilter(RateLimitFilter(LOG_RATE_LIMIT_PER_SECOND))
+    queue_handler.addFilter(PayloadSampler(LOG_PAYLOAD_SAMPLE_RATE, LOG_PAYLOAD_MAX_CHARS))
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(LOG_LEVEL)
+    _queue_handler = queue_handler
+
+    _listener = _QueueListener(queue_handler.queue, stream_handler)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def _restart_in_child():
+    """The listener thread doesn't survive fork(), so a forked worker gets its own."""
+    global _listener
+    if _listener is None:
+        return
+    _queue_handler.queue = queue.Queue(LOG_QUEUE_SIZE)
+    _queue_handler.dropped = 0
+    _listener = _QueueListener(_queue_handler.queue, *_listener.handlers)
+    _listener.start()
+
+
+os.register_at_fork(after_in_child=_restart_in_child)
+
+
+def stop_logging():
+    """Flushes queued records; called at exit."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
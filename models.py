@@ -1,8 +1,11 @@
+import functools
 from datetime import datetime
-from typing import List, Optional, Any
-from pydantic import BaseModel, Field, ConfigDict
+from typing import Iterable, List, Optional, Any, TypeVar
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter
 from bson import ObjectId
 
+from config import STRICT_MODEL_VALIDATION
+
 class PyObjectId(str):
     @classmethod
     def __get_pydantic_core_schema__(cls, _source_type: Any, _handler: Any) -> Any:
@@ -18,15 +21,20 @@ class PyObjectId(str):
             raise ValueError("Invalid ObjectId")
         return str(v)
 
-class ResumeModel(BaseModel):
+class ResumeSummaryModel(BaseModel):
+    """Resume fields shown in listings; everything except the extracted text."""
     id: Optional[PyObjectId] = Field(alias="_id", default=None)
     user_id: PyObjectId
     title: str
     file_name: str
     file_path: str
     mime_type: str
-    resume_text: str
     tags: List[str] = Field(default_factory=list)
+    # Canonical skill names found in the resume text (see skills.py)
+    skills: List[str] = Field(default_factory=list)
+    # Set when this upload is a near-copy of an earlier resume (see near_duplicate_service.py)
+    duplicate_of: Optional[PyObjectId] = None
+    duplicate_similarity: Optional[float] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     
@@ -36,6 +44,9 @@ class ResumeModel(BaseModel):
         json_encoders={ObjectId: str}
     )
 
+class ResumeModel(ResumeSummaryModel):
+    resume_text: str
+
 class EmployeeProfileUpdateModel(BaseModel):
     full_name: Optional[str] = None
     skills: Optional[str] = None
@@ -69,6 +80,23 @@ class ApplicationModel(BaseModel):
         json_encoders={ObjectId: str}
     )
 
+class ApplicationUpdateModel(BaseModel):
+    """Fields a user may change on an application. Only the fields sent are updated."""
+    company: Optional[str] = None
+    job_title: Optional[str] = None
+    job_link: Optional[str] = None
+    platform: Optional[str] = None
+    resume_used: Optional[PyObjectId] = None
+    ats_score: Optional[int] = None
+    status: Optional[str] = None
+    notes: Optional[str] = None
+    interview_date: Optional[datetime] = None
+
+    def changes(self) -> dict:
+        # null clears an optional field but can't blank out one every application has
+        return {k: v for k, v in self.model_dump(exclude_unset=True).items()
+                if v is not None or not ApplicationModel.model_fields[k].is_required()}
+
 class TailorResumeRequest(BaseModel):
     resume_id: str
     job_description: str
@@ -98,7 +126,8 @@ class InterviewPrepRequest(BaseModel):
 class InterviewPrepResponse(BaseModel):
     questions: List[InterviewQuestion]
 
-class JobDescriptionModel(BaseModel):
+class JobDescriptionSummaryModel(BaseModel):
+    """Job description fields shown in listings; everything except the full text."""
     id: Optional[PyObjectId] = Field(alias="_id", default=None)
     user_id: PyObjectId
     title: str
@@ -109,7 +138,8 @@ class JobDescriptionModel(BaseModel):
     salary_range: Optional[str] = None
     required_skills: List[str] = Field(default_factory=list)
     preferred_skills: List[str] = Field(default_factory=list)
-    full_description: str
+    # Canonical skill names tagged from the fields above and the description (see skills.py)
+    skills: List[str] = Field(default_factory=list)
     status: str = "Open" # Draft, Open, Closed
     file_path: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -121,6 +151,9 @@ class JobDescriptionModel(BaseModel):
         json_encoders={ObjectId: str}
     )
 
+class JobDescriptionModel(JobDescriptionSummaryModel):
+    full_description: str
+
 class EmployerAnalysisModel(BaseModel):
     id: Optional[PyObjectId] = Field(alias="_id", default=None)
     user_id: PyObjectId
@@ -131,6 +164,8 @@ class EmployerAnalysisModel(BaseModel):
     ats_score: int
     analysis_result: dict
     status: str = "Analyzed" # Analyzed, Shortlisted, Interviewing, Offered, Rejected
+    # Resume whose analysis was reused because this resume is a near-copy of it
+    duplicate_of: Optional[PyObjectId] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -139,3 +174,33 @@ class EmployerAnalysisModel(BaseModel):
         arbitrary_types_allowed=True,
         json_encoders={ObjectId: str}
     )
+
+
+M = TypeVar("M", bound=BaseModel)
+
+
+@functools.cache
+def _adapter(model: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+@functools.cache
+def _list_adapter(model: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[model])
+
+
+def from_mongo(model: type[M], doc: dict) -> M:
+    """
+    Hydrates a document read from Mongo through a cached, compiled ``TypeAdapter``, which is
+    cheaper than ``Model(**doc)``. Values are coerced as usual, so documents stored by older
+    releases with loosely typed fields (a date as a string, say) still load.
+
+    Set STRICT_MODEL_VALIDATION to validate in strict mode instead, which rejects such
+    documents rather than coercing them, e.g. to find records that no longer match the models.
+    """
+    return _adapter(model).validate_python(doc, strict=STRICT_MODEL_VALIDATION or None)
+
+
+def from_mongo_many(model: type[M], docs: Iterable[dict]) -> list[M]:
+    """Hydrates a page of documents in one ``TypeAdapter`` call, see ``from_mongo``."""
+    return _list_adapter(model).validate_python(list(docs), strict=STRICT_MODEL_VALIDATION or None)
@@ -0,0 +1,76 @@
+"""
+Keyset (cursor) pagination over MongoDB collections.
+
+Pages are ordered by a compound sort key that ends in ``_id``, so the ordering is total and
+the next page starts strictly after the last document returned. The cursor handed to clients
+is an opaque, URL-safe encoding of that last document's sort values.
+"""
+import base64
+from typing import Optional
+
+from bson import json_util
+from fastapi import HTTPException
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Sort orders used by the list endpoints. Both are backed by indexes in indexes.py.
+NEWEST_FIRST = [("created_at", -1), ("_id", -1)]
+HIGHEST_SCORE_FIRST = [("ats_score", -1), ("_id", -1)]
+
+
+def encode_cursor(values: list) -> str:
+    return base64.urlsafe_b64encode(json_util.dumps(values).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, expected_length: int) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json_util.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    if not isinstance(values, list) or len(values) != expected_length:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    return values
+
+
+def clamp_limit(limit: Optional[int]) -> int:
+    if not limit or limit < 1:
+        return DEFAULT_PAGE_SIZE
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def keyset_filter(sort: list[tuple[str, int]], values: list) -> dict:
+    """
+    Builds the filter selecting documents that sort strictly after ``values``.
+
+    For a sort of (a desc, b desc) this is: a < va OR (a == va AND b < vb).
+    """
+    clauses = []
+    for i, (field, direction) in enumerate(sort):
+        clause = {prev_field: values[j] for j, (prev_field, _) in enumerate(sort[:i])}
+        clause[field] = {"$lt" if direction < 0 else "$gt": values[i]}
+        clauses.append(clause)
+    return {"$or": clauses}
+
+
+async def paginate(collection, query: dict, sort: list[tuple[str, int]],
+                   cursor: Optional[str] = None, limit: Optional[int] = None,
+                   projection: Optional[dict] = None) -> tuple[list[dict], Optional[str]]:
+    """
+    Fetches one page of ``collection`` and returns ``(documents, next_cursor)``.
+
+    ``next_cursor`` is None on the last page. At most ``limit + 1`` documents are read.
+    """
+    limit = clamp_limit(limit)
+    if cursor:
+        query = {"$and": [query, keyset_filter(sort, decode_cursor(cursor, len(sort)))]}
+
+    docs = await collection.find(query, projection).sort(sort).limit(limit + 1).to_list(length=limit + 1)
+
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        last = docs[-1]
+        next_cursor = encode_cursor([last.get(field) for field, _ in sort])
+    return docs, next_cursor
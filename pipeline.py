@@ -0,0 +1,100 @@
+"""
+Bounded, staged async pipelines.
+
+Items flow through a chain of stages, each with its own worker count, connected by bounded
+queues. The input iterable is consumed lazily, only as fast as the first stage drains its
+queue, so at most ``queue_size + concurrency`` items are held per stage regardless of how
+many items there are in total.
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Iterable
+
+
+@dataclass
+class Stage:
+    name: str
+    func: Callable[[Any], Awaitable[Any]]
+    concurrency: int
+
+
+@dataclass
+class StageMetrics:
+    name: str
+    concurrency: int
+    processed: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+    queue_wait_seconds: float = 0.0
+    durations: list[float] = field(default_factory=list, repr=False)
+
+    def as_dict(self) -> dict:
+        durations = sorted(self.durations)
+        return {
+            "stage": self.name,
+            "concurrency": self.concurrency,
+            "processed": self.processed,
+            "failed": self.failed,
+            "busy_ms": round(self.busy_seconds * 1000, 1),
+            "queue_wait_ms": round(self.queue_wait_seconds * 1000, 1),
+            "p50_ms": round(durations[len(durations) // 2] * 1000, 1) if durations else 0.0,
+            "max_ms": round(durations[-1] * 1000, 1) if durations else 0.0,
+        }
+
+
+async def run_pipeline(items: Iterable, stages: list[Stage],
+                       on_error: Callable[[int, str, Exception], Any],
+                       queue_size: int = 8) -> tuple[list, list[StageMetrics]]:
+    """
+    Runs every item through ``stages`` in order and returns ``(results, metrics)``, with
+    results in input order.
+
+    If a stage raises for an item, the item leaves the pipeline and its result is
+    ``on_error(index, stage_name, exception)``.
+    """
+    queues = [asyncio.Queue(maxsize=queue_size) for _ in stages]
+    metrics = [StageMetrics(stage.name, stage.concurrency) for stage in stages]
+    results: dict[int, Any] = {}
+
+    async def produce():
+        for index, item in enumerate(items):
+            await queues[0].put((index, item, time.perf_counter()))
+        for _ in range(stages[0].concurrency):
+            await queues[0].put(None)
+
+    async def work(position: int):
+        stage, stage_metrics = stages[position], metrics[position]
+        inbox = queues[position]
+        outbox = queues[position + 1] if position + 1 < len(stages) else None
+        while True:
+            entry = await inbox.get()
+            if entry is None:
+                return
+            index, value, enqueued_at = entry
+            started = time.perf_counter()
+            stage_metrics.queue_wait_seconds += started - enqueued_at
+            try:
+                value = await stage.func(value)
+                stage_metrics.processed += 1
+            except Exception as e:
+                stage_metrics.failed += 1
+                results[index] = on_error(index, stage.name, e)
+                continue
+            finally:
+                elapsed = time.perf_counter() - started
+                stage_metrics.busy_seconds += elapsed
+                stage_metrics.durations.append(elapsed)
+            if outbox is None:
+                results[index] = value
+            else:
+                await outbox.put((index, value, time.perf_counter()))
+
+    async def run_stage(position: int):
+        await asyncio.gather(*(work(position) for _ in range(stages[position].concurrency)))
+        if position + 1 < len(stages):
+            for _ in range(stages[position + 1].concurrency):
+                await queues[position + 1].put(None)
+
+    await asyncio.gather(produce(), *(run_stage(i) for i in range(len(stages))))
+    return [results[i] for i in sorted(results)], metrics
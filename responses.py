@@ -0,0 +1,39 @@
+"""
+orjson-backed JSON responses.
+
+``FastJSONResponse`` is the app's default response class. Returning one directly from an
+endpoint also skips FastAPI's ``jsonable_encoder`` pass, which matters for the large
+dashboard, ranking and history payloads:
+
+- Pydantic models are embedded as the JSON pydantic-core produces for them
+  (``model_dump_json(by_alias=True)``, the same output ``jsonable_encoder`` gave), without
+  building an intermediate dict.
+- ObjectIds become strings, and datetimes use the same ISO 8601 form as ``isoformat()``.
+"""
+from typing import Any
+
+import orjson
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(obj: Any):
+    if isinstance(obj, BaseModel):
+        return orjson.Fragment(obj.model_dump_json(by_alias=True))
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,120 @@
+"""
+Production launcher: gunicorn managing uvicorn workers.
+
+    python -m server
+
+- One worker per CPU available to the container (cgroup quota, then CPU affinity), capped at
+  ``WEB_MAX_WORKERS``, unless ``WEB_WORKERS`` is set.
+- Workers run on uvloop and httptools.
+- The app and its heavy, read-only dependencies are imported once in the master and shared
+  copy-on-write by every worker. Connections (Mongo, Redis, Gemini) are still created lazily
+  in each worker, after the fork.
+- Workers are recycled after ``WEB_MAX_REQUESTS`` requests (plus jitter), which caps memory
+  creep from pdfplumber and xhtml2pdf.
+- On SIGTERM a worker stops accepting connections and lets in-flight requests finish.
+  Batch analyses run inside the request. The lifespan then waits up to
+  ``SHUTDOWN_DRAIN_SECONDS`` for background tasks, all within ``WEB_GRACEFUL_TIMEOUT``.
+"""
+import os
+import tempfile
+
+from config import (SHUTDOWN_DRAIN_SECONDS, WEB_GRACEFUL_TIMEOUT, WEB_HOST,
+                    WEB_KEEPALIVE, WEB_MAX_REQUESTS, WEB_MAX_REQUESTS_JITTER,
+                    WEB_MAX_WORKERS, WEB_PORT, WEB_WORKERS)
+
+# Read-only modules worth sharing between workers. Importing them has no side effects.
+PRELOAD_MODULES = (
+    "google.generativeai",
+    "pdfplumber",
+    "docx",
+    "htmldocx",
+    "xhtml2pdf.pisa",
+)
+
+
+def available_cpus() -> int:
+    """CPUs this process may actually use, respecting a cgroup v2 CPU quota."""
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            return max(1, int(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def worker_count() -> int:
+    if WEB_WORKERS > 0:
+        return WEB_WORKERS
+    return max(1, min(available_cpus(), WEB_MAX_WORKERS))
+
+
+def preload():
+    """Imports the app and shared read-only state in the master, before forking."""
+    import importlib
+
+    for module in PRELOAD_MODULES:
+        importlib.import_module(module)
+
+    from helpers import _generation_config
+    from services.tailoring_service import tailoring_generation_config
+    _generation_config()
+    tailoring_generation_config()
+
+    from app import app
+    return app
+
+
+def main():
+    from gunicorn.app.base import BaseApplication
+    from uvicorn_worker import UvicornWorker
+
+    workers = worker_count()
+    if workers > 1 and "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        # Must be set before prometheus_client is imported, so /metrics aggregates all workers
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="ats-metrics-")
+
+    class Worker(UvicornWorker):
+        CONFIG_KWARGS = {
+            "loop": "uvloop",
+            "http": "httptools",
+            # Leave the rest of the graceful timeout to the lifespan's background drain
+            "timeout_graceful_shutdown": max(1, WEB_GRACEFUL_TIMEOUT - SHUTDOWN_DRAIN_SECONDS),
+        }
+
+    def child_exit(server, worker):
+        if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+            from prometheus_client import multiprocess
+            multiprocess.mark_process_dead(worker.pid)
+
+    class Server(BaseApplication):
+        def load_config(self):
+            options = {
+                "bind": f"{WEB_HOST}:{WEB_PORT}",
+                "workers": workers,
+                "worker_class": Worker,
+                "preload_app": True,
+                "max_requests": WEB_MAX_REQUESTS,
+                "max_requests_jitter": WEB_MAX_REQUESTS_JITTER,
+                "graceful_timeout": WEB_GRACEFUL_TIMEOUT,
+                # Batch analyses can hold a request for minutes; the worker heartbeat is
+                # independent of request duration, so this only catches hung workers
+                "timeout": WEB_GRACEFUL_TIMEOUT,
+                "keepalive": WEB_KEEPALIVE,
+                "child_exit": child_exit,
+            }
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return preload()
+
+    Server().run()
+
+
+if __name__ == "__main__":
+    main()
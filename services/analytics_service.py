@@ -1,21 +1,79 @@
-import statistics
+import heapq
 from datetime import datetime, timedelta
 from collections import Counter, defaultdict
 from typing import List, Dict, Any
+
+import numpy as np
+
 from models import ApplicationModel, ResumeModel
 
+RECENT_ACTIVITY_SIZE = 10
+# Upper bounds of the ATS distribution bins; anything >= 90 falls in the last one
+SCORE_BIN_LABELS = ["0-60", "60-70", "70-80", "80-90", "90-100"]
+SCORE_BIN_EDGES = np.array([60, 70, 80, 90])
+
+
+def _score_statistics(ats_scores: list) -> Dict[str, Any]:
+    """
+    Highest, lowest, mean, median and bin counts of the ATS scores.
+
+    Integer scores (the normal case) are handled with NumPy. Anything else falls back to the
+    builtins so mixed int/float input keeps the exact values and types it always returned.
+    """
+    if not ats_scores:
+        return {"highest": 0, "lowest": 0, "avg": 0, "median": 0, "bins": [0] * len(SCORE_BIN_LABELS)}
+
+    scores = np.asarray(ats_scores)
+    n = len(ats_scores)
+    if scores.dtype.kind not in "iu":
+        ordered = sorted(ats_scores)
+        middle = n // 2
+        bins = [0] * len(SCORE_BIN_LABELS)
+        for score in ats_scores:
+            bins[next((i for i, edge in enumerate(SCORE_BIN_EDGES) if score < edge), len(SCORE_BIN_EDGES))] += 1
+        return {
+            "highest": ordered[-1],
+            "lowest": ordered[0],
+            "avg": sum(ats_scores) / n,
+            "median": ordered[middle] if n % 2 else (ordered[middle - 1] + ordered[middle]) / 2,
+            "bins": bins,
+        }
+
+    middle = n // 2
+    if n % 2:
+        median = scores[np.argpartition(scores, middle)[middle]].item()
+    else:
+        lower, upper = np.partition(scores, [middle - 1, middle])[middle - 1:middle + 1].tolist()
+        median = (lower + upper) / 2
+    bins = np.bincount(np.searchsorted(SCORE_BIN_EDGES, scores, side="right"),
+                       minlength=len(SCORE_BIN_LABELS))
+    return {
+        "highest": scores.max().item(),
+        "lowest": scores.min().item(),
+        "avg": int(scores.sum()) / n,
+        "median": median,
+        "bins": bins.tolist(),
+    }
+
+
 class AnalyticsService:
     @staticmethod
     def calculate_dashboard_stats(applications: List[ApplicationModel], resumes: List[ResumeModel], history: List[Dict] = None) -> Dict[str, Any]:
         now = datetime.utcnow()
         if history is None:
             history = []
-        
+        week_ago = now - timedelta(days=7)
+        today = now.date()
+
         # Summary metrics
         total_apps = len(applications)
         total_resumes = len(resumes)
-        
-        # Filters
+
+        # First match wins, like a linear scan over the resume list
+        resume_titles = {}
+        for r in resumes:
+            resume_titles.setdefault(str(r.id), r.title)
+
         history_scores = []
         for h in history:
             result = h.get("analysis_result", {})
@@ -25,43 +83,94 @@ class AnalyticsService:
                     "date": h.get("created_at", now),
                     "resume_id": h.get("resume_id")
                 })
-                
-        ats_scores = [app.ats_score for app in applications if app.ats_score is not None] + [h["score"] for h in history_scores]
-        offers = [app for app in applications if app.status.lower() == 'offered']
-        rejections = [app for app in applications if app.status.lower() == 'rejected']
-        interviews = [app for app in applications if app.status.lower() == 'interview scheduled']
-        wishlists = [app for app in applications if app.status.lower() == 'wishlist']
-        
-        avg_ats = sum(ats_scores) / len(ats_scores) if ats_scores else 0
-        success_rate = (len(offers) / total_apps * 100) if total_apps > 0 else 0
-        
+
+        # Single pass over the applications
+        ats_scores = []
+        status_counts = Counter()
+        month_counts = Counter()
+        platform_counts = Counter()
+        resume_counts = Counter()
+        company_counts = Counter()
+        resume_performance = defaultdict(list)
+        combined_ats_events = []
+        upcoming_interviews = []
+        recent = []
+        apps_this_month = apps_this_week = apps_today = 0
+        first_app_date = None
+
+        for index, app in enumerate(applications):
+            app_date = app.application_date
+            status_counts[app.status] += 1
+            company_counts[app.company] += 1
+            month_counts[(app_date.year, app_date.month)] += 1
+
+            if app_date.year == now.year and app_date.month == now.month:
+                apps_this_month += 1
+            if app_date >= week_ago:
+                apps_this_week += 1
+            if app_date.date() == today:
+                apps_today += 1
+            if first_app_date is None or app_date < first_app_date:
+                first_app_date = app_date
+
+            if app.platform:
+                platform_counts[app.platform] += 1
+            if app.resume_used:
+                resume_counts[str(app.resume_used)] += 1
+            if app.ats_score is not None:
+                ats_scores.append(app.ats_score)
+            if app.ats_score:
+                if app.resume_used:
+                    resume_performance[str(app.resume_used)].append(app.ats_score)
+                combined_ats_events.append((app_date, app.ats_score, app.company))
+            if app.interview_date and app.interview_date > now:
+                upcoming_interviews.append({
+                    "company": app.company,
+                    "job_title": app.job_title,
+                    "date": app.interview_date.isoformat(),
+                    "resume_used": resume_titles.get(str(app.resume_used), "N/A")
+                })
+
+            # Keep the newest applications; ties go to the later one, as with a stable sort
+            entry = (app_date, index, app)
+            if len(recent) < RECENT_ACTIVITY_SIZE:
+                heapq.heappush(recent, entry)
+            elif entry > recent[0]:
+                heapq.heapreplace(recent, entry)
+
+        for h in history_scores:
+            ats_scores.append(h["score"])
+            if h.get("resume_id"):
+                resume_performance[str(h["resume_id"])].append(h["score"])
+            combined_ats_events.append((h["date"], h["score"], "Analysis Report"))
+
+        lowered = Counter()
+        for status, count in status_counts.items():
+            lowered[status.lower()] += count
+
+        score_stats = _score_statistics(ats_scores)
+        avg_ats = score_stats["avg"]
+        success_rate = (lowered["offered"] / total_apps * 100) if total_apps > 0 else 0
+
         summary = {
             "applications": total_apps,
             "resumes": total_resumes,
             "average_ats": int(avg_ats),
-            "offers": len(offers),
-            "wishlist": len(wishlists),
-            "rejections": len(rejections),
-            "interviews": len(interviews),
+            "offers": lowered["offered"],
+            "wishlist": lowered["wishlist"],
+            "rejections": lowered["rejected"],
+            "interviews": lowered["interview scheduled"],
             "success_rate": round(success_rate, 1)
         }
-        
+
         # Application Stats
-        apps_this_month = len([app for app in applications if app.application_date.year == now.year and app.application_date.month == now.month])
-        apps_this_week = len([app for app in applications if app.application_date >= now - timedelta(days=7)])
-        apps_today = len([app for app in applications if app.application_date.date() == now.date()])
-        
-        platforms = [app.platform for app in applications if app.platform]
-        most_used_platform = Counter(platforms).most_common(1)[0][0] if platforms else "N/A"
-        
-        resume_counts = Counter([str(app.resume_used) for app in applications if app.resume_used])
+        most_used_platform = platform_counts.most_common(1)[0][0] if platform_counts else "N/A"
         most_used_resume_id = resume_counts.most_common(1)[0][0] if resume_counts else None
-        most_used_resume_name = next((r.title for r in resumes if str(r.id) == most_used_resume_id), "N/A") if most_used_resume_id else "N/A"
-        
-        first_app_date = min([app.application_date for app in applications]) if applications else now
-        weeks_active = max((now - first_app_date).days / 7, 1)
+        most_used_resume_name = resume_titles.get(most_used_resume_id, "N/A") if most_used_resume_id else "N/A"
+
+        weeks_active = max((now - (first_app_date or now)).days / 7, 1)
         avg_apps_per_week = round(total_apps / weeks_active, 1)
-        
+
         application_statistics = {
             "apps_this_month": apps_this_month,
             "apps_this_week": apps_this_week,
@@ -70,92 +179,54 @@ class AnalyticsService:
             "most_used_resume": most_used_resume_name,
             "most_used_platform": most_used_platform
         }
-        
+
         # Resume Stats
-        resume_performance = defaultdict(list)
-        for app in applications:
-            if app.resume_used and app.ats_score:
-                resume_performance[str(app.resume_used)].append(app.ats_score)
-                
-        for h in history_scores:
-            if h.get("resume_id"):
-                resume_performance[str(h["resume_id"])].append(h["score"])
-                
         highest_scoring_resume = "N/A"
         max_avg_score = 0
+        resume_averages = {}
         for res_id, scores in resume_performance.items():
             avg_score = sum(scores) / len(scores)
+            resume_averages[res_id] = avg_score
             if avg_score > max_avg_score:
                 max_avg_score = avg_score
-                highest_scoring_resume = next((r.title for r in resumes if str(r.id) == res_id), "Unknown")
-                
-        latest_resume = sorted(resumes, key=lambda x: x.created_at, reverse=True)[0].title if resumes else "N/A"
-        
+                highest_scoring_resume = resume_titles.get(res_id, "Unknown")
+
+        latest_resume = max(resumes, key=lambda x: x.created_at).title if resumes else "N/A"
+
         resume_statistics = {
             "total": total_resumes,
             "latest": latest_resume,
             "most_used": most_used_resume_name,
             "highest_scoring": highest_scoring_resume,
         }
-        
+
         # ATS Analytics
         ats_analytics = {
-            "highest": max(ats_scores) if ats_scores else 0,
-            "lowest": min(ats_scores) if ats_scores else 0,
+            "highest": score_stats["highest"],
+            "lowest": score_stats["lowest"],
             "average": int(avg_ats),
-            "median": statistics.median(ats_scores) if ats_scores else 0,
+            "median": score_stats["median"],
         }
-        
+
         # Charts
-        # 1. ATS Score Trend
-        combined_ats_events = []
-        for app in applications:
-            if app.ats_score:
-                combined_ats_events.append({
-                    "date_obj": app.application_date,
-                    "date": app.application_date.strftime("%b %d"),
-                    "score": app.ats_score,
-                    "company": app.company
-                })
-        for h in history_scores:
-            combined_ats_events.append({
-                "date_obj": h["date"],
-                "date": h["date"].strftime("%b %d"),
-                "score": h["score"],
-                "company": "Analysis Report"
-            })
-            
-        combined_ats_events.sort(key=lambda x: x["date_obj"])
-        ats_trend = [{"date": e["date"], "score": e["score"], "company": e["company"]} for e in combined_ats_events]
-        # 2. Application Status
-        status_counts = Counter([app.status for app in applications])
+        combined_ats_events.sort(key=lambda e: e[0])
+        # "%b %d" only depends on the month and day, so format each distinct day once
+        day_labels = {}
+        ats_trend = []
+        for date, score, company in combined_ats_events:
+            label = day_labels.get((date.month, date.day))
+            if label is None:
+                label = day_labels[(date.month, date.day)] = date.strftime("%b %d")
+            ats_trend.append({"date": label, "score": score, "company": company})
         status_distribution = [{"name": status, "value": count} for status, count in status_counts.items()]
-        
-        # 3. Applications Per Month
-        month_counts = Counter([app.application_date.strftime("%b %Y") for app in applications])
-        apps_per_month = [{"month": month, "count": count} for month, count in month_counts.items()]
-        
-        # 4. ATS Score Distribution
-        score_bins = {"0-60": 0, "60-70": 0, "70-80": 0, "80-90": 0, "90-100": 0}
-        for score in ats_scores:
-            if score < 60: score_bins["0-60"] += 1
-            elif score < 70: score_bins["60-70"] += 1
-            elif score < 80: score_bins["70-80"] += 1
-            elif score < 90: score_bins["80-90"] += 1
-            else: score_bins["90-100"] += 1
-        ats_distribution = [{"range": k, "count": v} for k, v in score_bins.items()]
-        
-        # 5. Resume Performance Comparison
-        resume_comp = []
-        for res in resumes:
-            scores = resume_performance.get(str(res.id), [])
-            avg = int(sum(scores) / len(scores)) if scores else 0
-            resume_comp.append({"name": res.title, "score": avg})
-            
-        # 6. Top Companies
-        company_counts = Counter([app.company for app in applications])
+        apps_per_month = [{"month": datetime(year, month, 1).strftime("%b %Y"), "count": count}
+                          for (year, month), count in month_counts.items()]
+        ats_distribution = [{"range": label, "count": count}
+                            for label, count in zip(SCORE_BIN_LABELS, score_stats["bins"])]
+        resume_comp = [{"name": res.title, "score": int(resume_averages.get(str(res.id), 0))}
+                       for res in resumes]
         top_companies = [{"company": comp, "count": count} for comp, count in company_counts.most_common(5)]
-        
+
         charts = {
             "ats_trend": ats_trend,
             "status_distribution": status_distribution,
@@ -164,33 +235,17 @@ class AnalyticsService:
             "resume_performance": resume_comp,
             "top_companies": top_companies
         }
-        
-        # Recent Activity (last 10 apps for simplicity, could merge with resumes)
-        recent_activity = []
-        sorted_apps = sorted(applications, key=lambda x: x.application_date)
-        for app in sorted_apps[-10:]:
-            recent_activity.append({
-                "type": "Application",
-                "title": f"Applied to {app.company} for {app.job_title}",
-                "date": app.application_date.isoformat(),
-                "status": app.status
-            })
-        # Sort newest first
-        recent_activity.reverse()
-        
-        # Upcoming Interviews
-        upcoming_interviews = []
-        for app in applications:
-            if app.interview_date and app.interview_date > now:
-                res_name = next((r.title for r in resumes if str(r.id) == str(app.resume_used)), "N/A")
-                upcoming_interviews.append({
-                    "company": app.company,
-                    "job_title": app.job_title,
-                    "date": app.interview_date.isoformat(),
-                    "resume_used": res_name
-                })
+
+        # Recent Activity, newest first
+        recent_activity = [{
+            "type": "Application",
+            "title": f"Applied to {app.company} for {app.job_title}",
+            "date": app.application_date.isoformat(),
+            "status": app.status
+        } for _, _, app in sorted(recent, reverse=True)]
+
         upcoming_interviews.sort(key=lambda x: x["date"])
-        
+
         return {
             "summary": summary,
             "application_statistics": application_statistics,
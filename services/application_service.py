@@ -1,16 +1,27 @@
+import argparse
+import asyncio
 import logging
 from bson import ObjectId
 from fastapi import HTTPException
+from pydantic import TypeAdapter, ValidationError
+from pymongo import ReturnDocument
 from typing import List, Optional
 
 from db import get_db
-from models import ApplicationModel
+from models import ApplicationModel, ApplicationUpdateModel, from_mongo, from_mongo_many
+from pagination import NEWEST_FIRST, paginate
+from .user_stats_service import user_stats_service
+from .data_version_service import data_versions
 
 logger = logging.getLogger(__name__)
 
+# Fields the update endpoint stored unvalidated, possibly as strings, before ApplicationUpdateModel
+_LOOSELY_TYPED_FIELDS = {field: TypeAdapter(ApplicationUpdateModel.model_fields[field].annotation)
+                         for field in ("ats_score", "interview_date")}
+
 class ApplicationService:
     async def create_application(self, user_id: str, app_data: dict):
-        logger.info(f"Creating application for user {user_id}")
+        logger.info("Creating application for user %s", user_id)
         db = get_db()
         
         try:
@@ -18,93 +29,150 @@ class ApplicationService:
             if app_data.get("resume_used"):
                 resume = await db.resumes.find_one({"_id": ObjectId(app_data["resume_used"]), "user_id": user_id})
                 if not resume:
-                    logger.warning(f"Provided resume {app_data['resume_used']} not found for user {user_id}")
+                    logger.warning("Provided resume %s not found for user %s", app_data['resume_used'], user_id)
                     raise HTTPException(status_code=400, detail="Provided resume not found for this user")
                     
             application = ApplicationModel(user_id=user_id, **app_data)
             
-            result = await db.applications.insert_one(application.model_dump(by_alias=True, exclude_none=True))
-            application.id = str(result.inserted_id)
-            logger.info(f"Successfully created application {application.id} for user {user_id}")
+            async with user_stats_service.recording(user_id):
+                result = await db.applications.insert_one(application.model_dump(by_alias=True, exclude_none=True))
+                application.id = str(result.inserted_id)
+                await user_stats_service.record_application_change(user_id, None, application)
+            await data_versions.bump(user_id)
+            logger.info("Successfully created application %s for user %s", application.id, user_id)
             return application
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error creating application for user {user_id}: {str(e)}")
+            logger.error("Error creating application for user %s: %s", user_id, e)
             raise
         
-    async def get_applications_by_user(self, user_id: str):
-        logger.info(f"Fetching applications for user {user_id}")
+    async def get_applications_by_user(self, user_id: str, cursor: str = None, limit: int = None):
+        logger.info("Fetching applications for user %s", user_id)
         try:
             db = get_db()
-            cursor = db.applications.find({"user_id": user_id})
-            applications = await cursor.to_list(length=100)
-            logger.info(f"Found {len(applications)} applications for user {user_id}")
-            return [ApplicationModel(**app) for app in applications]
+            applications, next_cursor = await paginate(
+                db.applications, {"user_id": user_id}, NEWEST_FIRST, cursor, limit)
+            logger.info("Found %s applications for user %s", len(applications), user_id)
+            return {"items": from_mongo_many(ApplicationModel, applications), "next_cursor": next_cursor}
+        except HTTPException:
+            raise
         except Exception as e:
-            logger.error(f"Error fetching applications for user {user_id}: {str(e)}")
+            logger.error("Error fetching applications for user %s: %s", user_id, e)
             raise
         
     async def get_application(self, app_id: str, user_id: str):
-        logger.info(f"Fetching application {app_id} for user {user_id}")
+        logger.info("Fetching application %s for user %s", app_id, user_id)
         db = get_db()
         application = await db.applications.find_one({"_id": ObjectId(app_id), "user_id": user_id})
         if not application:
-            logger.warning(f"Application {app_id} not found for user {user_id}")
+            logger.warning("Application %s not found for user %s", app_id, user_id)
             raise HTTPException(status_code=404, detail="Application not found")
-        return ApplicationModel(**application)
+        return from_mongo(ApplicationModel, application)
         
-    async def update_application(self, app_id: str, user_id: str, update_data: dict):
-        logger.info(f"Updating application {app_id} for user {user_id}")
+    async def update_application(self, app_id: str, user_id: str, update_data: ApplicationUpdateModel):
+        logger.info("Updating application %s for user %s", app_id, user_id)
         db = get_db()
         
         try:
-            if update_data.get("resume_used"):
-                resume = await db.resumes.find_one({"_id": ObjectId(update_data["resume_used"]), "user_id": user_id})
+            if update_data.resume_used:
+                resume = await db.resumes.find_one({"_id": ObjectId(update_data.resume_used), "user_id": user_id})
                 if not resume:
-                    logger.warning(f"Provided resume {update_data['resume_used']} not found for user {user_id}")
+                    logger.warning("Provided resume %s not found for user %s", update_data.resume_used, user_id)
                     raise HTTPException(status_code=400, detail="Provided resume not found for this user")
                     
-            # Only allow specific fields to be updated
-            allowed_fields = ["company", "job_title", "job_link", "platform", "resume_used", 
-                              "ats_score", "status", "notes", "interview_date"]
-            
-            filtered_data = {k: v for k, v in update_data.items() if k in allowed_fields}
+            # Validated by the model, so stored values have the types readers expect
+            filtered_data = update_data.changes()
             
             if not filtered_data:
-                logger.warning(f"No valid fields to update for application {app_id}")
+                logger.warning("No valid fields to update for application %s", app_id)
                 raise HTTPException(status_code=400, detail="No valid fields to update")
                 
-            result = await db.applications.update_one(
-                {"_id": ObjectId(app_id), "user_id": user_id},
-                {"$set": filtered_data}
-            )
-            
-            if result.matched_count == 0:
-                logger.warning(f"Cannot update: Application {app_id} not found for user {user_id}")
-                raise HTTPException(status_code=404, detail="Application not found")
-                
-            logger.info(f"Successfully updated application {app_id}")
-            return await self.get_application(app_id, user_id)
+            async with user_stats_service.recording(user_id):
+                before = await db.applications.find_one_and_update(
+                    {"_id": ObjectId(app_id), "user_id": user_id},
+                    {"$set": filtered_data},
+                    return_document=ReturnDocument.BEFORE
+                )
+
+                if before is None:
+                    logger.warning("Cannot update: Application %s not found for user %s", app_id, user_id)
+                    raise HTTPException(status_code=404, detail="Application not found")
+
+                logger.info("Successfully updated application %s", app_id)
+                application = await self.get_application(app_id, user_id)
+                await user_stats_service.record_application_change(user_id, from_mongo(ApplicationModel, before), application)
+            await data_versions.bump(user_id)
+            return application
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error updating application {app_id}: {str(e)}")
+            logger.error("Error updating application %s: %s", app_id, e)
             raise
         
     async def delete_application(self, app_id: str, user_id: str):
-        logger.info(f"Deleting application {app_id} for user {user_id}")
+        logger.info("Deleting application %s for user %s", app_id, user_id)
         try:
             db = get_db()
-            result = await db.applications.delete_one({"_id": ObjectId(app_id), "user_id": user_id})
-            if result.deleted_count == 0:
-                logger.warning(f"Cannot delete: Application {app_id} not found for user {user_id}")
-                raise HTTPException(status_code=404, detail="Application not found")
-            
-            logger.info(f"Successfully deleted application {app_id}")
+            async with user_stats_service.recording(user_id):
+                deleted = await db.applications.find_one_and_delete({"_id": ObjectId(app_id), "user_id": user_id})
+                if deleted is None:
+                    logger.warning("Cannot delete: Application %s not found for user %s", app_id, user_id)
+                    raise HTTPException(status_code=404, detail="Application not found")
+
+                await user_stats_service.record_application_change(user_id, from_mongo(ApplicationModel, deleted), None)
+            await data_versions.bump(user_id)
+            logger.info("Successfully deleted application %s", app_id)
             return True
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error deleting application {app_id}: {str(e)}")
+            logger.error("Error deleting application %s: %s", app_id, e)
             raise
+
+    async def backfill_field_types(self, batch_size: int = 200) -> int:
+        """
+        Converts fields stored as strings by older releases to their model types, clearing
+        values that don't parse, then rebuilds the owners' dashboard stats. Returns how many
+        applications changed.
+        """
+        db = get_db()
+        query = {"$or": [{field: {"$type": "string"}} for field in _LOOSELY_TYPED_FIELDS]}
+        converted, user_ids = 0, set()
+        while True:
+            batch = await db.applications.find(
+                query, {"user_id": 1, **dict.fromkeys(_LOOSELY_TYPED_FIELDS, 1)}).limit(batch_size).to_list(None)
+            if not batch:
+                break
+            for doc in batch:
+                update = {}
+                for field, adapter in _LOOSELY_TYPED_FIELDS.items():
+                    value = doc.get(field)
+                    if not isinstance(value, str):
+                        continue
+                    try:
+                        update[field] = adapter.validate_python(value)
+                    except ValidationError:
+                        logger.warning("Clearing unparseable %s %r on application %s", field, value, doc["_id"])
+                        update[field] = None
+                await db.applications.update_one({"_id": doc["_id"]}, {"$set": update})
+                user_ids.add(str(doc["user_id"]))
+                converted += 1
+            logger.info("Converted %s applications", converted)
+
+        for user_id in user_ids:
+            await user_stats_service.rebuild(user_id)
+            await data_versions.bump(user_id)
+        return converted
+
+
+async def _main():
+    parser = argparse.ArgumentParser(description="Application maintenance.")
+    parser.add_argument("command", choices=["backfill"])
+    parser.parse_args()
+    print(f"Converted {await ApplicationService().backfill_field_types()} applications")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    asyncio.run(_main())
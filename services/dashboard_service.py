@@ -1,12 +1,18 @@
+import asyncio
 import json
 import logging
-import google.generativeai as genai
 import os
 import hashlib
 from fastapi import HTTPException
 from db import get_db
-from models import ResumeModel, ApplicationModel
+from models import ResumeModel, ApplicationModel, from_mongo_many
 from .analytics_service import analytics_service
+from .user_stats_service import user_stats_service
+from .insight_cache_service import insight_cache
+from .data_version_service import data_versions
+from config import INCREMENTAL_DASHBOARD_STATS
+from helpers import configure_genai
+from timing import span
 from pydantic import BaseModel
 from typing import List
 
@@ -20,50 +26,87 @@ class DashboardService:
         api_key = os.getenv("GEMINI_API_KEY")
         if not api_key:
             logger.warning("GEMINI_API_KEY is not set for dashboard insights")
-        else:
-            genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-2.5-flash')
-        self._insight_cache = {}
+        self._model = None
+        # Keeps references to in-flight refreshes so they are not garbage collected
+        self._refresh_tasks: set[asyncio.Task] = set()
         
+    @property
+    def model(self):
+        if self._model is None:
+            self._model = configure_genai().GenerativeModel('gemini-2.5-flash')
+        return self._model
+
     def _hash_stats(self, stats: dict) -> str:
         return hashlib.md5(json.dumps(stats, sort_keys=True).encode()).hexdigest()
 
     async def get_dashboard_data(self, user_id: str):
+        if INCREMENTAL_DASHBOARD_STATS:
+            stats = await user_stats_service.get_dashboard_stats(user_id)
+        else:
+            stats = await self._calculate_dashboard_stats(user_id)
+        
+        # Serve cached insights; stale ones are returned immediately and refreshed in the background
+        stats_hash = self._hash_stats(stats)
+        cached = await insight_cache.get(user_id)
+        if cached and cached['hash'] == stats_hash:
+            insights = cached['insights']
+            logger.info("Using cached dashboard insights for user %s", user_id)
+        elif cached:
+            insights = cached['insights']
+            logger.info("Serving stale dashboard insights for user %s", user_id)
+            await self._schedule_refresh(user_id, stats, stats_hash)
+        else:
+            # Nothing to show yet, so the first generation is awaited
+            logger.info("Generating new dashboard insights for user %s", user_id)
+            insights = await self._generate_llm_insights(stats)
+            await insight_cache.set(user_id, stats_hash, insights)
+            
+        stats["insights"] = insights
+        
+        return stats
+
+    async def _schedule_refresh(self, user_id: str, stats: dict, stats_hash: str):
+        if not await insight_cache.try_acquire_refresh(user_id):
+            logger.info("Dashboard insight refresh for user %s is debounced", user_id)
+            return
+        task = asyncio.create_task(self._refresh_insights(user_id, dict(stats), stats_hash))
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def drain(self, timeout: float):
+        """Waits up to ``timeout`` seconds for background refreshes; called on shutdown."""
+        if self._refresh_tasks:
+            await asyncio.wait(self._refresh_tasks, timeout=timeout)
+
+    async def _refresh_insights(self, user_id: str, stats: dict, stats_hash: str):
+        logger.info("Regenerating dashboard insights for user %s in the background", user_id)
+        insights = await self._generate_llm_insights(stats)
+        await insight_cache.set(user_id, stats_hash, insights)
+        # The dashboard payload changed without a data write; let polling clients see it
+        await data_versions.bump(user_id)
+
+    async def _calculate_dashboard_stats(self, user_id: str):
+        """Recomputes the dashboard from the raw collections (the pre-aggregation path)."""
         db = get_db()
         
         # Fetch Resumes
         resume_cursor = db.resumes.find({"user_id": user_id})
         resumes_data = await resume_cursor.to_list(length=100)
-        resumes = [ResumeModel(**r) for r in resumes_data]
+        resumes = from_mongo_many(ResumeModel, resumes_data)
         
         # Fetch Applications
         app_cursor = db.applications.find({"user_id": user_id})
         apps_data = await app_cursor.to_list(length=1000)
-        applications = [ApplicationModel(**a) for a in apps_data]
+        applications = from_mongo_many(ApplicationModel, apps_data)
         
         # Fetch ATS History
         from bson import ObjectId
-        history_cursor = db.history.find({"user_id": ObjectId(user_id), "user_type": "employee"})
+        history_cursor = db.history.find(
+            {"user_id": ObjectId(user_id), "user_type": "employee"},
+            {"analysis_result.JD-Match": 1, "created_at": 1, "resume_id": 1})
         history = await history_cursor.to_list(length=1000)
         
-        # Calculate stats
-        stats = analytics_service.calculate_dashboard_stats(applications, resumes, history)
-        
-        # Check cache before calling LLM
-        stats_hash = self._hash_stats(stats)
-        cached = self._insight_cache.get(user_id)
-        if cached and cached['hash'] == stats_hash:
-            insights = cached['insights']
-            logger.info(f"Using cached dashboard insights for user {user_id}")
-        else:
-            # Generate Insights via LLM
-            logger.info(f"Generating new dashboard insights for user {user_id}")
-            insights = await self._generate_llm_insights(stats)
-            self._insight_cache[user_id] = {'hash': stats_hash, 'insights': insights}
-            
-        stats["insights"] = insights
-        
-        return stats
+        return analytics_service.calculate_dashboard_stats(applications, resumes, history)
 
     async def _generate_llm_insights(self, stats: dict) -> List[str]:
         if not stats["summary"]["applications"]:
@@ -82,21 +125,22 @@ class DashboardService:
             ATS Analytics: {json.dumps(stats['ats_analytics'])}
             """
             
-            generation_config = genai.GenerationConfig(
+            generation_config = configure_genai().GenerationConfig(
                 temperature=0.7,
                 response_mime_type="application/json",
                 response_schema=InsightResponse,
             )
             
-            response = self.model.generate_content(
-                prompt,
-                generation_config=generation_config
-            )
+            with span("llm"):
+                response = await self.model.generate_content_async(
+                    prompt,
+                    generation_config=generation_config
+                )
             
             result = json.loads(response.text)
             return result.get("insights", [])
         except Exception as e:
-            logger.error(f"Failed to generate dashboard insights: {str(e)}")
+            logger.error("Failed to generate dashboard insights: %s", e)
             return ["Keep applying and tailoring your resumes to improve your chances."]
 
 dashboard_service = DashboardService()
@@ -0,0 +1,83 @@
+import hashlib
+import logging
+import time
+from typing import Optional
+
+from fastapi import Request
+
+logger = logging.getLogger(__name__)
+
+
+class DataVersionService:
+    """
+    Per-user data version counters in Redis, used to answer conditional GETs.
+
+    Every write to a user's resumes, applications, JDs or analyses bumps the counter. GET
+    endpoints derive an ETag from it, so a matching If-None-Match can be answered with 304
+    without reading Mongo or recomputing anything.
+
+    A missing counter is seeded from the current time in milliseconds rather than zero, so
+    after a Redis flush versions keep moving forward and old ETags can't match again.
+    """
+
+    KEY_PREFIX = "data_version:"
+
+    def _redis(self):
+        from helpers import get_async_redis
+        return get_async_redis()
+
+    def _seed(self) -> int:
+        return int(time.time() * 1000)
+
+    async def get(self, user_id: str) -> Optional[int]:
+        """Current version, or None when Redis is unavailable (conditional GETs are then skipped)."""
+        key = self.KEY_PREFIX + user_id
+        try:
+            redis_client = self._redis()
+            version = await redis_client.get(key)
+            if version is None:
+                pipe = redis_client.pipeline()
+                pipe.set(key, self._seed(), nx=True)
+                pipe.get(key)
+                _, version = await pipe.execute()
+            return int(version)
+        except Exception as e:
+            logger.warning("Data version lookup failed for user %s: %s", user_id, e)
+            return None
+
+    async def bump(self, user_id: str):
+        """Call after any write that changes what the user's GET endpoints return."""
+        key = self.KEY_PREFIX + user_id
+        try:
+            pipe = self._redis().pipeline()
+            pipe.set(key, self._seed(), nx=True)
+            pipe.incr(key)
+            await pipe.execute()
+        except Exception as e:
+            logger.error("Failed to bump data version for user %s: %s", user_id, e)
+
+    async def etag(self, user_id: str, request: Request, *extra: str) -> Optional[str]:
+        """
+        Weak ETag for this user's view of ``request``: the data version plus the path, query
+        string and any ``extra`` inputs the response depends on.
+        """
+        version = await self.get(user_id)
+        if version is None:
+            return None
+        variant = "|".join([request.url.path, str(request.query_params), *extra])
+        digest = hashlib.md5(variant.encode()).hexdigest()[:12]
+        return f'W/"{version}-{digest}"'
+
+    @staticmethod
+    def matches(request: Request, etag: Optional[str]) -> bool:
+        """True when the request's If-None-Match already names ``etag``."""
+        header = request.headers.get("if-none-match")
+        if not etag or not header:
+            return False
+        if header.strip() == "*":
+            return True
+        bare = etag.removeprefix("W/")
+        return any(tag.strip().removeprefix("W/") == bare for tag in header.split(","))
+
+
+data_versions = DataVersionService()
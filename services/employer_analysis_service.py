@@ -2,23 +2,24 @@ import asyncio
 import logging
 from bson import ObjectId
 from fastapi import HTTPException
-from datetime import datetime
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 
+from config import NEAR_DUPLICATE_AUTO_LINK
 from db import get_db
-from models import EmployerAnalysisModel
+from models import EmployerAnalysisModel, from_mongo
 from helpers import get_llm_response, parse_llm_response
-from services.resume_service import ResumeService
-from services.storage_service import LocalStorageProvider
+from services.data_version_service import data_versions
+from services.leaderboard_service import leaderboard
 
 logger = logging.getLogger(__name__)
 
-class EmployerAnalysisService:
-    def __init__(self):
-        self.storage = LocalStorageProvider()
-        self.resume_service = ResumeService(self.storage)
+# Finished analyses are written in bulk once this many are ready
+ANALYSIS_WRITE_CHUNK_SIZE = 20
 
+class EmployerAnalysisService:
     async def analyze_batch(self, user_id: str, jd_id: str, resume_ids: list[str]):
-        logger.info(f"Starting batch analysis for jd {jd_id} with {len(resume_ids)} resumes")
+        logger.info("Starting batch analysis for jd %s with %s resumes", jd_id, len(resume_ids))
         db = get_db()
         
         # 1. Fetch the Job Description
@@ -30,15 +31,38 @@ class EmployerAnalysisService:
         if not jd_text_final:
             raise HTTPException(status_code=400, detail="Job description has no content")
 
-        # 2. Define the concurrent analysis function
-        async def analyze_single(resume_id: str):
+        # 2. Fetch every resume in one round trip
+        object_ids, results = [], [None] * len(resume_ids)
+        for i, resume_id in enumerate(resume_ids):
             try:
-                # Fetch resume text
-                resume = await self.resume_service.get_resume(resume_id, user_id)
-                if not resume:
-                    return {"resume_id": resume_id, "error": "Resume not found"}
-                
-                cv_text = resume.resume_text
+                object_ids.append(ObjectId(resume_id))
+            except Exception:
+                results[i] = {"resume_id": resume_id, "success": False, "error": "Invalid resume id"}
+        resumes = {
+            str(r["_id"]): r
+            async for r in db.resumes.find(
+                {"_id": {"$in": object_ids}, "user_id": user_id},
+                {"title": 1, "resume_text": 1, "duplicate_of": 1})
+        }
+
+        # 3. Near-copies of a resume reuse its analysis for this JD instead of calling the LLM
+        existing, leaders = {}, {}
+        if NEAR_DUPLICATE_AUTO_LINK:
+            existing, leaders = await self._plan_duplicate_links(db, jd_id, resume_ids, resumes)
+        shared = {leader: asyncio.get_running_loop().create_future() for leader in set(leaders.values())}
+
+        # 4. Define the concurrent analysis function
+        async def analyze_single(index: int, resume_id: str):
+            resume = resumes.get(resume_id)
+            if not resume:
+                return index, None, {"resume_id": resume_id, "success": False, "error": "Resume not found"}
+            source = existing.get(resume_id)
+            if source is None and resume_id in leaders:
+                source = await shared[leaders[resume_id]]
+            if source is not None:
+                return index, self._reuse_analysis(source, user_id, jd_id, resume_id, resume), None
+            try:
+                cv_text = resume.get("resume_text", "")
                 
                 prompt = f"""
 You are a highly precise and analytical AI recruitment assistant. Your task is to evaluate a candidate's CV against a job description (JD) with methodical accuracy.
@@ -75,42 +99,39 @@ JD:
                     user_id=user_id,
                     jd_id=jd_id,
                     resume_id=resume_id,
-                    candidate_name=resume.title, # Fallback to resume title
+                    candidate_name=resume["title"], # Fallback to resume title
                     ats_score=ats_score,
                     analysis_result=parsed_response,
                     status="Analyzed"
                 )
-                
-                # Check if analysis for this jd and resume already exists
-                existing = await db.employer_analyses.find_one({
-                    "jd_id": jd_id, 
-                    "resume_id": resume_id
-                })
-                
-                if existing:
-                    # Update existing
-                    await db.employer_analyses.update_one(
-                        {"_id": existing["_id"]},
-                        {"$set": {
-                            "ats_score": ats_score, 
-                            "analysis_result": parsed_response,
-                            "updated_at": datetime.utcnow()
-                        }}
-                    )
-                    analysis.id = str(existing["_id"])
-                else:
-                    # Insert new
-                    result = await db.employer_analyses.insert_one(analysis.model_dump(by_alias=True, exclude_none=True))
-                    analysis.id = str(result.inserted_id)
-                    
-                return {"resume_id": resume_id, "success": True, "analysis": analysis.model_dump(by_alias=True)}
+                return index, analysis, None
             except Exception as e:
-                logger.error(f"Error analyzing resume {resume_id}: {str(e)}")
-                return {"resume_id": resume_id, "success": False, "error": str(e)}
+                logger.error("Error analyzing resume %s: %s", resume_id, e)
+                return index, None, {"resume_id": resume_id, "success": False, "error": str(e)}
+
+        async def analyze_and_share(index: int, resume_id: str):
+            result = await analyze_single(index, resume_id)
+            future = shared.get(resume_id)
+            if future is not None and not future.done():
+                future.set_result(result[1])  # None on failure: copies then call the LLM themselves
+            return result
 
-        # 3. Run concurrently
-        tasks = [analyze_single(rid) for rid in resume_ids]
-        results = await asyncio.gather(*tasks)
+        # 5. Run concurrently, persisting finished analyses in chunks as they complete
+        pending: list[tuple[int, EmployerAnalysisModel]] = []
+        tasks = [analyze_and_share(i, rid) for i, rid in enumerate(resume_ids) if results[i] is None]
+        for next_done in asyncio.as_completed(tasks):
+            index, analysis, error = await next_done
+            if error:
+                results[index] = error
+                continue
+            pending.append((index, analysis))
+            if len(pending) >= ANALYSIS_WRITE_CHUNK_SIZE:
+                await self._flush_analyses(db, jd_id, pending, results)
+                pending = []
+        if pending:
+            await self._flush_analyses(db, jd_id, pending, results)
+
+        await data_versions.bump(user_id)
         
         # Calculate summary metrics for the batch
         successful = [r for r in results if r.get("success")]
@@ -122,3 +143,100 @@ JD:
             "failed": len(failed),
             "results": results
         }
+
+    @staticmethod
+    async def _plan_duplicate_links(db, jd_id: str, resume_ids: list[str], resumes: dict) -> tuple[dict, dict]:
+        """
+        Decides which resumes in the batch can reuse another analysis, by their original
+        resume (``duplicate_of``, or the resume itself). Returns:
+
+        - ``existing``: resume id -> stored analysis of its original for this JD, used when
+          the original is not part of the batch.
+        - ``leaders``: resume id -> the resume in this batch whose fresh analysis it reuses.
+          That is the original when it is in the batch, otherwise the group's first copy.
+        """
+        in_batch = [resume_id for resume_id in dict.fromkeys(resume_ids) if resume_id in resumes]
+        originals = {resume_id: str(resumes[resume_id].get("duplicate_of") or resume_id)
+                     for resume_id in in_batch}
+        groups: dict[str, list[str]] = {}
+        for resume_id in in_batch:
+            groups.setdefault(originals[resume_id], []).append(resume_id)
+
+        linked = [original for original, members in groups.items()
+                  if original not in resumes and any(member != original for member in members)]
+        stored = {}
+        if linked:
+            async for doc in db.employer_analyses.find({"jd_id": jd_id, "resume_id": {"$in": linked}}):
+                stored[str(doc["resume_id"])] = from_mongo(EmployerAnalysisModel, doc)
+
+        existing, leaders = {}, {}
+        for original, members in groups.items():
+            if original in stored:
+                existing.update((member, stored[original]) for member in members)
+                continue
+            leader = original if original in resumes else members[0]
+            leaders.update((member, leader) for member in members if member != leader)
+        return existing, leaders
+
+    @staticmethod
+    def _reuse_analysis(source: EmployerAnalysisModel, user_id: str, jd_id: str, resume_id: str,
+                        resume: dict) -> EmployerAnalysisModel:
+        logger.info("Reusing analysis of resume %s for near-duplicate %s", source.resume_id, resume_id)
+        return EmployerAnalysisModel(
+            user_id=user_id,
+            jd_id=jd_id,
+            resume_id=resume_id,
+            candidate_name=resume["title"],
+            ats_score=source.ats_score,
+            analysis_result=source.analysis_result,
+            status="Analyzed",
+            duplicate_of=source.resume_id
+        )
+
+    async def _flush_analyses(self, db, jd_id: str, pending: list, results: list):
+        """
+        Upserts a chunk of analyses with one unordered bulk_write keyed on (jd_id, resume_id),
+        then fills in their result entries. Re-analysing a candidate updates the score and
+        result but keeps its status, name and creation time.
+        """
+        operations = []
+        for _, analysis in pending:
+            doc = analysis.model_dump(by_alias=True, exclude_none=True)
+            doc.pop("_id", None)
+            refreshed = {key: doc.pop(key) for key in ("ats_score", "analysis_result", "updated_at")}
+            refreshed["duplicate_of"] = doc.pop("duplicate_of", None)
+            operations.append(UpdateOne(
+                {"jd_id": doc.pop("jd_id"), "resume_id": doc.pop("resume_id")},
+                {"$set": refreshed, "$setOnInsert": doc},
+                upsert=True,
+            ))
+
+        failed_ops = {}
+        try:
+            await db.employer_analyses.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            failed_ops = {err["index"]: err.get("errmsg", "Write failed") for err in e.details.get("writeErrors", [])}
+            logger.error("%s of %s analysis writes failed for jd %s", len(failed_ops), len(operations), jd_id)
+        except Exception as e:
+            logger.error("Error saving analyses for jd %s: %s", jd_id, e)
+            failed_ops = {i: str(e) for i in range(len(operations))}
+
+        # Upserts don't report ids of documents that already existed, so read them back
+        resume_ids = [str(analysis.resume_id) for _, analysis in pending]
+        saved_ids = {}
+        if len(failed_ops) < len(operations):
+            async for saved in db.employer_analyses.find(
+                    {"jd_id": jd_id, "resume_id": {"$in": resume_ids}}, {"resume_id": 1}):
+                saved_ids[str(saved["resume_id"])] = str(saved["_id"])
+
+        scores = {}
+        for op_index, (index, analysis) in enumerate(pending):
+            resume_id = str(analysis.resume_id)
+            if op_index in failed_ops:
+                results[index] = {"resume_id": resume_id, "success": False, "error": failed_ops[op_index]}
+                continue
+            analysis.id = saved_ids.get(resume_id)
+            if analysis.id:
+                scores[analysis.id] = analysis.ats_score
+            results[index] = {"resume_id": resume_id, "success": True, "analysis": analysis.model_dump(by_alias=True)}
+        await leaderboard.record(jd_id, scores)
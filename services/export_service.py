@@ -1,10 +1,12 @@
 import markdown
-from xhtml2pdf import pisa
-from htmldocx import HtmlToDocx
-from docx import Document
 import io
 
+# xhtml2pdf, htmldocx and python-docx are imported inside the converters: they are slow to
+# import and only needed by the export endpoints.
+
 def markdown_to_pdf(md_text: str) -> io.BytesIO:
+    from xhtml2pdf import pisa
+
     html_content = markdown.markdown(md_text)
     # Basic styling for professional resume
     styled_html = f"""
@@ -62,6 +64,9 @@ def markdown_to_pdf(md_text: str) -> io.BytesIO:
     return pdf_stream
 
 def markdown_to_docx(md_text: str) -> io.BytesIO:
+    from docx import Document
+    from htmldocx import HtmlToDocx
+
     html_content = markdown.markdown(md_text)
     doc = Document()
     new_parser = HtmlToDocx()
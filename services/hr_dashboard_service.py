@@ -9,48 +9,64 @@ logger = logging.getLogger(__name__)
 class HrDashboardService:
     @staticmethod
     async def get_dashboard_data(user_id: str):
-        logger.info(f"Fetching HR dashboard data for user {user_id}")
+        logger.info("Fetching HR dashboard data for user %s", user_id)
         db = get_db()
         
-        # 1. Fetch JDs
-        jds = await db.job_descriptions.find({"user_id": user_id}).to_list(length=100)
+        # 1. Fetch JDs (only the fields the charts need)
+        jds = await db.job_descriptions.find(
+            {"user_id": user_id}, {"title": 1, "status": 1}).to_list(length=None)
         
-        # 2. Fetch Analyses
-        analyses = await db.employer_analyses.find({"user_id": user_id}).to_list(length=1000)
+        # 2. Aggregate analyses server-side; only the numbers come back
+        pipeline = [
+            {"$match": {"user_id": user_id}},
+            # Only fields of the user_id_jd_id_status_ats_score index, so no documents are fetched
+            {"$project": {"_id": 0, "jd_id": 1, "status": 1, "ats_score": 1}},
+            {"$facet": {
+                "totals": [
+                    {"$group": {
+                        "_id": None,
+                        "count": {"$sum": 1},
+                        "avg_ats": {"$avg": {"$ifNull": ["$ats_score", 0]}}
+                    }}
+                ],
+                "by_status": [
+                    {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+                ],
+                "by_jd": [
+                    {"$group": {
+                        "_id": "$jd_id",
+                        "count": {"$sum": 1},
+                        "total_score": {"$sum": {"$ifNull": ["$ats_score", 0]}}
+                    }}
+                ]
+            }}
+        ]
+        facets = (await db.employer_analyses.aggregate(pipeline).to_list(length=1))[0]
+        totals = facets["totals"][0] if facets["totals"] else {"count": 0, "avg_ats": 0}
+        status_counts = {row["_id"]: row["count"] for row in facets["by_status"]}
+        jd_counts = {str(row["_id"]): row for row in facets["by_jd"]}
         
         # 3. Calculate KPI Cards
         active_jobs = len([jd for jd in jds if jd.get("status") == "Open"])
-        total_candidates = len(analyses)
+        total_candidates = totals["count"]
         
-        shortlisted = len([a for a in analyses if a.get("status") == "Shortlisted"])
-        interviews = len([a for a in analyses if a.get("status") == "Interviewing"])
-        offers = len([a for a in analyses if a.get("status") == "Offered"])
-        hires = len([a for a in analyses if a.get("status") == "Hired"])
-        rejections = len([a for a in analyses if a.get("status") == "Rejected"])
+        shortlisted = status_counts.get("Shortlisted", 0)
+        interviews = status_counts.get("Interviewing", 0)
+        offers = status_counts.get("Offered", 0)
+        hires = status_counts.get("Hired", 0)
+        rejections = status_counts.get("Rejected", 0)
         
-        avg_ats = 0
-        if analyses:
-            avg_ats = sum(a.get("ats_score", 0) for a in analyses) / len(analyses)
+        avg_ats = totals["avg_ats"] or 0
             
         # 4. Charts - Applications per Job
         apps_per_job = {}
         for jd in jds:
+            counts = jd_counts.get(str(jd["_id"]), {"count": 0, "total_score": 0})
             apps_per_job[str(jd["_id"])] = {
                 "title": jd["title"],
-                "count": 0,
-                "avg_score": 0,
-                "total_score": 0
+                "count": counts["count"],
+                "avg_score": counts["total_score"] / counts["count"] if counts["count"] else 0,
             }
-            
-        for a in analyses:
-            jd_id_str = str(a.get("jd_id"))
-            if jd_id_str in apps_per_job:
-                apps_per_job[jd_id_str]["count"] += 1
-                apps_per_job[jd_id_str]["total_score"] += a.get("ats_score", 0)
-                
-        for k, v in apps_per_job.items():
-            if v["count"] > 0:
-                v["avg_score"] = v["total_score"] / v["count"]
                 
         applications_per_job_chart = [{"name": v["title"], "applications": v["count"]} for v in apps_per_job.values()]
         avg_score_by_job_chart = [{"name": v["title"], "score": round(v["avg_score"], 1)} for v in apps_per_job.values() if v["count"] > 0]
@@ -0,0 +1,101 @@
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from config import (INSIGHT_CACHE_MAX_SIZE, INSIGHT_CACHE_TTL_SECONDS,
+                    INSIGHT_REFRESH_DEBOUNCE_SECONDS)
+
+logger = logging.getLogger(__name__)
+
+
+class InsightCacheService:
+    """
+    Dashboard LLM insights per user, shared across workers through Redis.
+
+    Entries carry the hash of the stats they were generated from, so callers can tell a
+    fresh entry from a stale one and keep serving the stale one while it is regenerated.
+    Size is bounded LRU-style by a sorted set of last-access times; entries also expire
+    after INSIGHT_CACHE_TTL_SECONDS. If Redis is unreachable, a bounded in-process LRU is
+    used instead so the dashboard keeps working.
+    """
+
+    KEY_PREFIX = "dashboard_insights:"
+    LOCK_PREFIX = "dashboard_insights_lock:"
+    LRU_KEY = "dashboard_insights_lru"
+
+    def __init__(self, max_size: int = INSIGHT_CACHE_MAX_SIZE,
+                 ttl_seconds: int = INSIGHT_CACHE_TTL_SECONDS,
+                 debounce_seconds: int = INSIGHT_REFRESH_DEBOUNCE_SECONDS):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.debounce_seconds = debounce_seconds
+        self._local: "OrderedDict[str, tuple[float, dict]]" = OrderedDict()
+        self._local_locks: dict[str, float] = {}
+
+    def _redis(self):
+        from helpers import get_async_redis
+        return get_async_redis()
+
+    async def get(self, user_id: str) -> Optional[dict]:
+        """Returns ``{"hash", "insights", "generated_at"}`` or None."""
+        try:
+            pipe = self._redis().pipeline(transaction=False)
+            pipe.get(self.KEY_PREFIX + user_id)
+            # Only refreshes users already tracked, so a miss doesn't add one
+            pipe.zadd(self.LRU_KEY, {user_id: time.time()}, xx=True)
+            data, _ = await pipe.execute()
+            return json.loads(data) if data is not None else None
+        except Exception as e:
+            logger.warning("Insight cache Redis lookup failed, using local cache: %s", e)
+
+        entry = self._local.get(user_id)
+        if entry is None or entry[0] <= time.monotonic():
+            self._local.pop(user_id, None)
+            return None
+        self._local.move_to_end(user_id)
+        return entry[1]
+
+    async def set(self, user_id: str, stats_hash: str, insights: list[str]):
+        entry = {"hash": stats_hash, "insights": insights, "generated_at": time.time()}
+        try:
+            redis_client = self._redis()
+            pipe = redis_client.pipeline()
+            pipe.setex(self.KEY_PREFIX + user_id, self.ttl_seconds, json.dumps(entry))
+            pipe.zadd(self.LRU_KEY, {user_id: time.time()})
+            pipe.zcard(self.LRU_KEY)
+            size = (await pipe.execute())[-1]
+            if size > self.max_size:
+                evicted = [member.decode() if isinstance(member, bytes) else member
+                           for member, _ in await redis_client.zpopmin(self.LRU_KEY, size - self.max_size)]
+                await redis_client.delete(*[self.KEY_PREFIX + uid for uid in evicted])
+            return
+        except Exception as e:
+            logger.warning("Insight cache Redis write failed, using local cache: %s", e)
+
+        self._local[user_id] = (time.monotonic() + self.ttl_seconds, entry)
+        self._local.move_to_end(user_id)
+        while len(self._local) > self.max_size:
+            self._local.popitem(last=False)
+
+    async def try_acquire_refresh(self, user_id: str) -> bool:
+        """
+        Debounces regeneration: at most one refresh per user per INSIGHT_REFRESH_DEBOUNCE_SECONDS,
+        across all workers. Returns True if the caller should regenerate.
+        """
+        try:
+            return bool(await self._redis().set(self.LOCK_PREFIX + user_id, "1", nx=True,
+                                                ex=self.debounce_seconds))
+        except Exception as e:
+            logger.warning("Insight refresh lock Redis call failed, using local lock: %s", e)
+
+        now = time.monotonic()
+        if self._local_locks.get(user_id, 0) > now:
+            return False
+        self._local_locks = {uid: t for uid, t in self._local_locks.items() if t > now}
+        self._local_locks[user_id] = now + self.debounce_seconds
+        return True
+
+
+insight_cache = InsightCacheService()
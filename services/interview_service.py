@@ -1,10 +1,10 @@
 import os
 import json
 import logging
-import google.generativeai as genai
 from fastapi import HTTPException
 from models import InterviewPrepResponse
 from .prompt_builder import build_interview_prep_prompt
+from helpers import configure_genai
 
 logger = logging.getLogger(__name__)
 
@@ -13,15 +13,20 @@ class InterviewService:
         api_key = os.getenv("GEMINI_API_KEY")
         if not api_key:
             raise ValueError("GEMINI_API_KEY is not set")
-        genai.configure(api_key=api_key)
-        # Use a stable version like gemini-2.5-flash for standard structured generation
-        self.model = genai.GenerativeModel('gemini-2.5-flash')
+        self._model = None
+
+    @property
+    def model(self):
+        if self._model is None:
+            # Use a stable version like gemini-2.5-flash for standard structured generation
+            self._model = configure_genai().GenerativeModel('gemini-2.5-flash')
+        return self._model
 
     async def process_interview_prep(self, resume_text: str, jd_text: str) -> dict:
         try:
             prompt = build_interview_prep_prompt(resume_text, jd_text)
             
-            generation_config = genai.GenerationConfig(
+            generation_config = configure_genai().GenerationConfig(
                 temperature=0.7,
                 response_mime_type="application/json",
                 response_schema=InterviewPrepResponse,
@@ -36,11 +41,11 @@ class InterviewService:
             if not response.text:
                 raise HTTPException(status_code=500, detail="Empty response from LLM")
                 
-            logger.info(f"LLM Response: {response.text}")
+            logger.info("LLM response (%d chars)", len(response.text), extra={"payload": response.text})
             return json.loads(response.text)
             
         except Exception as e:
-            logger.error(f"Error generating interview questions: {str(e)}")
+            logger.error("Error generating interview questions: %s", e)
             raise HTTPException(status_code=500, detail=f"Failed to generate interview questions: {str(e)}")
 
 interview_service = InterviewService()
@@ -4,56 +4,70 @@ from fastapi import HTTPException
 from datetime import datetime
 
 from db import get_db
-from models import JobDescriptionModel
+from models import JobDescriptionModel, JobDescriptionSummaryModel, from_mongo, from_mongo_many
 from helpers import get_llm_response
 import json
+from pagination import NEWEST_FIRST, clamp_limit, paginate
+from services.data_version_service import data_versions
+from services.leaderboard_service import leaderboard
+from services.resume_index_service import resume_index
+from skills import jd_skill_text, skill_tagger
 
 logger = logging.getLogger(__name__)
 
+# Fields the stored skill tags are derived from
+_SKILL_SOURCE_FIELDS = {"title": 1, "full_description": 1, "required_skills": 1, "preferred_skills": 1}
+
 class JdService:
     @staticmethod
     async def create_jd(user_id: str, jd_data: dict):
-        logger.info(f"Creating job description for user {user_id}")
+        logger.info("Creating job description for user %s", user_id)
         db = get_db()
         try:
             jd = JobDescriptionModel(user_id=user_id, **jd_data)
+            jd.skills = skill_tagger().tag(jd_skill_text(jd.model_dump()))
             result = await db.job_descriptions.insert_one(jd.model_dump(by_alias=True, exclude_none=True))
             jd.id = str(result.inserted_id)
+            await data_versions.bump(user_id)
             return jd
         except Exception as e:
-            logger.error(f"Error creating jd: {str(e)}")
+            logger.error("Error creating jd: %s", e)
             raise HTTPException(status_code=500, detail="Failed to create job description")
 
     @staticmethod
-    async def get_jds_by_user(user_id: str):
-        logger.info(f"Fetching job descriptions for user {user_id}")
+    async def get_jds_by_user(user_id: str, cursor: str = None, limit: int = None):
+        logger.info("Fetching job descriptions for user %s", user_id)
         db = get_db()
         try:
-            cursor = db.job_descriptions.find({"user_id": user_id}).sort("created_at", -1)
-            jds = await cursor.to_list(length=100)
-            return [JobDescriptionModel(**jd) for jd in jds]
+            # Listings never show the full text, so leave it in Mongo
+            jds, next_cursor = await paginate(
+                db.job_descriptions, {"user_id": user_id}, NEWEST_FIRST, cursor, limit,
+                projection={"full_description": 0})
+            return {"items": from_mongo_many(JobDescriptionSummaryModel, jds), "next_cursor": next_cursor}
+        except HTTPException:
+            raise
         except Exception as e:
-            logger.error(f"Error fetching jds: {str(e)}")
+            logger.error("Error fetching jds: %s", e)
             raise HTTPException(status_code=500, detail="Failed to fetch job descriptions")
 
     @staticmethod
     async def get_jd(jd_id: str, user_id: str):
-        logger.info(f"Fetching jd {jd_id} for user {user_id}")
+        logger.info("Fetching jd %s for user %s", jd_id, user_id)
         db = get_db()
         try:
             jd = await db.job_descriptions.find_one({"_id": ObjectId(jd_id), "user_id": user_id})
             if not jd:
                 raise HTTPException(status_code=404, detail="Job description not found")
-            return JobDescriptionModel(**jd)
+            return from_mongo(JobDescriptionModel, jd)
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error fetching jd {jd_id}: {str(e)}")
+            logger.error("Error fetching jd %s: %s", jd_id, e)
             raise HTTPException(status_code=500, detail="Failed to fetch job description")
 
     @staticmethod
     async def update_jd(jd_id: str, user_id: str, update_data: dict):
-        logger.info(f"Updating jd {jd_id} for user {user_id}")
+        logger.info("Updating jd %s for user %s", jd_id, user_id)
         db = get_db()
         
         # Remove fields that shouldn't be updated directly
@@ -61,10 +75,16 @@ class JdService:
         update_data.pop("id", None)
         update_data.pop("user_id", None)
         update_data.pop("created_at", None)
+        update_data.pop("skills", None)
         
         update_data["updated_at"] = datetime.utcnow()
         
         try:
+            if _SKILL_SOURCE_FIELDS.keys() & update_data.keys():
+                current = await db.job_descriptions.find_one(
+                    {"_id": ObjectId(jd_id), "user_id": user_id}, _SKILL_SOURCE_FIELDS)
+                if current:
+                    update_data["skills"] = skill_tagger().tag(jd_skill_text({**current, **update_data}))
             result = await db.job_descriptions.update_one(
                 {"_id": ObjectId(jd_id), "user_id": user_id},
                 {"$set": update_data}
@@ -72,13 +92,92 @@ class JdService:
             if result.matched_count == 0:
                 raise HTTPException(status_code=404, detail="Job description not found")
             
+            await data_versions.bump(user_id)
             return await JdService.get_jd(jd_id, user_id)
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error updating jd {jd_id}: {str(e)}")
+            logger.error("Error updating jd %s: %s", jd_id, e)
             raise HTTPException(status_code=500, detail="Failed to update job description")
 
+    @staticmethod
+    async def find_similar_resumes(jd_id: str, user_id: str, limit: int = None):
+        """
+        The user's resumes closest to a JD by text similarity, best first. Makes no LLM calls,
+        so it can shortlist candidates before a batch analysis.
+        """
+        logger.info("Finding resumes similar to jd %s for user %s", jd_id, user_id)
+        db = get_db()
+        jd = await db.job_descriptions.find_one(
+            {"_id": ObjectId(jd_id), "user_id": user_id}, {"title": 1, "full_description": 1})
+        if not jd:
+            raise HTTPException(status_code=404, detail="Job description not found")
+        text = jd.get("full_description") or jd.get("title", "")
+        matches = await resume_index.most_similar(user_id, text, clamp_limit(limit))
+        if not matches:
+            return {"items": []}
+
+        resumes = {
+            str(r["_id"]): r
+            async for r in db.resumes.find(
+                {"_id": {"$in": [ObjectId(resume_id) for resume_id, _ in matches]}, "user_id": user_id},
+                {"title": 1, "file_name": 1, "tags": 1, "created_at": 1})
+        }
+        items = []
+        for resume_id, similarity in matches:
+            resume = resumes.get(resume_id)
+            if resume:
+                items.append({
+                    "resume_id": resume_id,
+                    "title": resume.get("title"),
+                    "file_name": resume.get("file_name"),
+                    "tags": resume.get("tags", []),
+                    "created_at": resume.get("created_at"),
+                    "similarity": round(similarity, 4),
+                })
+        return {"items": items}
+
+    @staticmethod
+    async def find_skill_matches(jd_id: str, user_id: str, limit: int = None):
+        """
+        The user's resumes ranked by how many of the JD's skills they mention, using only the
+        stored skill tags (no LLM calls), with the matched and missing skills for each.
+        """
+        logger.info("Matching resume skills to jd %s for user %s", jd_id, user_id)
+        db = get_db()
+        jd = await db.job_descriptions.find_one(
+            {"_id": ObjectId(jd_id), "user_id": user_id}, {"skills": 1, **_SKILL_SOURCE_FIELDS})
+        if not jd:
+            raise HTTPException(status_code=404, detail="Job description not found")
+        # JDs stored before tagging have no skills field yet
+        jd_skills = jd["skills"] if "skills" in jd else skill_tagger().tag(jd_skill_text(jd))
+        if not jd_skills:
+            return {"skills": [], "items": []}
+
+        pipeline = [
+            {"$match": {"user_id": user_id, "skills": {"$in": jd_skills}}},
+            {"$project": {"title": 1, "file_name": 1, "tags": 1, "created_at": 1,
+                          "matched_skills": {"$filter": {"input": "$skills", "as": "skill",
+                                                         "cond": {"$in": ["$$skill", jd_skills]}}}}},
+            {"$addFields": {"match_count": {"$size": "$matched_skills"}}},
+            {"$sort": {"match_count": -1, "created_at": -1, "_id": -1}},
+            {"$limit": clamp_limit(limit)},
+        ]
+        items = []
+        async for resume in db.resumes.aggregate(pipeline):
+            matched = resume["matched_skills"]
+            items.append({
+                "resume_id": str(resume["_id"]),
+                "title": resume.get("title"),
+                "file_name": resume.get("file_name"),
+                "tags": resume.get("tags", []),
+                "created_at": resume.get("created_at"),
+                "matched_skills": matched,
+                "missing_skills": [skill for skill in jd_skills if skill not in matched],
+                "coverage": round(len(matched) / len(jd_skills), 4),
+            })
+        return {"skills": jd_skills, "items": items}
+
     @staticmethod
     async def parse_jd_from_text(text: str) -> dict:
         """Parse structured metadata from a raw job description text using LLM."""
@@ -109,7 +208,7 @@ class JdService:
             parsed_data["full_description"] = text
             return parsed_data
         except Exception as e:
-            logger.error(f"Error parsing JD text with LLM: {str(e)}")
+            logger.error("Error parsing JD text with LLM: %s", e)
             # Fallback if LLM fails, just return the raw text
             return {
                 "title": "Parsed Job Description",
@@ -123,18 +222,20 @@ class JdService:
 
     @staticmethod
     async def delete_jd(jd_id: str, user_id: str):
-        logger.info(f"Deleting jd {jd_id} for user {user_id}")
+        logger.info("Deleting jd %s for user %s", jd_id, user_id)
         db = get_db()
         try:
             result = await db.job_descriptions.delete_one({"_id": ObjectId(jd_id), "user_id": user_id})
             if result.deleted_count == 0:
                 raise HTTPException(status_code=404, detail="Job description not found")
             
+            await data_versions.bump(user_id)
+            await leaderboard.drop(jd_id)
             # Also optionally delete related employer analyses, or mark them orphaned. 
             # We'll just leave them for now to preserve history.
             return True
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error deleting jd {jd_id}: {str(e)}")
+            logger.error("Error deleting jd %s: %s", jd_id, e)
             raise HTTPException(status_code=500, detail="Failed to delete job description")
@@ -0,0 +1,84 @@
+"""
+Content-addressed storage for job description texts referenced from ``history``.
+
+Each distinct JD text is stored once in ``jd_texts`` under its SHA-256. History records keep
+the hash plus a short preview, so listing history never reads the full text. Records
+written before this change can be migrated with:
+
+    python -m services.jd_text_service backfill
+"""
+import argparse
+import asyncio
+import hashlib
+import logging
+from datetime import datetime
+
+from pymongo import UpdateOne
+
+from db import get_db
+
+logger = logging.getLogger(__name__)
+
+PREVIEW_LENGTH = 100
+
+
+def jd_preview(text: str) -> str:
+    return text[:PREVIEW_LENGTH] + "..." if len(text) > PREVIEW_LENGTH else text
+
+
+def candidates_summary(batch_results: list) -> list[dict]:
+    """The per-candidate (filename, score) list shown in employer history."""
+    summary = []
+    for candidate in batch_results:
+        # Check if 'analysis' exists and is a dictionary before accessing 'JD-Match'
+        analysis = candidate.get("analysis", {})
+        score = analysis.get("JD-Match") if isinstance(analysis, dict) else None
+        summary.append({"cv_filename": candidate.get("cv_filename"), "score": score})
+    return summary
+
+
+class JdTextService:
+    async def store(self, text: str) -> dict:
+        """Stores ``text`` if it is new and returns the fields a history record keeps."""
+        text_hash = hashlib.sha256(text.encode()).hexdigest()
+        await get_db().jd_texts.update_one(
+            {"_id": text_hash},
+            {"$setOnInsert": {"text": text, "length": len(text), "created_at": datetime.utcnow()}},
+            upsert=True,
+        )
+        return {"jd_text_hash": text_hash, "jd_preview": jd_preview(text)}
+
+    async def backfill(self, batch_size: int = 500) -> int:
+        """Moves inline ``jd_text`` out of history records. Returns the number migrated."""
+        db = get_db()
+        migrated, operations = 0, []
+        cursor = db.history.find({"jd_text": {"$exists": True}}, {"jd_text": 1, "batch_results": 1})
+        async for record in cursor:
+            fields = await self.store(record.get("jd_text") or "")
+            if "batch_results" in record:
+                fields["candidates"] = candidates_summary(record["batch_results"])
+                fields["candidate_count"] = len(record["batch_results"])
+            operations.append(UpdateOne({"_id": record["_id"]},
+                                        {"$set": fields, "$unset": {"jd_text": ""}}))
+            if len(operations) >= batch_size:
+                migrated += (await db.history.bulk_write(operations, ordered=False)).modified_count
+                operations = []
+        if operations:
+            migrated += (await db.history.bulk_write(operations, ordered=False)).modified_count
+        logger.info("Migrated %s history records to jd_texts", migrated)
+        return migrated
+
+
+jd_text_service = JdTextService()
+
+
+async def _main():
+    parser = argparse.ArgumentParser(description="Manage deduplicated JD texts.")
+    parser.add_argument("command", choices=["backfill"])
+    parser.parse_args()
+    print(f"{await jd_text_service.backfill()} history record(s) migrated")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    asyncio.run(_main())
@@ -0,0 +1,145 @@
+import logging
+from typing import Callable, Optional
+
+from db import get_db
+
+logger = logging.getLogger(__name__)
+
+# Leaderboards are rebuilt from Mongo after this long, which bounds any drift
+LEADERBOARD_TTL_SECONDS = 7 * 24 * 3600
+
+
+class LeaderboardService:
+    """
+    Per-JD candidate leaderboard in Redis: a sorted set of employer analysis ids scored by
+    ``ats_score``.
+
+    Redis orders equal scores by member, and ZREVRANGE returns them in descending order,
+    so the leaderboard order is (ats_score desc, _id desc), the same as HIGHEST_SCORE_FIRST.
+    A leaderboard only counts as present while its ``:built`` marker exists. Upserts always
+    ZADD, and a missing marker makes the next read replace the set with one rebuilt from
+    Mongo, dropping any stale members.
+
+    Every method returns None when Redis is unavailable, and callers fall back to Mongo.
+    """
+
+    KEY_PREFIX = "leaderboard:"
+
+    def _redis(self):
+        from helpers import get_async_redis
+        return get_async_redis()
+
+    def _key(self, jd_id: str) -> str:
+        return self.KEY_PREFIX + jd_id
+
+    async def _rebuild(self, jd_id: str):
+        key = self._key(jd_id)
+        scores = {
+            str(a["_id"]): a.get("ats_score", 0)
+            async for a in get_db().employer_analyses.find({"jd_id": jd_id}, {"ats_score": 1})
+        }
+        pipe = self._redis().pipeline()
+        pipe.delete(key)
+        if scores:
+            pipe.zadd(key, scores)
+            pipe.expire(key, LEADERBOARD_TTL_SECONDS)
+        pipe.set(key + ":built", 1, ex=LEADERBOARD_TTL_SECONDS)
+        await pipe.execute()
+        logger.info("Rebuilt leaderboard for jd %s with %s candidates", jd_id, len(scores))
+
+    async def _read(self, jd_id: str, queue_reads: Callable) -> list:
+        """
+        Runs the reads ``queue_reads(pipe, key)`` adds to a pipeline, in one round trip with
+        the ``:built`` check. A missing leaderboard is rebuilt and the reads are repeated.
+        """
+        key = self._key(jd_id)
+        pipe = self._redis().pipeline(transaction=False)
+        pipe.exists(key + ":built")
+        queue_reads(pipe, key)
+        built, *results = await pipe.execute()
+        if not built:
+            await self._rebuild(jd_id)
+            pipe = self._redis().pipeline(transaction=False)
+            queue_reads(pipe, key)
+            results = await pipe.execute()
+        return results
+
+    async def record(self, jd_id: str, scores: dict[str, int]):
+        """Adds or rescores analyses, keyed by analysis id."""
+        if not scores:
+            return
+        key = self._key(jd_id)
+        try:
+            pipe = self._redis().pipeline()
+            pipe.zadd(key, scores)
+            pipe.expire(key, LEADERBOARD_TTL_SECONDS)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning("Failed to update leaderboard for jd %s: %s", jd_id, e)
+
+    async def drop(self, *jd_ids: str):
+        """Forgets leaderboards whose analyses were deleted; they rebuild on the next read."""
+        if not jd_ids:
+            return
+        try:
+            keys = [self._key(jd_id) for jd_id in jd_ids]
+            await self._redis().delete(*keys, *[key + ":built" for key in keys])
+        except Exception as e:
+            logger.warning("Failed to drop leaderboards %s: %s", jd_ids, e)
+
+    async def page(self, jd_id: str, start: int, count: int,
+                   min_score: Optional[int] = None,
+                   max_score: Optional[int] = None) -> Optional[list[tuple[str, float]]]:
+        """
+        Up to ``count`` (analysis_id, score) pairs starting at position ``start`` of the
+        ``[min_score, max_score]`` window, best first.
+        """
+        try:
+            # Same order as ZREVRANGE: score desc, then member desc
+            entries, = await self._read(jd_id, lambda pipe, key: pipe.zrevrangebyscore(
+                key, max_score if max_score is not None else "+inf",
+                min_score if min_score is not None else "-inf",
+                start=start, num=count, withscores=True))
+            return [(member.decode() if isinstance(member, bytes) else member, score)
+                    for member, score in entries]
+        except Exception as e:
+            logger.warning("Leaderboard page failed for jd %s: %s", jd_id, e)
+            return None
+
+    async def position(self, jd_id: str, analysis_id: str,
+                       max_score: Optional[int] = None) -> Optional[int]:
+        """
+        Zero-based position of an analysis within the window topped by ``max_score``, or -1
+        if it isn't on the leaderboard.
+        """
+        def queue_reads(pipe, key):
+            pipe.zrevrank(key, analysis_id)
+            if max_score is not None:
+                pipe.zcount(key, f"({max_score}", "+inf")
+
+        try:
+            rank, *above = await self._read(jd_id, queue_reads)
+            if rank is None:
+                return -1
+            return rank - (above[0] if above else 0)
+        except Exception as e:
+            logger.warning("Leaderboard rank lookup failed for jd %s: %s", jd_id, e)
+            return None
+
+    async def rank(self, jd_id: str, analysis_id: str) -> Optional[dict]:
+        """One-based rank of a candidate among all candidates for the JD."""
+        def queue_reads(pipe, key):
+            pipe.zrevrank(key, analysis_id)
+            pipe.zcard(key)
+
+        try:
+            rank, total = await self._read(jd_id, queue_reads)
+        except Exception as e:
+            logger.warning("Leaderboard rank lookup failed for jd %s: %s", jd_id, e)
+            return None
+        if rank is None:
+            return None
+        return {"rank": rank + 1, "total": total}
+
+
+leaderboard = LeaderboardService()
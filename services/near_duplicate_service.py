@@ -0,0 +1,121 @@
+"""
+Near-duplicate resume detection with MinHash and LSH, per owner.
+
+Every resume is stored with its MinHash signature (``minhash``, 128 uint32 as bytes) and
+its LSH band keys (``lsh_bands``, 16 bands of 8 rows). The ``user_id_lsh_bands`` multikey
+index on those keys is the LSH index: finding candidates for a new resume is one indexed
+``$in`` lookup within the owner's resumes, shared by every worker. Candidates are then
+confirmed by comparing signatures.
+
+With 16 bands of 8 rows, resumes at 0.9 Jaccard similarity become candidates with
+probability above 0.9999, and at 0.5 only about 6% of the time.
+
+A resume found to be a near-duplicate records the original (``duplicate_of``, always the
+first copy, never another duplicate) and the estimated similarity. Batch analysis can then
+reuse the original's analysis instead of calling the LLM (see employer_analysis_service.py).
+
+    python -m services.near_duplicate_service backfill   # sign resumes stored before this
+"""
+import argparse
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+from bson import Binary
+
+from config import NEAR_DUPLICATE_THRESHOLD
+from db import get_db
+from text_features import lsh_bands, minhash, signature_similarity
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 128
+LSH_BANDS = 16
+# Candidates confirmed per new resume; bounds the work for owners with many copies of one CV
+MAX_CANDIDATES = 50
+
+
+@dataclass
+class Fingerprint:
+    signature: Optional[np.ndarray]
+    duplicate_of: Optional[str] = None
+    similarity: Optional[float] = None
+
+    def document_fields(self) -> dict:
+        """The fields to store on the resume document."""
+        if self.signature is None:
+            return {}
+        return {"minhash": Binary(self.signature.tobytes()),
+                "lsh_bands": lsh_bands(self.signature, LSH_BANDS)}
+
+
+class NearDuplicateService:
+    def __init__(self, threshold: float = NEAR_DUPLICATE_THRESHOLD):
+        self.threshold = threshold
+
+    async def fingerprint(self, user_id: str, resume_text: str,
+                          exclude_id: Optional[str] = None) -> Fingerprint:
+        """Signs a resume and looks for an earlier near-duplicate among the owner's resumes."""
+        signature = await asyncio.to_thread(minhash, resume_text or "", NUM_PERM)
+        fingerprint = Fingerprint(signature)
+        if signature is None:
+            return fingerprint
+
+        query = {"user_id": user_id, "lsh_bands": {"$in": lsh_bands(signature, LSH_BANDS)}}
+        best = None
+        # Oldest first, so originals are checked before the copies made of them
+        async for candidate in get_db().resumes.find(
+                query, {"minhash": 1, "duplicate_of": 1}).sort("created_at", 1).limit(MAX_CANDIDATES):
+            if str(candidate["_id"]) == exclude_id or not candidate.get("minhash"):
+                continue
+            similarity = signature_similarity(
+                signature, np.frombuffer(candidate["minhash"], dtype=np.uint32))
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (candidate, similarity)
+
+        if best is not None:
+            candidate, similarity = best
+            fingerprint.duplicate_of = str(candidate.get("duplicate_of") or candidate["_id"])
+            fingerprint.similarity = round(similarity, 4)
+            logger.info("Resume for user %s is a near-duplicate of %s (%.2f)",
+                        user_id, fingerprint.duplicate_of, similarity)
+        return fingerprint
+
+    async def backfill(self, batch_size: int = 200) -> int:
+        """Signs stored resumes that have no signature yet, oldest first. Returns how many."""
+        db = get_db()
+        signed = 0
+        while True:
+            batch = await db.resumes.find(
+                {"lsh_bands": {"$exists": False}},
+                {"user_id": 1, "resume_text": 1}).sort("created_at", 1).limit(batch_size).to_list(None)
+            if not batch:
+                return signed
+            for doc in batch:
+                resume_id = str(doc["_id"])
+                fingerprint = await self.fingerprint(str(doc["user_id"]), doc.get("resume_text", ""),
+                                                     exclude_id=resume_id)
+                update = fingerprint.document_fields() or {"lsh_bands": []}
+                if fingerprint.duplicate_of:
+                    update.update(duplicate_of=fingerprint.duplicate_of,
+                                  duplicate_similarity=fingerprint.similarity)
+                await db.resumes.update_one({"_id": doc["_id"]}, {"$set": update})
+                signed += 1
+            logger.info("Signed %s resumes", signed)
+
+
+near_duplicates = NearDuplicateService()
+
+
+async def _main():
+    parser = argparse.ArgumentParser(description="Near-duplicate resume detection.")
+    parser.add_argument("command", choices=["backfill"])
+    parser.parse_args()
+    print(f"Signed {await near_duplicates.backfill()} resumes")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    asyncio.run(_main())
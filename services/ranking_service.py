@@ -1,36 +1,115 @@
 import logging
+from typing import Optional
+
 from bson import ObjectId
 from fastapi import HTTPException
 from db import get_db
-from models import EmployerAnalysisModel
+from models import EmployerAnalysisModel, from_mongo_many
+from pagination import (HIGHEST_SCORE_FIRST, clamp_limit, decode_cursor,
+                        encode_cursor, paginate)
+from services.leaderboard_service import leaderboard
 
 logger = logging.getLogger(__name__)
 
 class RankingService:
     @staticmethod
-    async def get_candidates_for_jd(jd_id: str, user_id: str):
-        logger.info(f"Fetching ranked candidates for jd {jd_id} (user: {user_id})")
+    def _score_filter(min_score: Optional[int], max_score: Optional[int]) -> dict:
+        score_range = {}
+        if min_score is not None:
+            score_range["$gte"] = min_score
+        if max_score is not None:
+            score_range["$lte"] = max_score
+        return {"ats_score": score_range} if score_range else {}
+
+    @staticmethod
+    async def _page_from_leaderboard(db, jd_id: str, user_id: str, cursor: Optional[str], limit: int,
+                                     min_score: Optional[int], max_score: Optional[int]):
+        """
+        One page of analyses ordered by the Redis leaderboard, hydrating only that page from
+        Mongo. Returns None when the leaderboard can't serve the request.
+        """
+        start = 0
+        if cursor:
+            _, last_id = decode_cursor(cursor, len(HIGHEST_SCORE_FIRST))
+            position = await leaderboard.position(jd_id, str(last_id), max_score)
+            if position is None or position < 0:
+                return None
+            start = position + 1
+
+        entries = await leaderboard.page(jd_id, start, limit + 1, min_score, max_score)
+        if entries is None:
+            return None
+        has_more = len(entries) > limit
+        ids = [ObjectId(analysis_id) for analysis_id, _ in entries[:limit]]
+
+        docs = {a["_id"]: a async for a in db.employer_analyses.find(
+            {"_id": {"$in": ids}, "jd_id": jd_id, "user_id": user_id})}
+        analyses = [docs[i] for i in ids if i in docs]
+
+        next_cursor = None
+        if has_more and analyses:
+            last = analyses[-1]
+            next_cursor = encode_cursor([last.get("ats_score"), last["_id"]])
+        return analyses, next_cursor
+
+    @staticmethod
+    async def get_candidates_for_jd(jd_id: str, user_id: str, cursor: str = None, limit: int = None,
+                                    min_score: int = None, max_score: int = None):
+        logger.info("Fetching ranked candidates for jd %s (user: %s)", jd_id, user_id)
         db = get_db()
-        
+
         try:
-            # Fetch all analyses for this JD and sort by ATS score descending
-            cursor = db.employer_analyses.find({
-                "jd_id": jd_id, 
-                "user_id": user_id
-            }).sort("ats_score", -1)
-            
-            analyses = await cursor.to_list(length=1000)
-            
+            # Fetch one page of analyses for this JD, sorted by ATS score descending.
+            # The leaderboard and Mongo paths produce the same order and cursors.
+            page = await RankingService._page_from_leaderboard(
+                db, jd_id, user_id, cursor, clamp_limit(limit), min_score, max_score)
+            if page is None:
+                page = await paginate(db.employer_analyses, {
+                    "jd_id": jd_id,
+                    "user_id": user_id,
+                    **RankingService._score_filter(min_score, max_score)
+                }, HIGHEST_SCORE_FIRST, cursor, limit)
+            analyses, next_cursor = page
+
             # Fetch the actual JD to include in response
             jd = await db.job_descriptions.find_one({"_id": ObjectId(jd_id)})
-            
+
             return {
                 "job_description": {
                     "id": str(jd["_id"]),
                     "title": jd.get("title", "Unknown Role")
                 } if jd else None,
-                "candidates": [EmployerAnalysisModel(**a) for a in analyses]
+                "candidates": from_mongo_many(EmployerAnalysisModel, analyses),
+                "next_cursor": next_cursor
             }
+        except HTTPException:
+            raise
         except Exception as e:
-            logger.error(f"Error fetching candidates for jd {jd_id}: {str(e)}")
+            logger.error("Error fetching candidates for jd %s: %s", jd_id, e)
             raise HTTPException(status_code=500, detail="Failed to fetch candidate rankings")
+
+    @staticmethod
+    async def get_candidate_rank(jd_id: str, analysis_id: str, user_id: str):
+        logger.info("Fetching rank of analysis %s for jd %s (user: %s)", analysis_id, jd_id, user_id)
+        db = get_db()
+        try:
+            analysis = await db.employer_analyses.find_one(
+                {"_id": ObjectId(analysis_id), "jd_id": jd_id, "user_id": user_id}, {"ats_score": 1})
+            if not analysis:
+                raise HTTPException(status_code=404, detail="Analysis not found")
+
+            result = await leaderboard.rank(jd_id, analysis_id)
+            if result is None:
+                # Same ordering as the leaderboard: higher score first, then higher _id
+                ahead = await db.employer_analyses.count_documents({"jd_id": jd_id, "$or": [
+                    {"ats_score": {"$gt": analysis["ats_score"]}},
+                    {"ats_score": analysis["ats_score"], "_id": {"$gt": analysis["_id"]}},
+                ]})
+                total = await db.employer_analyses.count_documents({"jd_id": jd_id})
+                result = {"rank": ahead + 1, "total": total}
+            return {"analysis_id": analysis_id, "ats_score": analysis["ats_score"], **result}
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error("Error fetching rank of analysis %s: %s", analysis_id, e)
+            raise HTTPException(status_code=500, detail="Failed to fetch candidate rank")
@@ -0,0 +1,279 @@
+"""
+In-process similarity index over resume text, used to shortlist candidates for a JD before
+any LLM call.
+
+Vectors come from ``text_features.embed``. Each owner's resumes are searched by brute force
+(one matrix-vector product), which for thousands of resumes takes well under a millisecond.
+
+Storage has two parts:
+
+- A snapshot on disk, written by ``python -m services.resume_index_service build``. It holds
+  float32 vectors, resume ids and owners sorted by owner, in generation directories under
+  ``RESUME_INDEX_DIR`` with a ``CURRENT`` pointer that is replaced atomically. Workers
+  memory-map it read-only, so every worker on a host shares one copy in the page cache, and
+  an owner's rows are a contiguous, zero-copy slice.
+- Rows added since the snapshot, kept in memory per owner.
+
+``create_resume`` and ``delete_resume`` update the worker that served them directly. Other
+workers notice through the owner's data version (see data_version_service.py): when it has
+moved since their last query, they diff the owner's resume ids against Mongo, embed the new
+resumes and drop the deleted ones. The snapshot is never required; without one, each owner
+is indexed from Mongo on first use.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import shutil
+import time
+from typing import Optional
+
+import numpy as np
+from bson import ObjectId
+
+from config import RESUME_INDEX_DIM, RESUME_INDEX_DIR
+from db import get_db
+from services.data_version_service import data_versions
+from text_features import embed
+
+logger = logging.getLogger(__name__)
+
+_ID_DTYPE = "U24"
+
+
+class _OwnerRows:
+    """One owner's vectors: a slice of the snapshot, plus rows added since."""
+
+    def __init__(self, ids: np.ndarray, vectors: np.ndarray):
+        self.ids = ids
+        self.vectors = vectors
+        self.added_ids: list[str] = []
+        self.added = np.empty((0, vectors.shape[1]), dtype=np.float32)
+        self.removed: set[str] = set()
+        self.version: Optional[int] = None
+        self._positions: Optional[dict[str, int]] = None
+        self._removed_positions: Optional[np.ndarray] = None
+
+    def positions(self) -> dict[str, int]:
+        """Row number of every resume id ever indexed, built on first use."""
+        if self._positions is None:
+            self._positions = {resume_id: i for i, resume_id in enumerate(self.ids.tolist())}
+            offset = len(self.ids)
+            self._positions.update((resume_id, offset + i) for i, resume_id in enumerate(self.added_ids))
+        return self._positions
+
+    def live_ids(self) -> set[str]:
+        return self.positions().keys() - self.removed
+
+    def add(self, resume_id: str, vector: np.ndarray):
+        positions = self.positions()
+        if resume_id in positions:
+            # Already indexed (e.g. deleted, then seen again by a sync): keep the old row
+            if resume_id in self.removed:
+                self.removed.discard(resume_id)
+                self._removed_positions = None
+            return
+        count = len(self.added_ids)
+        if count == len(self.added):
+            grown = np.empty((max(16, count * 2), self.added.shape[1]), dtype=np.float32)
+            grown[:count] = self.added
+            self.added = grown
+        self.added[count] = vector
+        self.added_ids.append(resume_id)
+        positions[resume_id] = len(self.ids) + count
+
+    def remove_all(self, resume_ids):
+        positions = self.positions()
+        removed = {resume_id for resume_id in resume_ids if resume_id in positions} - self.removed
+        if removed:
+            self.removed |= removed
+            self._removed_positions = None
+
+    def search(self, query: np.ndarray, limit: int) -> list[tuple[str, float]]:
+        count, offset = len(self.added_ids), len(self.ids)
+        scores = self.vectors @ query
+        if count:
+            scores = np.concatenate([scores, self.added[:count] @ query])
+        if self.removed:
+            if self._removed_positions is None:
+                positions = self.positions()
+                self._removed_positions = np.fromiter(
+                    (positions[resume_id] for resume_id in self.removed), dtype=np.int64)
+            scores[self._removed_positions] = -np.inf
+        limit = min(limit, len(scores) - len(self.removed))
+        if limit <= 0:
+            return []
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(str(self.ids[i]) if i < offset else self.added_ids[i - offset], float(scores[i]))
+                for i in top]
+
+
+class ResumeIndexService:
+    def __init__(self, directory: str = RESUME_INDEX_DIR, dim: int = RESUME_INDEX_DIM):
+        if dim & (dim - 1):
+            raise ValueError("RESUME_INDEX_DIM must be a power of two")
+        self.directory = directory
+        self.dim = dim
+        self._owners: Optional[dict[str, _OwnerRows]] = None
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    # -- Snapshot ---------------------------------------------------------------------------
+
+    def _load_snapshot(self) -> dict[str, _OwnerRows]:
+        owners = {}
+        try:
+            with open(os.path.join(self.directory, "CURRENT")) as f:
+                generation = os.path.join(self.directory, f.read().strip())
+        except FileNotFoundError:
+            logger.info("No resume index snapshot in %s; owners are indexed on first use", self.directory)
+            return owners
+        try:
+            vectors = np.load(os.path.join(generation, "vectors.npy"), mmap_mode="r")
+            ids = np.load(os.path.join(generation, "ids.npy"))
+            owner_names = np.load(os.path.join(generation, "owners.npy"))
+            offsets = np.load(os.path.join(generation, "offsets.npy"))
+        except (OSError, ValueError) as e:
+            logger.error("Could not load resume index snapshot %s: %s", generation, e)
+            return owners
+        if vectors.shape[1] != self.dim:
+            logger.warning("Ignoring resume index snapshot with dimension %s (configured %s)",
+                           vectors.shape[1], self.dim)
+            return owners
+        for owner, start, end in zip(owner_names.tolist(), offsets[:-1], offsets[1:]):
+            owners[owner] = _OwnerRows(ids[start:end], vectors[start:end])
+        logger.info("Loaded resume index snapshot %s: %s resumes, %s owners",
+                    generation, len(ids), len(owners))
+        return owners
+
+    def _all_owners(self) -> dict[str, _OwnerRows]:
+        if self._owners is None:
+            self._owners = self._load_snapshot()
+        return self._owners
+
+    def _rows(self, owner: str) -> _OwnerRows:
+        owners = self._all_owners()
+        rows = owners.get(owner)
+        if rows is None:
+            rows = owners[owner] = _OwnerRows(np.empty(0, dtype=_ID_DTYPE),
+                                              np.empty((0, self.dim), dtype=np.float32))
+        return rows
+
+    async def build(self, batch_size: int = 500) -> str:
+        """
+        Writes a new snapshot of every resume in Mongo and points ``CURRENT`` at it. Returns
+        the generation directory. Older generations are removed.
+        """
+        db = get_db()
+        total = await db.resumes.count_documents({})
+        name = f"gen-{int(time.time())}"
+        generation = os.path.join(self.directory, name)
+        os.makedirs(generation, exist_ok=True)
+
+        vectors = np.lib.format.open_memmap(os.path.join(generation, "vectors.npy"), mode="w+",
+                                            dtype=np.float32, shape=(total, self.dim))
+        ids, owners, offsets = [], [], []
+        cursor = db.resumes.find({}, {"user_id": 1, "resume_text": 1}).sort("user_id", 1)
+        batch = []
+
+        def flush():
+            start = len(ids)
+            for i, doc in enumerate(batch):
+                vectors[start + i] = embed(doc.get("resume_text") or "", self.dim)
+                ids.append(str(doc["_id"]))
+            batch.clear()
+
+        async for doc in cursor:
+            if len(ids) + len(batch) >= total:
+                break  # Inserted after the count; picked up by the next sync instead
+            owner = str(doc["user_id"])
+            if not owners or owners[-1] != owner:
+                owners.append(owner)
+                offsets.append(len(ids) + len(batch))
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                await asyncio.to_thread(flush)
+        await asyncio.to_thread(flush)
+        offsets.append(len(ids))
+
+        vectors.flush()
+        del vectors
+        if len(ids) < total:
+            # Resumes were deleted while building: rewrite at the exact size
+            path = os.path.join(generation, "vectors.npy")
+            np.save(path + ".tmp.npy", np.load(path, mmap_mode="r")[:len(ids)])
+            os.replace(path + ".tmp.npy", path)
+        np.save(os.path.join(generation, "ids.npy"), np.array(ids, dtype=_ID_DTYPE))
+        np.save(os.path.join(generation, "owners.npy"), np.array(owners, dtype=_ID_DTYPE))
+        np.save(os.path.join(generation, "offsets.npy"), np.array(offsets, dtype=np.int64))
+
+        pointer = os.path.join(self.directory, "CURRENT")
+        with open(pointer + ".tmp", "w") as f:
+            f.write(name)
+        os.replace(pointer + ".tmp", pointer)
+        for entry in os.listdir(self.directory):
+            if entry.startswith("gen-") and entry != name:
+                shutil.rmtree(os.path.join(self.directory, entry), ignore_errors=True)
+        logger.info("Built resume index snapshot %s: %s resumes, %s owners", name, len(ids), len(owners))
+        return generation
+
+    # -- Updates ----------------------------------------------------------------------------
+
+    def add(self, owner: str, resume_id: str, resume_text: str):
+        """Indexes a resume this worker just created."""
+        try:
+            self._rows(owner).add(resume_id, embed(resume_text or "", self.dim))
+        except Exception as e:
+            logger.error("Failed to index resume %s: %s", resume_id, e)
+
+    def remove(self, owner: str, resume_id: str):
+        """Drops a resume this worker just deleted."""
+        rows = self._all_owners().get(owner)
+        if rows is not None:
+            rows.remove_all([resume_id])
+
+    async def _sync(self, owner: str) -> _OwnerRows:
+        """Brings an owner's rows in line with Mongo if their data version has moved."""
+        lock = self._locks.setdefault(owner, asyncio.Lock())
+        async with lock:
+            rows = self._rows(owner)
+            version = await data_versions.get(owner)
+            if version is not None and version == rows.version:
+                return rows
+
+            db = get_db()
+            live = {str(doc["_id"]) async for doc in db.resumes.find({"user_id": owner}, {"_id": 1})}
+            indexed = rows.live_ids()
+            rows.remove_all(indexed - live)
+            missing = [ObjectId(resume_id) for resume_id in live - indexed]
+            if missing:
+                docs = await db.resumes.find({"_id": {"$in": missing}}, {"resume_text": 1}).to_list(None)
+                vectors = await asyncio.to_thread(
+                    lambda: [embed(doc.get("resume_text") or "", self.dim) for doc in docs])
+                for doc, vector in zip(docs, vectors):
+                    rows.add(str(doc["_id"]), vector)
+                logger.info("Indexed %s resumes for owner %s", len(docs), owner)
+            rows.version = version
+            return rows
+
+    # -- Queries ----------------------------------------------------------------------------
+
+    async def most_similar(self, owner: str, text: str, limit: int = 20) -> list[tuple[str, float]]:
+        """(resume_id, cosine similarity) of the owner's ``limit`` resumes closest to ``text``."""
+        rows = await self._sync(owner)
+        return rows.search(embed(text, self.dim), limit)
+
+
+resume_index = ResumeIndexService()
+
+
+async def _main():
+    parser = argparse.ArgumentParser(description="Manage the resume similarity index snapshot.")
+    parser.add_argument("command", choices=["build"])
+    parser.parse_args()
+    print(await resume_index.build())
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    asyncio.run(_main())
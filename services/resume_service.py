@@ -5,9 +5,15 @@ from bson import ObjectId
 from datetime import datetime
 
 from db import get_db
-from models import ResumeModel
+from models import ResumeModel, ResumeSummaryModel, from_mongo, from_mongo_many
 from services.storage_service import StorageService
+from services.user_stats_service import user_stats_service
+from services.data_version_service import data_versions
+from services.near_duplicate_service import near_duplicates
+from services.resume_index_service import resume_index
 from helpers import extract_text_from_file
+from pagination import NEWEST_FIRST, paginate
+from skills import skill_tagger
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +22,7 @@ class ResumeService:
         self.storage = storage
 
     async def create_resume(self, user_id: str, file: UploadFile, title: str, tags: list[str] = None):
-        logger.info(f"Starting resume upload for user {user_id}, file: {file.filename}")
+        logger.info("Starting resume upload for user %s, file: %s", user_id, file.filename)
         if not file.filename:
             logger.error("Resume upload failed: Filename missing")
             raise HTTPException(status_code=400, detail="Filename missing")
@@ -34,10 +40,11 @@ class ResumeService:
             unique_filename = f"{uuid.uuid4().hex}.{ext}"
             
             # Save to storage
-            logger.info(f"Saving resume to storage as {unique_filename}")
+            logger.info("Saving resume to storage as %s", unique_filename)
             file_path = await self.storage.save(file.file, unique_filename)
             
             db = get_db()
+            fingerprint = await near_duplicates.fingerprint(user_id, resume_text)
             resume = ResumeModel(
                 user_id=user_id,
                 title=title,
@@ -45,87 +52,113 @@ class ResumeService:
                 file_path=file_path,
                 mime_type=file.content_type or "application/octet-stream",
                 resume_text=resume_text,
-                tags=tags or []
+                tags=tags or [],
+                skills=skill_tagger().tag(resume_text),
+                duplicate_of=fingerprint.duplicate_of,
+                duplicate_similarity=fingerprint.similarity
             )
             
             logger.info("Inserting resume record into database")
-            result = await db.resumes.insert_one(resume.model_dump(by_alias=True, exclude_none=True))
-            resume.id = str(result.inserted_id)
-            logger.info(f"Successfully created resume {resume.id} for user {user_id}")
+            document = resume.model_dump(by_alias=True, exclude_none=True)
+            document.update(fingerprint.document_fields())
+            async with user_stats_service.recording(user_id):
+                result = await db.resumes.insert_one(document)
+                resume.id = str(result.inserted_id)
+                await user_stats_service.record_resume(user_id, resume.id, resume.title, resume.created_at)
+            resume_index.add(user_id, resume.id, resume_text)
+            await data_versions.bump(user_id)
+            logger.info("Successfully created resume %s for user %s", resume.id, user_id)
             return resume
         except Exception as e:
-            logger.error(f"Error creating resume: {str(e)}")
+            logger.error("Error creating resume: %s", e)
             raise
         
-    async def get_resumes_by_user(self, user_id: str):
-        logger.info(f"Fetching resumes for user {user_id}")
+    async def get_resumes_by_user(self, user_id: str, cursor: str = None, limit: int = None,
+                                  skills: list[str] = None):
+        logger.info("Fetching resumes for user %s", user_id)
         try:
             db = get_db()
-            cursor = db.resumes.find({"user_id": user_id})
-            resumes = await cursor.to_list(length=100)
-            logger.info(f"Found {len(resumes)} resumes for user {user_id}")
-            return [ResumeModel(**r) for r in resumes]
+            query = {"user_id": user_id}
+            if skills:
+                # Resumes mentioning every requested skill
+                query["skills"] = {"$all": skill_tagger().canonical(skills)}
+            # Listings never show the extracted text, so leave it in Mongo
+            resumes, next_cursor = await paginate(
+                db.resumes, query, NEWEST_FIRST, cursor, limit,
+                projection={"resume_text": 0, "minhash": 0, "lsh_bands": 0})
+            logger.info("Found %s resumes for user %s", len(resumes), user_id)
+            return {"items": from_mongo_many(ResumeSummaryModel, resumes), "next_cursor": next_cursor}
+        except HTTPException:
+            raise
         except Exception as e:
-            logger.error(f"Error fetching resumes for user {user_id}: {str(e)}")
+            logger.error("Error fetching resumes for user %s: %s", user_id, e)
             raise
         
     async def get_resume(self, resume_id: str, user_id: str):
-        logger.info(f"Fetching resume {resume_id} for user {user_id}")
+        logger.info("Fetching resume %s for user %s", resume_id, user_id)
         db = get_db()
         resume = await db.resumes.find_one({"_id": ObjectId(resume_id), "user_id": user_id})
         if not resume:
-            logger.warning(f"Resume {resume_id} not found for user {user_id}")
+            logger.warning("Resume %s not found for user %s", resume_id, user_id)
             raise HTTPException(status_code=404, detail="Resume not found")
-        return ResumeModel(**resume)
+        return from_mongo(ResumeModel, resume)
         
     async def delete_resume(self, resume_id: str, user_id: str):
-        logger.info(f"Deleting resume {resume_id} for user {user_id}")
+        logger.info("Deleting resume %s for user %s", resume_id, user_id)
         db = get_db()
         resume = await db.resumes.find_one({"_id": ObjectId(resume_id), "user_id": user_id})
         if not resume:
-            logger.warning(f"Cannot delete: Resume {resume_id} not found for user {user_id}")
+            logger.warning("Cannot delete: Resume %s not found for user %s", resume_id, user_id)
             raise HTTPException(status_code=404, detail="Resume not found")
             
         try:
             # Delete from DB
-            await db.resumes.delete_one({"_id": ObjectId(resume_id)})
-            logger.info(f"Deleted resume {resume_id} from database")
+            async with user_stats_service.recording(user_id):
+                await db.resumes.delete_one({"_id": ObjectId(resume_id)})
+                await user_stats_service.record_resume_deleted(user_id, resume_id)
+            resume_index.remove(user_id, resume_id)
+            await data_versions.bump(user_id)
+            logger.info("Deleted resume %s from database", resume_id)
             
             # Delete from storage
             await self.storage.delete(resume["file_path"])
-            logger.info(f"Deleted resume file {resume['file_path']} from storage")
+            logger.info("Deleted resume file %s from storage", resume['file_path'])
             return True
         except Exception as e:
-            logger.error(f"Error deleting resume {resume_id}: {str(e)}")
+            logger.error("Error deleting resume %s: %s", resume_id, e)
             raise
 
     async def update_resume(self, resume_id: str, user_id: str, update_data: dict):
-        logger.info(f"Updating resume {resume_id} for user {user_id}")
+        logger.info("Updating resume %s for user %s", resume_id, user_id)
         db = get_db()
         
         allowed_fields = ["title", "tags"]
         filtered_data = {k: v for k, v in update_data.items() if k in allowed_fields}
         
         if not filtered_data:
-            logger.warning(f"No valid fields to update for resume {resume_id}")
+            logger.warning("No valid fields to update for resume %s", resume_id)
             raise HTTPException(status_code=400, detail="No valid fields to update")
             
         filtered_data["updated_at"] = datetime.utcnow()
         
         try:
-            result = await db.resumes.update_one(
-                {"_id": ObjectId(resume_id), "user_id": user_id},
-                {"$set": filtered_data}
-            )
-            
-            if result.matched_count == 0:
-                logger.warning(f"Cannot update: Resume {resume_id} not found for user {user_id}")
-                raise HTTPException(status_code=404, detail="Resume not found")
-                
-            logger.info(f"Successfully updated resume {resume_id}")
+            async with user_stats_service.recording(user_id):
+                result = await db.resumes.update_one(
+                    {"_id": ObjectId(resume_id), "user_id": user_id},
+                    {"$set": filtered_data}
+                )
+
+                if result.matched_count == 0:
+                    logger.warning("Cannot update: Resume %s not found for user %s", resume_id, user_id)
+                    raise HTTPException(status_code=404, detail="Resume not found")
+
+                if "title" in filtered_data:
+                    await user_stats_service.record_resume_title(user_id, resume_id, filtered_data["title"])
+            await data_versions.bump(user_id)
+            logger.info("Successfully updated resume %s", resume_id)
             return await self.get_resume(resume_id, user_id)
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error updating resume {resume_id}: {str(e)}")
+            logger.error("Error updating resume %s: %s", resume_id, e)
             raise
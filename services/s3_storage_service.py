@@ -1,6 +1,5 @@
 import logging
 from typing import BinaryIO
-import boto3
 from botocore.exceptions import ClientError
 from services.storage_service import StorageService
 
@@ -9,14 +8,24 @@ logger = logging.getLogger(__name__)
 class S3StorageProvider(StorageService):
     def __init__(self, bucket_name: str, access_key_id: str, secret_access_key: str, region_name: str):
         self.bucket_name = bucket_name
-        from botocore.config import Config
-        self.s3_client = boto3.client(
-            "s3",
-            aws_access_key_id=access_key_id,
-            aws_secret_access_key=secret_access_key,
-            region_name=region_name,
-            config=Config(signature_version="s3v4")
-        )
+        self._credentials = (access_key_id, secret_access_key, region_name)
+        self._s3_client = None
+
+    @property
+    def s3_client(self):
+        # boto3 is slow to import and build, so the client is created on first use
+        if self._s3_client is None:
+            import boto3
+            from botocore.config import Config
+            access_key_id, secret_access_key, region_name = self._credentials
+            self._s3_client = boto3.client(
+                "s3",
+                aws_access_key_id=access_key_id,
+                aws_secret_access_key=secret_access_key,
+                region_name=region_name,
+                config=Config(signature_version="s3v4")
+            )
+        return self._s3_client
 
     async def save(self, file_obj: BinaryIO, filename: str) -> str:
         s3_key = f"uploads/{filename}"
@@ -38,7 +47,7 @@ class S3StorageProvider(StorageService):
             )
             return s3_key
         except ClientError as exc:
-            logger.error(f"Failed to upload file to S3: {exc}")
+            logger.error("Failed to upload file to S3: %s", exc)
             raise RuntimeError(f"Failed to upload file to S3: {exc}") from exc
 
     async def get(self, file_path: str) -> BinaryIO:
@@ -46,7 +55,7 @@ class S3StorageProvider(StorageService):
             response = self.s3_client.get_object(Bucket=self.bucket_name, Key=file_path)
             return response['Body']
         except ClientError as exc:
-            logger.error(f"Failed to get file from S3: {exc}")
+            logger.error("Failed to get file from S3: %s", exc)
             raise FileNotFoundError(f"File {file_path} not found in S3.") from exc
 
     async def delete(self, file_path: str) -> bool:
@@ -54,7 +63,7 @@ class S3StorageProvider(StorageService):
             self.s3_client.delete_object(Bucket=self.bucket_name, Key=file_path)
             return True
         except ClientError as exc:
-            logger.error(f"Failed to delete file from S3: {exc}")
+            logger.error("Failed to delete file from S3: %s", exc)
             return False
 
     def get_url(self, file_path: str, expires_in: int = 3600) -> str | None:
@@ -71,5 +80,5 @@ class S3StorageProvider(StorageService):
             )
             return url
         except ClientError as exc:
-            logger.error(f"Failed to generate presigned URL: {exc}")
+            logger.error("Failed to generate presigned URL: %s", exc)
             return None
@@ -0,0 +1,195 @@
+"""
+Per-user full-text search over resumes, applications and job descriptions.
+
+Each collection has one weighted Mongo text index prefixed by ``user_id`` (see indexes.py),
+so a search is an indexed ``$text`` query within one user's documents, ranked by
+``textScore``. The weights in ``SEARCH_FIELDS`` are the field boosts. Text scores can't be
+used as keyset bounds, so pages are addressed by offset, in the same opaque cursor format
+as the list endpoints.
+
+With ``SEARCH_RESUME_BACKEND=memory``, resume searches use an in-process BM25 index per
+user (inverted_index.py) with the same boosts. It is built from Mongo on first use, and
+whenever the user's data version has moved it is diffed against the ids and ``updated_at``
+of their resumes, re-indexing only what was added or edited.
+
+Highlights are computed from the returned documents: for each matching field, a snippet
+around the first matches, with ``[start, end]`` offsets of every matched word in it.
+"""
+import asyncio
+import logging
+from typing import Optional
+
+from bson import ObjectId
+from fastapi import HTTPException
+
+from config import SEARCH_RESUME_BACKEND
+from db import get_db
+from indexes import SEARCH_FIELDS
+from inverted_index import InvertedIndex, stem
+from pagination import clamp_limit, decode_cursor, encode_cursor
+from services.data_version_service import data_versions
+from text_features import STOP_WORDS, word_spans, words
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TYPES = tuple(SEARCH_FIELDS)
+# Per-type page size when searching every type at once
+ALL_TYPES_LIMIT = 5
+# Characters of context on each side of the first match in a highlight snippet
+SNIPPET_CONTEXT = 80
+# The summary fields returned with each hit, besides the highlights
+_RESULT_FIELDS = {
+    "resumes": ("title", "file_name", "tags", "skills", "created_at"),
+    "applications": ("company", "job_title", "status", "application_date", "created_at"),
+    "job_descriptions": ("title", "department", "location", "status", "created_at"),
+}
+
+
+def _as_text(value) -> str:
+    if isinstance(value, list):
+        return ", ".join(str(item) for item in value)
+    return value if isinstance(value, str) else ""
+
+
+def highlight(fields: dict, query: str) -> list[dict]:
+    """Snippets of the fields matching any query word, most boosted field first."""
+    # Whole words with the same stem as a query word ("company" for "companies")
+    query_terms = {stem(word) for word in words(query) if word not in STOP_WORDS}
+    if not query_terms:
+        return []
+
+    def matches(text: str) -> list[list[int]]:
+        return [[start, end] for word, start, end in word_spans(text) if stem(word) in query_terms]
+
+    highlights = []
+    for field, text in fields.items():
+        text = _as_text(text)
+        found = matches(text)
+        if not found:
+            continue
+        first_start, first_end = found[0]
+        start = max(0, first_start - SNIPPET_CONTEXT)
+        end = min(len(text), first_end + SNIPPET_CONTEXT)
+        # Widen to whole words
+        while start > 0 and not text[start - 1].isspace():
+            start -= 1
+        while end < len(text) and not text[end].isspace():
+            end += 1
+        snippet = (("…" if start > 0 else "") + " ".join(text[start:end].split())
+                   + ("…" if end < len(text) else ""))
+        highlights.append({
+            "field": field,
+            "snippet": snippet,
+            "matches": matches(snippet),
+        })
+    return highlights
+
+
+class _UserResumeIndex:
+    def __init__(self):
+        self.index = InvertedIndex(SEARCH_FIELDS["resumes"])
+        self.updated_at: dict[str, object] = {}
+        self.version: Optional[int] = None
+
+
+class SearchService:
+    def __init__(self, resume_backend: str = SEARCH_RESUME_BACKEND):
+        self.resume_backend = resume_backend
+        self._resume_indexes: dict[str, _UserResumeIndex] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def search(self, user_id: str, query: str, search_type: str = "all",
+                     cursor: str = None, limit: int = None) -> dict:
+        query = (query or "").strip()
+        if not query:
+            raise HTTPException(status_code=400, detail="Search query is required")
+        if search_type == "all":
+            if cursor:
+                raise HTTPException(status_code=400, detail="Pass a type to page through results")
+            pages = await asyncio.gather(*(
+                self._search_type(user_id, query, kind, 0, min(clamp_limit(limit), ALL_TYPES_LIMIT))
+                for kind in SEARCH_TYPES))
+            return dict(zip(SEARCH_TYPES, pages))
+        if search_type not in SEARCH_FIELDS:
+            raise HTTPException(status_code=400, detail=f"type must be 'all' or one of {', '.join(SEARCH_TYPES)}")
+        offset = decode_cursor(cursor, 1)[0] if cursor else 0
+        if not isinstance(offset, int) or offset < 0:
+            raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+        return await self._search_type(user_id, query, search_type, offset, clamp_limit(limit))
+
+    async def _search_type(self, user_id: str, query: str, kind: str, offset: int, limit: int) -> dict:
+        if kind == "resumes" and self.resume_backend == "memory":
+            docs, has_more = await self._search_resumes_in_memory(user_id, query, offset, limit)
+        else:
+            docs, has_more = await self._search_mongo(user_id, query, kind, offset, limit)
+        items = []
+        for doc in docs:
+            item = {"id": str(doc["_id"]), "type": kind, "score": round(doc["score"], 4)}
+            item.update((field, doc.get(field)) for field in _RESULT_FIELDS[kind])
+            item["highlights"] = highlight({field: doc.get(field) for field in SEARCH_FIELDS[kind]}, query)
+            items.append(item)
+        return {"items": items, "next_cursor": encode_cursor([offset + limit]) if has_more else None}
+
+    async def _search_mongo(self, user_id: str, query: str, kind: str, offset: int, limit: int):
+        projection = {field: 1 for field in (*SEARCH_FIELDS[kind], *_RESULT_FIELDS[kind])}
+        projection["score"] = {"$meta": "textScore"}
+        docs = await get_db()[kind].find(
+            {"user_id": user_id, "$text": {"$search": query}}, projection
+        ).sort([("score", {"$meta": "textScore"}), ("_id", -1)]).skip(offset).limit(limit + 1).to_list(limit + 1)
+        return docs[:limit], len(docs) > limit
+
+    # -- In-process resume index ----------------------------------------------------------
+
+    async def _resume_index(self, user_id: str) -> InvertedIndex:
+        lock = self._locks.setdefault(user_id, asyncio.Lock())
+        async with lock:
+            entry = self._resume_indexes.get(user_id)
+            if entry is None:
+                entry = self._resume_indexes[user_id] = _UserResumeIndex()
+            version = await data_versions.get(user_id)
+            if version is not None and version == entry.version:
+                return entry.index
+
+            db = get_db()
+            live = {str(doc["_id"]): doc.get("updated_at")
+                    async for doc in db.resumes.find({"user_id": user_id}, {"updated_at": 1})}
+            for resume_id in entry.updated_at.keys() - live.keys():
+                entry.index.remove(resume_id)
+                del entry.updated_at[resume_id]
+            stale = [ObjectId(resume_id) for resume_id, updated_at in live.items()
+                     if resume_id not in entry.updated_at or entry.updated_at[resume_id] != updated_at]
+            if stale:
+                projection = {field: 1 for field in (*SEARCH_FIELDS["resumes"], "updated_at")}
+                async for doc in db.resumes.find({"_id": {"$in": stale}}, projection):
+                    resume_id = str(doc["_id"])
+                    entry.index.add(resume_id, {field: _as_text(doc.get(field))
+                                                for field in SEARCH_FIELDS["resumes"]})
+                    entry.updated_at[resume_id] = doc.get("updated_at")
+                logger.info("Indexed %s resumes for search for user %s", len(stale), user_id)
+            if entry.index.tombstones > max(1000, len(entry.index)):
+                entry.index.compact()
+            entry.version = version
+            return entry.index
+
+    async def _search_resumes_in_memory(self, user_id: str, query: str, offset: int, limit: int):
+        index = await self._resume_index(user_id)
+        hits, total = index.search(query, limit, offset)
+        if not hits:
+            return [], False
+        projection = {field: 1 for field in (*SEARCH_FIELDS["resumes"], *_RESULT_FIELDS["resumes"])}
+        docs = {
+            str(doc["_id"]): doc
+            async for doc in get_db().resumes.find(
+                {"_id": {"$in": [ObjectId(resume_id) for resume_id, _ in hits]}, "user_id": user_id},
+                projection)
+        }
+        results = []
+        for resume_id, score in hits:
+            doc = docs.get(resume_id)
+            if doc is not None:
+                doc["score"] = score
+                results.append(doc)
+        return results, offset + limit < total
+
+
+search_service = SearchService()
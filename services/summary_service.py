@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from bson import ObjectId
 from fastapi import HTTPException
@@ -7,6 +8,8 @@ from services.resume_service import ResumeService
 from services.storage_service import LocalStorageProvider
 from models import EmployerAnalysisModel
 from datetime import datetime
+from config import SUMMARY_PREFETCH_CONCURRENCY, SUMMARY_PREFETCH_TOP_K
+from pagination import HIGHEST_SCORE_FIRST
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +17,15 @@ class SummaryService:
     def __init__(self):
         self.storage = LocalStorageProvider()
         self.resume_service = ResumeService(self.storage)
+        # Summaries being generated right now, interactively or by a prefetch, so a second
+        # request for the same candidate waits for that call instead of starting another
+        self._inflight: dict[str, asyncio.Task] = {}
+        # Prefetching only calls the LLM while no interactive summary request is running
+        self._interactive_requests = 0
+        self._interactive_idle = asyncio.Event()
+        self._interactive_idle.set()
+        self._prefetch_slots = asyncio.Semaphore(SUMMARY_PREFETCH_CONCURRENCY)
+        self._prefetch_tasks: set[asyncio.Task] = set()
         
     async def generate_resume_summary(self, candidate_id: str, user_id: str):
         """
@@ -21,7 +33,7 @@ class SummaryService:
         candidate_id here refers to the EmployerAnalysis ID.
         """
         db = get_db()
-        logger.info(f"Generating resume summary for candidate analysis {candidate_id}")
+        logger.info("Generating resume summary for candidate analysis %s", candidate_id)
         
         analysis = await db.employer_analyses.find_one({
             "_id": ObjectId(candidate_id),
@@ -35,11 +47,44 @@ class SummaryService:
         if analysis.get("resume_summary"):
             logger.info("Returning cached resume summary")
             return {"summary": analysis["resume_summary"]}
-            
-        # Need to generate it
-        resume_id = str(analysis["resume_id"])
-        resume = await self.resume_service.get_resume(resume_id, user_id)
-        
+
+        self._interactive_requests += 1
+        self._interactive_idle.clear()
+        try:
+            inflight = self._inflight.get(candidate_id)
+            if inflight is not None:
+                logger.info("Waiting for in-flight summary for candidate analysis %s", candidate_id)
+                try:
+                    return {"summary": await asyncio.shield(inflight)}
+                except Exception:
+                    pass  # That generation failed; try again here
+
+            # Need to generate it
+            resume_id = str(analysis["resume_id"])
+            resume = await self.resume_service.get_resume(resume_id, user_id)
+            try:
+                # Shielded: a disconnecting client mustn't cancel a call others may be waiting on
+                summary = await asyncio.shield(self._start_summary(candidate_id, resume.resume_text))
+                return {"summary": summary}
+            except Exception as e:
+                logger.error("Error generating summary: %s", e)
+                raise HTTPException(status_code=500, detail="Failed to generate AI summary")
+        finally:
+            self._interactive_requests -= 1
+            if not self._interactive_requests:
+                self._interactive_idle.set()
+
+    def _start_summary(self, candidate_id: str, resume_text: str) -> asyncio.Task:
+        """The in-flight generation for a candidate, starting one if there is none."""
+        task = self._inflight.get(candidate_id)
+        if task is None:
+            task = asyncio.create_task(self._summarize(candidate_id, resume_text))
+            self._inflight[candidate_id] = task
+            task.add_done_callback(lambda done: self._inflight.pop(candidate_id, None)
+                                   if self._inflight.get(candidate_id) is done else None)
+        return task
+
+    async def _summarize(self, candidate_id: str, resume_text: str) -> str:
         prompt = f"""
 You are an expert technical recruiter. Create a concise, professional summary of the following candidate based on their resume.
 The summary should allow a hiring manager to understand the candidate's profile in just a few seconds.
@@ -54,23 +99,71 @@ Focus on:
 Format the output as a single, well-structured paragraph, around 3-4 sentences. Do NOT use bullet points or markdown formatting. Keep it strictly textual.
 
 Resume Text:
-{resume.resume_text}
+{resume_text}
 """
+        summary = await get_llm_response(prompt)
+        # Clean up potential whitespace
+        summary = summary.strip()
+        
+        # Cache the summary
+        await get_db().employer_analyses.update_one(
+            {"_id": ObjectId(candidate_id)},
+            {"$set": {
+                "resume_summary": summary,
+                "updated_at": datetime.utcnow()
+            }}
+        )
+        return summary
+
+    def schedule_prefetch(self, jd_id: str, user_id: str, top_k: int = SUMMARY_PREFETCH_TOP_K):
+        """Starts pre-generating summaries for the top candidates of a JD in the background."""
+        if top_k <= 0:
+            return
+        task = asyncio.create_task(self.prefetch_top_candidates(jd_id, user_id, top_k))
+        self._prefetch_tasks.add(task)
+        task.add_done_callback(self._prefetch_tasks.discard)
+
+    async def drain(self, timeout: float):
+        """Waits up to ``timeout`` seconds for scheduled prefetches; called on shutdown."""
+        if self._prefetch_tasks:
+            await asyncio.wait(self._prefetch_tasks, timeout=timeout)
+
+    async def prefetch_top_candidates(self, jd_id: str, user_id: str, top_k: int = SUMMARY_PREFETCH_TOP_K):
+        db = get_db()
         try:
-            summary = await get_llm_response(prompt)
-            # Clean up potential whitespace
-            summary = summary.strip()
-            
-            # Cache the summary
-            await db.employer_analyses.update_one(
-                {"_id": ObjectId(candidate_id)},
-                {"$set": {
-                    "resume_summary": summary,
-                    "updated_at": datetime.utcnow()
-                }}
-            )
-            
-            return {"summary": summary}
+            top = await db.employer_analyses.find(
+                {"jd_id": jd_id, "user_id": user_id},
+                {"resume_id": 1, "resume_summary": 1}
+            ).sort(HIGHEST_SCORE_FIRST).limit(top_k).to_list(length=top_k)
+            missing = [a for a in top if not a.get("resume_summary") and str(a["_id"]) not in self._inflight]
+            if not missing:
+                return
+
+            resumes = {
+                str(r["_id"]): r.get("resume_text", "")
+                async for r in db.resumes.find(
+                    {"_id": {"$in": [ObjectId(a["resume_id"]) for a in missing]}, "user_id": user_id},
+                    {"resume_text": 1})
+            }
+            logger.info("Prefetching %s candidate summaries for jd %s", len(missing), jd_id)
+            await asyncio.gather(*(
+                self._prefetch_one(str(a["_id"]), resumes[str(a["resume_id"])])
+                for a in missing if str(a["resume_id"]) in resumes
+            ))
         except Exception as e:
-            logger.error(f"Error generating summary: {str(e)}")
-            raise HTTPException(status_code=500, detail="Failed to generate AI summary")
+            logger.error("Summary prefetch failed for jd %s: %s", jd_id, e)
+
+    async def _prefetch_one(self, candidate_id: str, resume_text: str):
+        async with self._prefetch_slots:
+            await self._interactive_idle.wait()
+            if candidate_id in self._inflight:
+                return
+            try:
+                # An interactive request may have generated it while this one waited
+                stored = await get_db().employer_analyses.find_one(
+                    {"_id": ObjectId(candidate_id)}, {"resume_summary": 1})
+                if stored is None or stored.get("resume_summary"):
+                    return
+                await self._start_summary(candidate_id, resume_text)
+            except Exception as e:
+                logger.error("Error prefetching summary for candidate analysis %s: %s", candidate_id, e)
@@ -1,36 +1,41 @@
+import functools
 import json
 import logging
 from fastapi import HTTPException
 from models import TailorResumeRequest, TailorResumeResponse
 from services.prompt_builder import build_tailoring_prompt
 from helpers import get_llm_response, parse_llm_response
-from google.ai.generativelanguage_v1beta.types import content
 
 logger = logging.getLogger(__name__)
 
-tailoring_generation_config = {
-    "temperature": 0.3,
-    "top_p": 0.95,
-    "top_k": 40,
-    "max_output_tokens": 8192,
-    "response_schema": content.Schema(
-        type=content.Type.OBJECT,
-        properties={
-            "is_compatible": content.Schema(type=content.Type.BOOLEAN),
-            "compatibility_warning": content.Schema(type=content.Type.STRING),
-            "tailored_resume": content.Schema(type=content.Type.STRING),
-            "changes_summary": content.Schema(
-                type=content.Type.ARRAY,
-                items=content.Schema(type=content.Type.STRING),
-            ),
-            "keyword_additions": content.Schema(
-                type=content.Type.ARRAY,
-                items=content.Schema(type=content.Type.STRING),
-            ),
-        },
-    ),
-    "response_mime_type": "application/json",
-}
+@functools.cache
+def tailoring_generation_config() -> dict:
+    # Built on first use: importing the generativelanguage types is slow
+    from google.ai.generativelanguage_v1beta.types import content
+
+    return {
+        "temperature": 0.3,
+        "top_p": 0.95,
+        "top_k": 40,
+        "max_output_tokens": 8192,
+        "response_schema": content.Schema(
+            type=content.Type.OBJECT,
+            properties={
+                "is_compatible": content.Schema(type=content.Type.BOOLEAN),
+                "compatibility_warning": content.Schema(type=content.Type.STRING),
+                "tailored_resume": content.Schema(type=content.Type.STRING),
+                "changes_summary": content.Schema(
+                    type=content.Type.ARRAY,
+                    items=content.Schema(type=content.Type.STRING),
+                ),
+                "keyword_additions": content.Schema(
+                    type=content.Type.ARRAY,
+                    items=content.Schema(type=content.Type.STRING),
+                ),
+            },
+        ),
+        "response_mime_type": "application/json",
+    }
 
 async def process_resume_tailoring(request: TailorResumeRequest, user_id: str, resume_svc) -> TailorResumeResponse:
     if not request.resume_id or not request.job_description:
@@ -44,7 +49,7 @@ async def process_resume_tailoring(request: TailorResumeRequest, user_id: str, r
     prompt = build_tailoring_prompt(resume.resume_text, request.job_description)
     
     try:
-        llm_response_text = await get_llm_response(prompt, gen_config=tailoring_generation_config)
+        llm_response_text = await get_llm_response(prompt, gen_config=tailoring_generation_config())
         import json
         import re
         
@@ -63,5 +68,5 @@ async def process_resume_tailoring(request: TailorResumeRequest, user_id: str, r
             keyword_additions=parsed.get("keyword_additions", [])
         )
     except Exception as e:
-        logger.error(f"Error tailoring resume: {str(e)}", exc_info=True)
+        logger.error("Error tailoring resume: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to tailor resume via AI")
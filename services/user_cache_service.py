@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from bson import json_util
+
+from config import (USER_CACHE_MAX_SIZE, USER_CACHE_TTL_SECONDS,
+                    USER_CACHE_USE_REDIS)
+
+logger = logging.getLogger(__name__)
+
+
+class UserCacheService:
+    """
+    TTL-bounded LRU cache of user documents, keyed by the JWT subject (email).
+
+    The in-process tier is checked first. When enabled, a Redis tier is shared
+    across workers so a user looked up by one worker is warm for all of them.
+    The password hash is never cached.
+
+    With the Redis tier, invalidations are also published on a Redis channel that every
+    worker subscribes to (``listen``, run by the app lifespan), so a profile update evicts
+    the user from every worker's in-process tier, not just the one that handled it. A worker
+    whose subscription is down could miss an invalidation, so it skips its in-process tier
+    until resubscribed. Without it, other workers' entries only expire with their TTL.
+    """
+
+    REDIS_KEY_PREFIX = "user_cache:"
+    INVALIDATION_CHANNEL = "user_cache:invalidate"
+
+    def __init__(self, max_size: int = USER_CACHE_MAX_SIZE,
+                 ttl_seconds: int = USER_CACHE_TTL_SECONDS,
+                 use_redis: bool = USER_CACHE_USE_REDIS):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.use_redis = use_redis
+        self._entries: "OrderedDict[str, tuple[float, dict]]" = OrderedDict()
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        # None while no listener runs (no Redis tier, or a script), then whether it is subscribed
+        self._subscribed: Optional[bool] = None
+
+    def _redis(self):
+        from helpers import get_async_redis
+        return get_async_redis()
+
+    async def get(self, subject: str) -> Optional[dict]:
+        entry = self._entries.get(subject) if self._subscribed is not False else None
+        if entry is not None:
+            expires_at, user = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(subject)
+                self.hits += 1
+                return user
+            del self._entries[subject]
+
+        if self.use_redis:
+            try:
+                data = await self._redis().get(self.REDIS_KEY_PREFIX + subject)
+            except Exception as e:
+                logger.warning("User cache Redis lookup failed: %s", e)
+                data = None
+            if data:
+                user = json_util.loads(data)
+                self._store_local(subject, user)
+                self.redis_hits += 1
+                return user
+
+        self.misses += 1
+        return None
+
+    async def set(self, subject: str, user: dict):
+        user = {k: v for k, v in user.items() if k != "password"}
+        self._store_local(subject, user)
+        if self.use_redis:
+            try:
+                await self._redis().setex(self.REDIS_KEY_PREFIX + subject,
+                                          self.ttl_seconds, json_util.dumps(user))
+            except Exception as e:
+                logger.warning("User cache Redis write failed: %s", e)
+
+    async def invalidate(self, subject: str):
+        """Drops a user from every tier of every worker. Call after any write to the user document."""
+        self._entries.pop(subject, None)
+        if not self.use_redis:
+            return
+        try:
+            redis_client = self._redis()
+            await redis_client.delete(self.REDIS_KEY_PREFIX + subject)
+            await redis_client.publish(self.INVALIDATION_CHANNEL, subject)
+        except Exception as e:
+            logger.warning("User cache Redis invalidation failed: %s", e)
+
+    async def listen(self, retry_seconds: float = 5.0):
+        """Applies invalidations published by other workers until cancelled. Needs the Redis tier."""
+        while True:
+            self._subscribed = False
+            pubsub = self._redis().pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.INVALIDATION_CHANNEL)
+                # Anything invalidated while unsubscribed was missed
+                self._entries.clear()
+                self._subscribed = True
+                while True:
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        self._entries.pop(message["data"], None)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("User cache invalidation channel lost, retrying in %ss: %s", retry_seconds, e)
+            finally:
+                self._subscribed = False
+                try:
+                    await pubsub.reset()
+                except Exception:
+                    pass
+            await asyncio.sleep(retry_seconds)
+
+    def clear(self):
+        self._entries.clear()
+
+    def _store_local(self, subject: str, user: dict):
+        self._entries[subject] = (time.monotonic() + self.ttl_seconds, user)
+        self._entries.move_to_end(subject)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.redis_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "redis_enabled": self.use_redis,
+            "invalidation_subscribed": self._subscribed,
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.redis_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+user_cache = UserCacheService()
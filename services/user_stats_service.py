@@ -0,0 +1,537 @@
+"""
+Incrementally maintained job-seeker dashboard statistics.
+
+Each user has one ``user_stats`` document holding counters, score histograms, per-resume
+score sums and monthly/daily counts. Application, history and resume writes apply their
+delta to it, so rendering the dashboard is a single document fetch.
+
+The document is built from scratch on the first dashboard read. Writes are wrapped in
+``recording``, which registers them in the document (creating a ``partial`` placeholder if
+needed) for as long as the write and its hook run. A rebuild only stores its snapshot if no
+write was in flight when it started and none began before it finished; otherwise it rescans.
+It can also be repaired with:
+
+    python -m services.user_stats_service rebuild --user-id <id>
+    python -m services.user_stats_service rebuild --all [--check]
+"""
+import argparse
+import asyncio
+import heapq
+import logging
+from collections import Counter
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Optional
+
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+
+from db import get_db
+from models import ApplicationModel, from_mongo
+
+logger = logging.getLogger(__name__)
+
+RECENT_ACTIVITY_SIZE = 10
+SCORE_BINS = [("0-60", 60), ("60-70", 70), ("70-80", 80), ("80-90", 90), ("90-100", None)]
+_RECENT_PROJECTION = {"company": 1, "job_title": 1, "status": 1, "application_date": 1}
+# A write registered longer ago than this is assumed to have died before finishing
+WRITE_REGISTRATION_TTL = timedelta(minutes=2)
+REBUILD_ATTEMPTS = 3
+# Fields of the stats document that are bookkeeping rather than statistics
+_BOOKKEEPING_FIELDS = ("updated_at", "seq", "writes", "partial")
+
+
+def _encode_key(key: str) -> str:
+    """Makes free text (statuses, companies, platforms) safe to use as a Mongo field name."""
+    if key == "":
+        return "%"
+    return key.replace("%", "%25").replace(".", "%2E").replace("$", "%24")
+
+
+def _decode_key(key: str) -> str:
+    if key == "%":
+        return ""
+    return key.replace("%24", "$").replace("%2E", ".").replace("%25", "%")
+
+
+def _empty_stats(user_id: str) -> dict:
+    return {
+        "_id": user_id,
+        "applications": 0,
+        "status": {},
+        "platforms": {},
+        "companies": {},
+        "resume_usage": {},
+        "months": {},
+        "days": {},
+        "scores": {},
+        "resume_scores": {},
+        "trend": {},
+        "interviews": {},
+        "resumes": {},
+        "recent": [],
+    }
+
+
+def _recent_entry(app: ApplicationModel) -> dict:
+    return {
+        "id": str(app.id),
+        "date": app.application_date,
+        "company": app.company,
+        "job_title": app.job_title,
+        "status": app.status,
+    }
+
+
+def _application_changes(app: ApplicationModel, sign: int):
+    """Returns the ($inc, $set, $unset) contribution of one application, added (+1) or removed (-1)."""
+    inc = Counter()
+    sets, unsets = {}, set()
+    app_id = str(app.id)
+
+    inc["applications"] += sign
+    inc[f"status.{_encode_key(app.status)}"] += sign
+    inc[f"companies.{_encode_key(app.company)}"] += sign
+    if app.platform:
+        inc[f"platforms.{_encode_key(app.platform)}"] += sign
+    if app.resume_used:
+        inc[f"resume_usage.{app.resume_used}"] += sign
+    inc[f"months.{app.application_date.strftime('%Y-%m')}"] += sign
+    inc[f"days.{app.application_date.strftime('%Y-%m-%d')}"] += sign
+    if app.ats_score is not None:
+        inc[f"scores.{int(app.ats_score)}"] += sign
+    if app.resume_used and app.ats_score:
+        inc[f"resume_scores.{app.resume_used}.sum"] += sign * app.ats_score
+        inc[f"resume_scores.{app.resume_used}.count"] += sign
+
+    if sign > 0:
+        if app.ats_score:
+            sets[f"trend.a{app_id}"] = {
+                "date": app.application_date, "score": app.ats_score, "company": app.company}
+        if app.interview_date:
+            sets[f"interviews.{app_id}"] = {
+                "company": app.company, "job_title": app.job_title,
+                "date": app.interview_date, "resume_used": app.resume_used}
+    else:
+        unsets |= {f"trend.a{app_id}", f"interviews.{app_id}"}
+    return inc, sets, unsets
+
+
+def _history_changes(history: dict):
+    inc = Counter()
+    sets = {}
+    result = history.get("analysis_result") or {}
+    if "JD-Match" not in result:
+        return inc, sets, set()
+
+    score = result["JD-Match"]
+    inc[f"scores.{int(score)}"] += 1
+    if history.get("resume_id"):
+        inc[f"resume_scores.{history['resume_id']}.sum"] += score
+        inc[f"resume_scores.{history['resume_id']}.count"] += 1
+    sets[f"trend.h{history['_id']}"] = {
+        "date": history.get("created_at") or datetime.utcnow(), "score": score,
+        "company": "Analysis Report"}
+    return inc, sets, set()
+
+
+def _merge(*changes):
+    inc, sets, unsets = Counter(), {}, set()
+    for change_inc, change_sets, change_unsets in changes:
+        inc.update(change_inc)
+        sets.update(change_sets)
+        unsets |= change_unsets
+    return {k: v for k, v in inc.items() if v}, sets, unsets - sets.keys()
+
+
+def _to_update(inc: dict, sets: dict, unsets: set) -> dict:
+    update = {"$set": {**sets, "updated_at": datetime.utcnow()}}
+    if inc:
+        update["$inc"] = inc
+    if unsets:
+        update["$unset"] = {path: "" for path in unsets}
+    return update
+
+
+def _apply_in_memory(doc: dict, inc: dict, sets: dict, unsets: set):
+    """Applies a change set to a stats dict the way Mongo would; used by rebuild."""
+    def parent_of(path):
+        *parents, leaf = path.split(".")
+        node = doc
+        for part in parents:
+            node = node.setdefault(part, {})
+        return node, leaf
+
+    for path, amount in inc.items():
+        node, leaf = parent_of(path)
+        node[leaf] = node.get(leaf, 0) + amount
+    for path, value in sets.items():
+        node, leaf = parent_of(path)
+        node[leaf] = value
+    for path in unsets:
+        node, leaf = parent_of(path)
+        node.pop(leaf, None)
+
+
+def _median(value_counts: list[tuple[int, int]], total: int):
+    """statistics.median over a histogram of (value, count) pairs sorted by value."""
+    middle = total // 2
+    wanted = [middle] if total % 2 else [middle - 1, middle]
+    found, seen = [], 0
+    for value, count in value_counts:
+        while wanted and wanted[0] < seen + count:
+            found.append(value)
+            wanted.pop(0)
+        seen += count
+        if not wanted:
+            break
+    return found[0] if len(found) == 1 else (found[0] + found[1]) / 2
+
+
+class UserStatsService:
+    @asynccontextmanager
+    async def recording(self, user_id: str):
+        """
+        Wraps a write to the user's applications, history or resumes together with the hook
+        call that records it, so a concurrent rebuild can't store a snapshot that misses the
+        write or counts it twice.
+        """
+        db = get_db()
+        token = str(ObjectId())
+        try:
+            await db.user_stats.update_one(
+                {"_id": user_id},
+                {"$set": {f"writes.{token}": datetime.utcnow()}, "$inc": {"seq": 1},
+                 "$setOnInsert": {"partial": True}},
+                upsert=True)
+        except Exception as e:
+            logger.error("Failed to register dashboard stats write for user %s: %s", user_id, e)
+        try:
+            yield
+        finally:
+            try:
+                await db.user_stats.update_one(
+                    {"_id": user_id}, {"$unset": {f"writes.{token}": ""}, "$inc": {"seq": 1}})
+            except Exception as e:
+                logger.error("Failed to finish dashboard stats write for user %s: %s", user_id, e)
+
+    async def _update(self, user_id: str, inc: dict, sets: dict, unsets: set):
+        db = get_db()
+        await db.user_stats.update_one({"_id": user_id}, _to_update(inc, sets, unsets))
+
+    async def _refresh_application_extremes(self, user_id: str):
+        """Recomputes the recent-activity list and first application date after an update or delete."""
+        db = get_db()
+        recent = await db.applications.find(
+            {"user_id": user_id}, _RECENT_PROJECTION
+        ).sort([("application_date", -1), ("_id", -1)]).limit(RECENT_ACTIVITY_SIZE).to_list(
+            length=RECENT_ACTIVITY_SIZE)
+        first = await db.applications.find(
+            {"user_id": user_id}, {"application_date": 1}
+        ).sort("application_date", 1).limit(1).to_list(length=1)
+        update = {"$set": {"recent": [
+            {"id": str(a["_id"]), "date": a["application_date"], "company": a["company"],
+             "job_title": a["job_title"], "status": a.get("status", "Wishlist")}
+            for a in recent]}}
+        # Left unset when there are no applications, so a later $min on create takes effect
+        if first:
+            update["$set"]["first_application_date"] = first[0]["application_date"]
+        else:
+            update["$unset"] = {"first_application_date": ""}
+        await db.user_stats.update_one({"_id": user_id}, update)
+
+    async def record_application_change(self, user_id: str,
+                                        before: Optional[ApplicationModel],
+                                        after: Optional[ApplicationModel]):
+        """Applies an application create (before=None), update, or delete (after=None)."""
+        try:
+            changes = []
+            if before is not None:
+                changes.append(_application_changes(before, -1))
+            if after is not None:
+                changes.append(_application_changes(after, 1))
+            inc, sets, unsets = _merge(*changes)
+            update = _to_update(inc, sets, unsets)
+
+            if before is None and after is not None:
+                update["$push"] = {"recent": {
+                    "$each": [_recent_entry(after)],
+                    "$sort": {"date": -1},
+                    "$slice": RECENT_ACTIVITY_SIZE,
+                }}
+                update["$min"] = {"first_application_date": after.application_date}
+                await get_db().user_stats.update_one({"_id": user_id}, update)
+            else:
+                await get_db().user_stats.update_one({"_id": user_id}, update)
+                await self._refresh_application_extremes(user_id)
+        except Exception as e:
+            logger.error("Failed to update dashboard stats for user %s: %s", user_id, e)
+
+    async def record_history(self, user_id: str, history: dict):
+        try:
+            await self._update(user_id, *_merge(_history_changes(history)))
+        except Exception as e:
+            logger.error("Failed to update dashboard stats for user %s: %s", user_id, e)
+
+    async def record_resume(self, user_id: str, resume_id: str, title: str, created_at: datetime):
+        try:
+            await self._update(user_id, {}, {f"resumes.{resume_id}": {
+                "title": title, "created_at": created_at}}, set())
+        except Exception as e:
+            logger.error("Failed to update dashboard stats for user %s: %s", user_id, e)
+
+    async def record_resume_title(self, user_id: str, resume_id: str, title: str):
+        try:
+            await self._update(user_id, {}, {f"resumes.{resume_id}.title": title}, set())
+        except Exception as e:
+            logger.error("Failed to update dashboard stats for user %s: %s", user_id, e)
+
+    async def record_resume_deleted(self, user_id: str, resume_id: str):
+        try:
+            await self._update(user_id, {}, {}, {f"resumes.{resume_id}"})
+        except Exception as e:
+            logger.error("Failed to update dashboard stats for user %s: %s", user_id, e)
+
+    async def rebuild(self, user_id: str, write: bool = True) -> dict:
+        """
+        Recomputes a user's stats document from the raw collections and stores it, unless
+        writes kept overlapping the scan (it is then returned but not stored).
+        """
+        logger.info("Rebuilding dashboard stats for user %s", user_id)
+        if not write:
+            return await self._scan(user_id)
+        db = get_db()
+        doc = None
+        for attempt in range(REBUILD_ATTEMPTS):
+            current = await db.user_stats.find_one({"_id": user_id}, {"seq": 1, "writes": 1})
+            started = datetime.utcnow()
+            in_flight = current and any(registered > started - WRITE_REGISTRATION_TTL
+                                        for registered in current.get("writes", {}).values())
+            if in_flight:
+                await asyncio.sleep(0.05 * (attempt + 1))
+                continue
+            doc = await self._scan(user_id)
+            # Any write registered or finished since ``current`` was read has moved seq on
+            doc["seq"] = current.get("seq", 0) if current else 0
+            if current is None:
+                try:
+                    await db.user_stats.insert_one(doc)
+                    return doc
+                except DuplicateKeyError:
+                    pass
+            elif (await db.user_stats.replace_one({"_id": user_id, "seq": doc["seq"]}, doc)).matched_count:
+                return doc
+            logger.info("Dashboard stats for user %s changed during rebuild, retrying", user_id)
+
+        logger.warning("Dashboard stats for user %s not stored: writes overlapped every rebuild", user_id)
+        return doc if doc is not None else await self._scan(user_id)
+
+    async def _scan(self, user_id: str) -> dict:
+        db = get_db()
+        doc = _empty_stats(user_id)
+        recent = []
+        first_date = None
+
+        async for raw in db.applications.find({"user_id": user_id}):
+            app = from_mongo(ApplicationModel, raw)
+            _apply_in_memory(doc, *_merge(_application_changes(app, 1)))
+            entry = _recent_entry(app)
+            if len(recent) < RECENT_ACTIVITY_SIZE:
+                heapq.heappush(recent, (entry["date"], entry["id"], entry))
+            else:
+                heapq.heappushpop(recent, (entry["date"], entry["id"], entry))
+            if first_date is None or app.application_date < first_date:
+                first_date = app.application_date
+
+        history_cursor = db.history.find(
+            {"user_id": ObjectId(user_id), "user_type": "employee"},
+            {"analysis_result.JD-Match": 1, "created_at": 1, "resume_id": 1})
+        async for history in history_cursor:
+            _apply_in_memory(doc, *_merge(_history_changes(history)))
+
+        async for resume in db.resumes.find({"user_id": user_id}, {"title": 1, "created_at": 1}):
+            doc["resumes"][str(resume["_id"])] = {
+                "title": resume["title"], "created_at": resume.get("created_at")}
+
+        doc["recent"] = [entry for _, _, entry in sorted(recent, key=lambda r: (r[0], r[1]), reverse=True)]
+        if first_date is not None:
+            doc["first_application_date"] = first_date
+        doc["updated_at"] = datetime.utcnow()
+        return doc
+
+    async def get_dashboard_stats(self, user_id: str) -> dict:
+        db = get_db()
+        doc = await db.user_stats.find_one({"_id": user_id})
+        if doc is None or doc.get("partial"):
+            doc = await self.rebuild(user_id)
+        # Daily buckets can't tell the time of day, so the rolling week is an indexed count
+        now = datetime.utcnow()
+        apps_this_week = await db.applications.count_documents(
+            {"user_id": user_id, "application_date": {"$gte": now - timedelta(days=7)}})
+        return self.render(doc, now, apps_this_week)
+
+    @staticmethod
+    def render(doc: dict, now: Optional[datetime] = None, apps_this_week: Optional[int] = None) -> dict:
+        """
+        Turns a stats document into the dashboard payload (same shape as AnalyticsService).
+        ``apps_this_week`` counts applications in the last 7 * 24 hours; without it, whole
+        days from seven days ago are counted.
+        """
+        now = now or datetime.utcnow()
+        positive = lambda counts: {k: v for k, v in counts.items() if v > 0}
+
+        status_counts = {_decode_key(k): v for k, v in positive(doc.get("status", {})).items()}
+        lowered = Counter()
+        for status, count in status_counts.items():
+            lowered[status.lower()] += count
+
+        resumes = doc.get("resumes", {})
+        title_of = lambda rid, default: resumes.get(rid, {}).get("title", default)
+
+        value_counts = sorted((int(v), c) for v, c in positive(doc.get("scores", {})).items())
+        score_total = sum(c for _, c in value_counts)
+        score_sum = sum(v * c for v, c in value_counts)
+        avg_ats = score_sum / score_total if score_total else 0
+
+        total_apps = doc.get("applications", 0)
+        total_resumes = len(resumes)
+        summary = {
+            "applications": total_apps,
+            "resumes": total_resumes,
+            "average_ats": int(avg_ats),
+            "offers": lowered["offered"],
+            "wishlist": lowered["wishlist"],
+            "rejections": lowered["rejected"],
+            "interviews": lowered["interview scheduled"],
+            "success_rate": round((lowered["offered"] / total_apps * 100) if total_apps > 0 else 0, 1),
+        }
+
+        # Without a count, "this week" counts whole days from seven days ago onwards
+        days = positive(doc.get("days", {}))
+        week_start = (now - timedelta(days=7)).strftime("%Y-%m-%d")
+        platforms = Counter({_decode_key(k): v for k, v in positive(doc.get("platforms", {})).items()})
+        resume_usage = Counter(positive(doc.get("resume_usage", {})))
+        most_used_resume_id = resume_usage.most_common(1)[0][0] if resume_usage else None
+        most_used_resume_name = title_of(most_used_resume_id, "N/A") if most_used_resume_id else "N/A"
+        first_app_date = doc.get("first_application_date") or now
+        weeks_active = max((now - first_app_date).days / 7, 1)
+
+        application_statistics = {
+            "apps_this_month": doc.get("months", {}).get(now.strftime("%Y-%m"), 0),
+            "apps_this_week": (apps_this_week if apps_this_week is not None
+                               else sum(v for k, v in days.items() if k >= week_start)),
+            "apps_today": days.get(now.strftime("%Y-%m-%d"), 0),
+            "avg_apps_per_week": round(total_apps / weeks_active, 1),
+            "most_used_resume": most_used_resume_name,
+            "most_used_platform": platforms.most_common(1)[0][0] if platforms else "N/A",
+        }
+
+        resume_scores = {rid: s for rid, s in doc.get("resume_scores", {}).items() if s.get("count", 0) > 0}
+        highest_scoring_resume, max_avg_score = "N/A", 0
+        for rid, s in resume_scores.items():
+            avg_score = s["sum"] / s["count"]
+            if avg_score > max_avg_score:
+                max_avg_score = avg_score
+                highest_scoring_resume = title_of(rid, "Unknown")
+
+        latest = max(resumes.values(), key=lambda r: r.get("created_at") or datetime.min) if resumes else None
+        resume_statistics = {
+            "total": total_resumes,
+            "latest": latest["title"] if latest else "N/A",
+            "most_used": most_used_resume_name,
+            "highest_scoring": highest_scoring_resume,
+        }
+
+        ats_analytics = {
+            "highest": value_counts[-1][0] if value_counts else 0,
+            "lowest": value_counts[0][0] if value_counts else 0,
+            "average": int(avg_ats),
+            "median": _median(value_counts, score_total) if value_counts else 0,
+        }
+
+        trend = sorted(doc.get("trend", {}).values(), key=lambda e: e["date"])
+        score_bins = {label: 0 for label, _ in SCORE_BINS}
+        for value, count in value_counts:
+            label = next(label for label, upper in SCORE_BINS if upper is None or value < upper)
+            score_bins[label] += count
+        # Chronological; AnalyticsService lists months in the order it read the applications
+        months = sorted(positive(doc.get("months", {})).items())
+        companies = Counter({_decode_key(k): v for k, v in positive(doc.get("companies", {})).items()})
+
+        charts = {
+            "ats_trend": [{"date": e["date"].strftime("%b %d"), "score": e["score"], "company": e["company"]}
+                          for e in trend],
+            # Largest first; AnalyticsService lists statuses in the order it read the applications
+            "status_distribution": [{"name": status, "value": count} for status, count in
+                                    sorted(status_counts.items(), key=lambda item: (-item[1], item[0]))],
+            "apps_per_month": [{"month": datetime.strptime(month, "%Y-%m").strftime("%b %Y"), "count": count}
+                               for month, count in months],
+            "ats_distribution": [{"range": k, "count": v} for k, v in score_bins.items()],
+            "resume_performance": [
+                {"name": r["title"],
+                 "score": int(resume_scores[rid]["sum"] / resume_scores[rid]["count"]) if rid in resume_scores else 0}
+                for rid, r in resumes.items()
+            ],
+            "top_companies": [{"company": comp, "count": count} for comp, count in companies.most_common(5)],
+        }
+
+        recent_activity = [{
+            "type": "Application",
+            "title": f"Applied to {a['company']} for {a['job_title']}",
+            "date": a["date"].isoformat(),
+            "status": a["status"],
+        } for a in doc.get("recent", [])]
+
+        upcoming_interviews = sorted([{
+            "company": i["company"],
+            "job_title": i["job_title"],
+            "date": i["date"].isoformat(),
+            "resume_used": title_of(str(i["resume_used"]), "N/A"),
+        } for i in doc.get("interviews", {}).values() if i["date"] > now], key=lambda x: x["date"])
+
+        return {
+            "summary": summary,
+            "application_statistics": application_statistics,
+            "resume_statistics": resume_statistics,
+            "ats_analytics": ats_analytics,
+            "charts": charts,
+            "recent_activity": recent_activity,
+            "upcoming_interviews": upcoming_interviews,
+        }
+
+
+user_stats_service = UserStatsService()
+
+
+async def _main():
+    parser = argparse.ArgumentParser(description="Rebuild job-seeker dashboard statistics.")
+    parser.add_argument("command", choices=["rebuild"])
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--user-id")
+    target.add_argument("--all", action="store_true")
+    parser.add_argument("--check", action="store_true",
+                        help="only report users whose stored stats have drifted")
+    args = parser.parse_args()
+
+    db = get_db()
+    if args.all:
+        user_ids = [str(u["_id"]) async for u in db.users.find({"user_type": "employee"}, {"_id": 1})]
+    else:
+        user_ids = [args.user_id]
+
+    drifted = 0
+    for user_id in user_ids:
+        rebuilt = await user_stats_service.rebuild(user_id, write=not args.check)
+        if args.check:
+            stored = await db.user_stats.find_one({"_id": user_id}) or {}
+            if {k: v for k, v in stored.items() if k not in _BOOKKEEPING_FIELDS} != \
+                    {k: v for k, v in rebuilt.items() if k not in _BOOKKEEPING_FIELDS}:
+                drifted += 1
+                print(f"drifted  {user_id}")
+    print(f"{len(user_ids)} user(s) {'checked' if args.check else 'rebuilt'}"
+          + (f", {drifted} drifted" if args.check else ""))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    asyncio.run(_main())
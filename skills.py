@@ -0,0 +1,161 @@
+"""
+Skill tagging with an Aho-Corasick automaton over word tokens.
+
+The dictionary maps a canonical skill name to its aliases (``skills.json``; see
+``SKILL_DICTIONARY_PATHS`` to add files, which can add skills or extend their aliases). Names
+and aliases are tokenized with ``text_features.words``, and the automaton runs over the
+text's tokens, so every skill is found in one linear pass and only on word boundaries:
+"java" never matches inside "javascript", and "ci/cd" or "machine learning" match across
+tokens.
+
+Tags are stored as the ``skills`` array on resumes and job descriptions, where indexes on
+``(user_id, skills)`` make skill filters and overlap scoring plain Mongo queries.
+
+    python -m skills retag   # tag stored resumes and JDs, e.g. after editing the dictionary
+"""
+import argparse
+import asyncio
+import functools
+import json
+import logging
+import os
+from collections import deque
+from typing import Iterable
+
+from config import SKILL_DICTIONARY_PATHS
+from text_features import words
+
+logger = logging.getLogger(__name__)
+
+
+def load_skills(paths: Iterable[str]) -> dict[str, list[str]]:
+    """Merges dictionary files in order. Relative paths are resolved against this directory."""
+    skills: dict[str, list[str]] = {}
+    for path in paths:
+        if not os.path.isabs(path):
+            path = os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+        with open(path) as f:
+            for name, aliases in json.load(f).items():
+                skills.setdefault(name.lower(), []).extend(alias.lower() for alias in aliases)
+    return skills
+
+
+class SkillTagger:
+    """Aho-Corasick automaton whose alphabet is word tokens."""
+
+    def __init__(self, skills: dict[str, list[str]]):
+        # State 0 is the root. _goto[state] maps a token to the next state; _output[state]
+        # holds the skills of every pattern ending there, including via failure links.
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[frozenset[str]] = [frozenset()]
+        self.names = frozenset(skills)
+
+        outputs: list[set[str]] = [set()]
+        for name, aliases in skills.items():
+            for pattern in (name, *aliases):
+                state = 0
+                for token in words(pattern):
+                    next_state = self._goto[state].get(token)
+                    if next_state is None:
+                        next_state = len(self._goto)
+                        self._goto[state][token] = next_state
+                        self._goto.append({})
+                        self._fail.append(0)
+                        outputs.append(set())
+                    state = next_state
+                if state:
+                    outputs[state].add(name)
+
+        # Breadth-first, so a state's failure target is final before its children need it
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(token, 0)
+                outputs[child] |= outputs[self._fail[child]]
+        self._output = [frozenset(output) for output in outputs]
+
+    def tag(self, text: str) -> list[str]:
+        """Sorted canonical names of every skill mentioned in ``text``."""
+        goto, fail, output = self._goto, self._fail, self._output
+        found: set[str] = set()
+        state = 0
+        for token in words(text or ""):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            if output[state]:
+                found |= output[state]
+        return sorted(found)
+
+    def canonical(self, names: Iterable[str]) -> list[str]:
+        """Maps user-supplied skill names or aliases to canonical names, keeping unknown ones."""
+        result = []
+        for name in names:
+            tags = self.tag(name)
+            result.extend(tags or [name.strip().lower()])
+        return sorted(set(result))
+
+
+@functools.cache
+def skill_tagger() -> SkillTagger:
+    skills = load_skills(SKILL_DICTIONARY_PATHS)
+    logger.info("Loaded %s skills", len(skills))
+    return SkillTagger(skills)
+
+
+def jd_skill_text(jd: dict) -> str:
+    """The parts of a job description document that are tagged."""
+    parts = [jd.get("title") or "", jd.get("full_description") or ""]
+    for field in ("required_skills", "preferred_skills"):
+        value = jd.get(field) or []
+        parts.append(value if isinstance(value, str) else ", ".join(value))
+    return "\n".join(parts)
+
+
+async def retag(batch_size: int = 500) -> dict:
+    """Re-tags every stored resume and job description. Returns the number changed per collection."""
+    from pymongo import UpdateOne
+
+    from db import get_db
+
+    db = get_db()
+    tagger = skill_tagger()
+    sources = {
+        "resumes": ({"resume_text": 1, "skills": 1}, lambda doc: doc.get("resume_text")),
+        "job_descriptions": (
+            {"title": 1, "full_description": 1, "required_skills": 1, "preferred_skills": 1, "skills": 1},
+            jd_skill_text),
+    }
+    changed = {}
+    for collection, (projection, text_of) in sources.items():
+        changed[collection] = 0
+        operations = []
+        async for doc in db[collection].find({}, projection):
+            skills = tagger.tag(text_of(doc))
+            if skills != doc.get("skills"):
+                operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"skills": skills}}))
+            if len(operations) >= batch_size:
+                changed[collection] += (await db[collection].bulk_write(operations, ordered=False)).modified_count
+                operations = []
+        if operations:
+            changed[collection] += (await db[collection].bulk_write(operations, ordered=False)).modified_count
+        logger.info("Re-tagged %s %s", changed[collection], collection)
+    return changed
+
+
+async def _main():
+    parser = argparse.ArgumentParser(description="Skill tagging.")
+    parser.add_argument("command", choices=["retag"])
+    parser.parse_args()
+    print(await retag())
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    asyncio.run(_main())
@@ -0,0 +1,122 @@
+"""
+Cheap, model-free text features for resumes and job descriptions.
+
+``embed`` turns text into a fixed-size float32 vector with signed feature hashing: each
+unigram and bigram is hashed to one of ``dim`` buckets with a +/-1 sign, weighted by
+``1 + log(tf)``, and the result is L2-normalised. That is a sparse random projection of the
+bag of words, so cosine similarity between two embeddings approximates the cosine
+similarity of their term vectors. No fitting is needed, so a vector never has to be
+recomputed when the corpus changes.
+
+``minhash`` signs the set of word shingles of a text, for near-duplicate detection: the
+fraction of equal components between two signatures estimates the Jaccard similarity of
+their shingle sets. ``lsh_bands`` cuts a signature into band keys, so near-duplicates can be
+found by exact lookups on any shared key.
+
+Hashes use CRC32, not ``hash()``, so vectors and signatures are stable across processes and
+can be persisted.
+"""
+import functools
+import math
+import re
+import zlib
+from collections import Counter
+from typing import Optional
+
+import numpy as np
+
+# Keeps tokens like c++, c#, node.js and asp.net whole
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+# The same tokens found in text that hasn't been lowercased, so offsets point into the original
+_ANY_CASE_TOKEN_RE = re.compile(_TOKEN_RE.pattern, re.IGNORECASE)
+
+STOP_WORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can could did do
+does doing during each for from had has have having he her here hers him his how i if in into
+is it its just me more most my no nor not of on once only or other our ours out over own same
+she should so some such than that the their them then there these they this those through to
+too under until up very was we were what when where which while who whom why will with would
+you your yours
+""".split())
+
+
+# Largest prime below 2**32: (a * x + b) % p for a, b, x < p stays within uint64
+_MINHASH_PRIME = 4294967291
+
+
+def words(text: str) -> list[str]:
+    """Lowercased word tokens."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def word_spans(text: str) -> list[tuple[str, int, int]]:
+    """(lowercased word, start, end) for each word token, with offsets into ``text``."""
+    return [(m.group().lower(), m.start(), m.end()) for m in _ANY_CASE_TOKEN_RE.finditer(text)]
+
+
+def tokens(text: str) -> list[str]:
+    """Lowercased word tokens with stop words removed."""
+    return [t for t in words(text) if t not in STOP_WORDS]
+
+
+@functools.lru_cache(maxsize=262_144)
+def _feature_hash(feature: str) -> int:
+    return zlib.crc32(feature.encode())
+
+
+def embed(text: str, dim: int) -> np.ndarray:
+    """Unit-length float32 vector of ``dim`` (a power of two) components; all zeros for empty text."""
+    words = tokens(text)
+    features = Counter(words)
+    features.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+
+    vector = np.zeros(dim, dtype=np.float32)
+    if not features:
+        return vector
+    mask = dim - 1
+    buckets = np.empty(len(features), dtype=np.int64)
+    weights = np.empty(len(features), dtype=np.float32)
+    for i, (feature, count) in enumerate(features.items()):
+        h = _feature_hash(feature)
+        buckets[i] = h & mask
+        weights[i] = (1.0 + math.log(count)) * (1.0 if h & 0x80000000 else -1.0)
+    np.add.at(vector, buckets, weights)
+
+    norm = np.linalg.norm(vector)
+    if norm:
+        vector /= norm
+    return vector
+
+
+@functools.cache
+def _minhash_permutations(num_perm: int) -> tuple[np.ndarray, np.ndarray]:
+    # Fixed seed: signatures are stored and compared across processes
+    rng = np.random.default_rng(0x5EED)
+    return (rng.integers(1, _MINHASH_PRIME, num_perm, dtype=np.uint64),
+            rng.integers(0, _MINHASH_PRIME, num_perm, dtype=np.uint64))
+
+
+def minhash(text: str, num_perm: int = 128, shingle_size: int = 3) -> Optional[np.ndarray]:
+    """uint32 MinHash signature of the text's word shingles, or None if it has no words."""
+    w = words(text)
+    if not w:
+        return None
+    shingles = {" ".join(w[i:i + shingle_size]) for i in range(max(1, len(w) - shingle_size + 1))}
+    hashes = np.fromiter((zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64, count=len(shingles))
+    a, b = _minhash_permutations(num_perm)
+    return ((np.outer(hashes, a) + b) % _MINHASH_PRIME).min(axis=0).astype(np.uint32)
+
+
+def lsh_bands(signature: np.ndarray, bands: int) -> list[int]:
+    """
+    One key per band of ``len(signature) // bands`` rows. Two signatures share at least one
+    key with probability ``1 - (1 - J**rows)**bands`` for Jaccard similarity J.
+    """
+    rows = len(signature) // bands
+    return [(band << 32) | zlib.crc32(signature[band * rows:(band + 1) * rows].tobytes())
+            for band in range(bands)]
+
+
+def signature_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return float(np.mean(a == b))
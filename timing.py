@@ -0,0 +1,127 @@
+"""
+Per-request timing spans, reported as a ``Server-Timing`` header and as Prometheus histograms.
+
+Wrap a slow stage with ``span("name")`` (sync or async code) or decorate a function with
+``@timed("name")``. Spans recorded while a request is being served are summed per stage into
+that request's ``Server-Timing`` header and observed under the request's endpoint once it
+completes. Spans recorded outside any request, including by tasks a request started that
+outlive it, are observed immediately under the ``background`` endpoint. Mongo commands are
+timed by a pymongo command listener (see ``MongoTimingListener``) rather than at each call
+site.
+"""
+import functools
+import inspect
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, Histogram, generate_latest
+from pymongo import monitoring
+
+BACKGROUND_ENDPOINT = "background"
+
+REQUEST_DURATION = Histogram(
+    "ats_request_duration_seconds", "Total request handling time.",
+    ["method", "endpoint", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40),
+)
+STAGE_DURATION = Histogram(
+    "ats_stage_duration_seconds", "Time spent in one stage (extraction, LLM, Mongo, rate limiting).",
+    ["stage", "endpoint"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20),
+)
+
+class _RequestSpans(list):
+    """
+    (stage, seconds) pairs for the request being served. A list because Mongo commands are
+    reported from Motor's worker threads, and list.append is atomic. Tasks started by the
+    request copy its context, so they share this list; it is closed once the request is
+    reported, and their later spans count as background work.
+    """
+    closed = False
+
+
+_request_spans: ContextVar[Optional[_RequestSpans]] = ContextVar("request_spans", default=None)
+
+
+def record(stage: str, seconds: float):
+    spans = _request_spans.get()
+    if spans is None or spans.closed:
+        STAGE_DURATION.labels(stage, BACKGROUND_ENDPOINT).observe(seconds)
+    else:
+        spans.append((stage, seconds))
+
+
+@contextmanager
+def span(stage: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - started)
+
+
+def timed(stage: str):
+    """Decorator form of ``span``, for both coroutine and plain functions."""
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(stage):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def start_request() -> list:
+    spans = _RequestSpans()
+    _request_spans.set(spans)
+    return spans
+
+
+def finish_request(spans: list, method: str, endpoint: str, status: int, seconds: float) -> str:
+    """Observes the request's spans and returns its ``Server-Timing`` header value."""
+    spans.closed = True
+    totals: dict[str, list] = {}
+    for stage, stage_seconds in list(spans):
+        total = totals.setdefault(stage, [0.0, 0])
+        total[0] += stage_seconds
+        total[1] += 1
+        STAGE_DURATION.labels(stage, endpoint).observe(stage_seconds)
+    REQUEST_DURATION.labels(method, endpoint, str(status)).observe(seconds)
+
+    entries = [f'{stage};dur={total * 1000:.1f};desc="{count}x"'
+               for stage, (total, count) in totals.items()]
+    entries.append(f"total;dur={seconds * 1000:.1f}")
+    return ", ".join(entries)
+
+
+def metrics_payload() -> tuple[bytes, str]:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        # Several worker processes (see server.py): aggregate their metric files
+        from prometheus_client import CollectorRegistry, multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+class MongoTimingListener(monitoring.CommandListener):
+    """Records every Mongo command as a ``mongo`` span."""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        record("mongo", event.duration_micros / 1_000_000)
+
+    def failed(self, event):
+        record("mongo", event.duration_micros / 1_000_000)